@@ -6,6 +6,11 @@ Created on Sun Jul  1 20:15:48 2018
 
 import cx_Freeze
 import os
+import sys
+import subprocess
+
+# pack the sprite atlases so that they ship with the executable
+subprocess.check_call([sys.executable, './misc/build_sprite_atlases.py'])
 
 os.environ['TCL_LIBRARY'] = r'C:\Users\bettmensch\Anaconda3\envs\star_wars_env\tcl\tcl8.6'
 os.environ['TK_LIBRARY'] = r'C:\Users\bettmensch\Anaconda3\envs\star_wars_env\tcl\tk8.6'
@@ -29,7 +34,9 @@ cx_Freeze.setup(
                                        "yaml",
                                        "sys",
                                        "os",
-                                       "random"],
+                                       "random",
+                                       "pickle",
+                                       "hashlib"],
                            "include_files":["./lib/",
                                             "./graphics/",
                                             "./sounds/",
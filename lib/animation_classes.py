@@ -15,13 +15,17 @@ Created on Sat Jun  2 14:00:12 2018
  
 #from pygame.sprite import Sprite, Group
 from basic_sprite_classes import BasicSprite
-from math import pi, sin, cos
+from pool_classes import SpritePool
+from vector_math import rotate, add
  
 import numpy as np
 
 class BasicAnimation(BasicSprite):
     '''Base class for animations used in game.'''
     
+    # frame count intervals of each image, memoized by (fps, seconds per image, number of images)
+    FRAME_IMAGE_INTERVALS = {}
+    
     def __init__(self,
                  fps,
                  screen,
@@ -78,16 +82,28 @@ class BasicAnimation(BasicSprite):
         self.frames_passed = 1
         
         # set sequence control attributes
-        frames_per_image = float(self._fps) * seconds_per_image # get frames per images
-        
-        # construct list of frame count intervals, where one interval ~= one image from animation sequence
-        n_images = len(original_images) # get number of images
-        lowers = np.linspace(0,(n_images-1)*frames_per_image,n_images) # get lower boundaries for intervals
-        uppers = np.linspace(frames_per_image,n_images*frames_per_image,n_images) # get upper boundaries for intervals
-                            
-        self.frame_image_intervals = [(lower,upper) for (lower,upper) in zip(lowers, # make list of intervals
-                                                                              uppers)]     
-
+        self.frame_image_intervals = self._get_frame_image_intervals(seconds_per_image,
+                                                                     len(original_images))
+        
+    def _get_frame_image_intervals(self,
+                                   seconds_per_image,
+                                   n_images):
+        '''Util function that returns the list of frame count intervals, where one
+        interval ~= one image from the animation sequence. The list is shared by all
+        animations with the same specs and must not be modified.'''
+        
+        key = (self._fps, seconds_per_image, n_images)
+        
+        if key not in BasicAnimation.FRAME_IMAGE_INTERVALS:
+            frames_per_image = float(self._fps) * seconds_per_image # get frames per images
+            
+            lowers = np.linspace(0,(n_images-1)*frames_per_image,n_images) # get lower boundaries for intervals
+            uppers = np.linspace(frames_per_image,n_images*frames_per_image,n_images) # get upper boundaries for intervals
+                                
+            BasicAnimation.FRAME_IMAGE_INTERVALS[key] = [(lower,upper) for (lower,upper) in zip(lowers, # make list of intervals
+                                                                                                 uppers)]
+            
+        return BasicAnimation.FRAME_IMAGE_INTERVALS[key]
         
     def get_interval_index(self,value,intervals):
         '''Helper function that takes a value and a list of intervals. Determines
@@ -136,7 +152,10 @@ class TrackingAnimation(BasicAnimation):
     incrementally like the ShipSprite (based) classes and the BasicAnimation class, but rather overrides its positional
     attributes completely ech frame, based on the tracked sprite's positional attributes. It should therefore always be
     initialized with initial_speed = 0; otherwise, the incremental velocity changes inherited from the BasicSprite class
-    would cause the animation to loose track of its anchor sprite.'''
+    would cause the animation to loose track of its anchor sprite. For the same reason, it never
+    registers with a kinematics store.'''
+    
+    USES_KINEMATICS_STORE = False
     
     def __init__(self,
                  fps,
@@ -198,7 +217,7 @@ class TrackingAnimation(BasicAnimation):
         self._tracked_sprite = tracked_sprite
         
         # attach original offsets
-        self._original_offset = original_offset
+        self._original_offset = tuple(np.array(original_offset,dtype='float').tolist()) # plain floats for per frame math
         
         
     def update(self):
@@ -215,24 +234,21 @@ class TrackingAnimation(BasicAnimation):
             self._angle = self._tracked_sprite._angle
         
         # get .center and offsets from tracked sprite
-        self._center = self._tracked_sprite._center + self._get_rotated_offset()
+        center_x, center_y = add(self._tracked_sprite._center.tolist(),
+                                 self._get_rotated_offset())
+        self._center[0] = center_x
+        self._center[1] = center_y
 
         # before you call this, make sure:
         # self._speed == 0
         BasicAnimation.update(self) 
         
     def _get_rotated_offset(self):
-        '''Rotate and return the original offset.'''
+        '''Rotate (counter-clockwise) and return the original offset as an (x, y) tuple.'''
         
-        # convert ship's current angle to radian
-        radian_angle = self._angle * pi / 180
+        return rotate(self._original_offset,
+                      self._angle)
         
-        # get rotation matrix for radian angle
-        rotation_matrix = np.array([[cos(radian_angle), sin(radian_angle)],
-                                   [- sin(radian_angle), cos(radian_angle)]])
-        
-        # rotate original offset attribute (counter-clockwise)
-        rotated_offset = np.dot(rotation_matrix,
-                                self._original_offset.T).T
-                                
-        return rotated_offset.reshape(2,)
\ No newline at end of file
+# process-wide pools for short lived animations (engine trails, muzzle flashes, explosions)
+BasicAnimation.POOL = SpritePool(BasicAnimation)
+TrackingAnimation.POOL = SpritePool(TrackingAnimation)
\ No newline at end of file
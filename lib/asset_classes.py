@@ -0,0 +1,478 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 12:20:05 2026
+
+@author: bettmensch
+"""
+
+'''This file contains the asset loading classes used in the game STAR WARS DOGFIGHTER.
+It contains the SurfaceLoader class, which is the single place where image files are
+loaded from disk and prepared for fast blitting: every surface is converted to the
+display's pixel format once, and transparent images are given either a colour key
+(with RLE acceleration where the image has enough transparent area to benefit from it)
+or per-pixel alpha if the source file carries an alpha channel.
+It also contains the AssetManager class, a process-wide store that loads each image
+and sound file only once and shares it across levels. Images referred to by atlas entry
+(see atlas_classes) are handed out as views into their atlas, which is loaded once.
+Asset files can be preloaded on a background loader thread, e.g. the next level's while
+the current one is being played. The loader thread only reads and decodes files; surfaces
+are converted, colour keyed and cut into views on the main thread, as neither the
+display's surfaces nor SDL's font and mixer state may be touched by two threads at once.'''
+
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from atlas_classes import AtlasIndex
+
+import io
+import threading
+
+import pygame as pg
+
+class SurfaceLoader(object):
+    '''Loads image files and converts them to the display format. The transparency
+    choice made for each file is recorded in the 'choices' attribute, a dictionary
+    mapping file path to one of 'opaque', 'colorkey', 'colorkey_rle' or 'alpha'.'''
+
+    def __init__(self,
+                 rle_threshold = 0.1):
+        '''Arguments:
+
+            rle_threshold: minimum fraction of transparent pixels for which a colour keyed
+                    surface is RLE accelerated. RLE speeds up blitting surfaces with long
+                    transparent runs, but makes locking (e.g. for rotozoom or pixel access)
+                    more expensive, so it is only used where it pays off. The rotation
+                    cache RLE accelerates the rotated frames of such surfaces too.'''
+
+        self._rle_threshold = rle_threshold
+
+        # record of transparency choice made for each loaded file
+        self.choices = {}
+
+    def decode(self,
+               image_path):
+        '''Loads the image file at image_path and returns the surface as decoded, without
+        preparing it. Unlike load, does not touch the display, so it can be called from a
+        background thread.'''
+
+        return pg.image.load(image_path)
+
+    def load(self,
+             image_path,
+             transparent_color = None,
+             surface = None):
+        '''Loads the image file at image_path and returns the prepared surface.
+        If transparent_color is specified, pixels of that colour will be transparent.
+        If surface is specified, it is taken as the file's surface as returned by decode
+        (e.g. on a loader thread) instead of loading the file again.'''
+
+        # load raw surface from disk
+        if surface is None:
+            surface = self.decode(image_path)
+
+        # prepare surface and record choice
+        surface, choice = self.prepare(surface,
+                                       transparent_color)
+        self.choices[image_path] = choice
+
+        return surface
+
+    def prepare(self,
+                surface,
+                transparent_color = None):
+        '''Converts the passed surface to the display format and sets up its transparency.
+        Returns the prepared surface and the name of the transparency choice made.'''
+
+        # surfaces can only be converted once a display mode has been set
+        can_convert = pg.display.get_surface() is not None
+
+        # files that carry their own alpha channel keep per-pixel alpha
+        if surface.get_flags() & pg.SRCALPHA:
+            if can_convert:
+                surface = surface.convert_alpha()
+
+            return surface, 'alpha'
+
+        if can_convert:
+            surface = surface.convert()
+
+        return surface, self._set_colorkey(surface,
+                                           transparent_color)
+
+    def load_view(self,
+                  atlas_image,
+                  rect,
+                  view_key,
+                  transparent_color = None):
+        '''Returns a subsurface view of the area rect of the atlas_image surface, which
+        must already have been prepared (see load), with its own transparency set up. The
+        view shares the atlas' pixels. Its transparency choice is recorded under view_key.'''
+
+        view = atlas_image.subsurface(rect)
+
+        self.choices[view_key] = self._set_colorkey(view,
+                                                    transparent_color)
+
+        return view
+
+    def _set_colorkey(self,
+                      surface,
+                      transparent_color):
+        '''Util function that colour keys the display format surface with
+        transparent_color, unless it is None. Returns the name of the transparency
+        choice made.'''
+
+        # opaque images need no further preparation
+        if transparent_color is None:
+            return 'opaque'
+
+        # get share of transparent pixels to decide whether RLE acceleration helps
+        n_pixels = surface.get_width() * surface.get_height()
+        n_transparent = pg.mask.from_threshold(surface,
+                                               transparent_color,
+                                               (1,1,1,255)).count()
+
+        if n_pixels and n_transparent / n_pixels >= self._rle_threshold:
+            surface.set_colorkey(transparent_color, pg.RLEACCEL)
+
+            return 'colorkey_rle'
+        else:
+            surface.set_colorkey(transparent_color)
+
+            return 'colorkey'
+
+class AssetManager(object):
+    '''Process-wide store for image surfaces and sounds. Each asset is loaded from
+    disk only once and the same object is handed out to every caller, so callers must
+    not modify the returned surfaces (copy them first if needed).
+    
+    Assets are reference counted per level: every asset requested between begin_level
+    and end_level is referenced by that level. Assets not referenced by any level stay
+    cached, so that retries and later levels can reuse them, but are evicted in least
+    recently used order whenever the estimated memory use exceeds the memory budget.
+    
+    Asset files can also be read and decoded in advance on the store's loader thread via
+    preload. Preloaded files are only prepared and stored as assets, and referenced by a
+    level, once they are requested again from the main thread.'''
+    
+    def __init__(self,
+                 surface_loader = None,
+                 memory_budget = 128 * 1024 ** 2,
+                 atlas_index = None):
+        '''Arguments:
+            
+            surface_loader: SurfaceLoader object used to load and prepare image files.
+                    A new one is created if not specified.
+            memory_budget: estimated number of bytes the cached assets may occupy before
+                    unreferenced assets are evicted.
+            atlas_index: AtlasIndex object used to find atlas entries in the built atlases.
+                    If not specified, an index of the atlases in ./graphics/atlas is read.'''
+        
+        # attach loader
+        if surface_loader is None:
+            surface_loader = SurfaceLoader()
+            
+        self._surface_loader = surface_loader
+        
+        # attach atlas index
+        if atlas_index is None:
+            atlas_index = AtlasIndex()
+            
+        self._atlas_index = atlas_index
+        self._memory_budget = memory_budget
+        
+        # asset storage in least recently used order, with estimated sizes
+        self._assets = OrderedDict()
+        self._asset_sizes = {}
+        self.memory_used = 0
+        
+        # files read and decoded on the loader thread, waiting to be prepared on the main
+        # thread: file path -> decoded surface (images) or file contents (sounds)
+        self._decoded = {}
+        
+        # level reference counting
+        self._ref_counts = {}
+        self._level_assets = {}
+        self._current_level = None
+        
+        # statistics
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        
+        # decoded files are shared with the loader thread, which is only started on the
+        # first preload
+        self._lock = threading.RLock()
+        self._thread_state = threading.local()
+        self._loader = None
+        
+    def begin_level(self,
+                    level_key):
+        '''Starts a level scope. All assets requested until end_level is called will
+        be referenced by the level identified by level_key.'''
+        
+        with self._lock:
+            self._current_level = level_key
+            
+            if level_key not in self._level_assets:
+                self._level_assets[level_key] = set()
+        
+    def end_level(self,
+                  level_key = None):
+        '''Ends a level scope and releases the level's references to its assets.
+        Evicts unreferenced assets if the memory budget is exceeded.'''
+        
+        with self._lock:
+            if level_key is None:
+                level_key = self._current_level
+                
+            # release references
+            for asset_key in self._level_assets.pop(level_key, set()):
+                self._ref_counts[asset_key] -= 1
+                
+                if not self._ref_counts[asset_key]:
+                    del self._ref_counts[asset_key]
+                
+            if level_key == self._current_level:
+                self._current_level = None
+                
+            self._evict()
+        
+    def preload(self,
+                load_assets):
+        '''Calls load_assets, a callable requesting assets from this store, on the store's
+        loader thread. There, requests only read and decode the files of assets not stored
+        yet, and return None; the decoded files are prepared once the assets are requested
+        again from the main thread. Returns a concurrent.futures.Future holding load_assets'
+        return value (or exception) once it is done. Preloads run one after the other, in
+        the order they were submitted.'''
+        
+        if self._loader is None:
+            self._loader = ThreadPoolExecutor(max_workers = 1)
+            
+        return self._loader.submit(self._preload,
+                                   load_assets)
+        
+    def _preload(self,
+                 load_assets):
+        '''Util function run on the loader thread. Asset requests made by load_assets
+        only decode files, see _decode.'''
+        
+        self._thread_state.preloading = True
+        
+        return load_assets()
+    
+    def _is_preloading(self):
+        '''Util function that checks whether it is called from the loader thread.'''
+        
+        return getattr(self._thread_state, 'preloading', False)
+    
+    def _decode(self,
+                asset_key,
+                file_path,
+                decode_file):
+        '''Util function that decodes the file at file_path with the decode_file callable
+        and keeps the result for the main thread, unless the asset identified by asset_key
+        is stored or the file decoded already.'''
+        
+        with self._lock:
+            if asset_key in self._assets or file_path in self._decoded:
+                return
+            
+        decoded_file = decode_file(file_path)
+        
+        with self._lock:
+            self._decoded[file_path] = decoded_file
+            
+    def _pop_decoded(self,
+                     file_path):
+        '''Util function that returns and forgets the preloaded result of decoding the
+        file at file_path, or None if it has not been preloaded.'''
+        
+        with self._lock:
+            return self._decoded.pop(file_path, None)
+    
+    def shutdown(self):
+        '''Waits for all submitted preloads to finish and stops the loader thread. Call
+        before quitting pygame.'''
+        
+        if self._loader is not None:
+            self._loader.shutdown(wait = True)
+            self._loader = None
+        
+    def get_image(self,
+                  image_path,
+                  transparent_color = (255,255,255)):
+        '''Returns the shared, display format surface for the image at image_path.
+        See SurfaceLoader.load.'''
+        
+        asset_key = ('image', image_path, transparent_color)
+        
+        if self._is_preloading():
+            self._decode(asset_key,
+                         image_path,
+                         self._surface_loader.decode)
+            
+            return None
+        
+        return self._get_asset(asset_key,
+                               lambda: self._surface_loader.load(image_path,
+                                                                 transparent_color = transparent_color,
+                                                                 surface = self._pop_decoded(image_path)))
+        
+    def get_images(self,
+                   image_paths,
+                   transparent_color = (255,255,255)):
+        '''Returns a list of shared surfaces for the images at image_paths.'''
+        
+        return [self.get_image(image_path,
+                               transparent_color = transparent_color) for image_path in image_paths]
+        
+    def get_atlas_image(self,
+                        entry,
+                        transparent_color = (255,255,255)):
+        '''Returns the shared, display format surface for the atlas entry (see
+        atlas_classes): a view into the entry's atlas if it was built, otherwise the
+        surface loaded from the entry's own file.'''
+        
+        location = self._atlas_index.get_location(entry)
+        
+        if location is None:
+            return self.get_image(self._atlas_index.get_entry_path(entry),
+                                  transparent_color = transparent_color)
+            
+        atlas_path, rect = location
+        
+        # atlases are stored opaque; each view gets its own colour key
+        atlas_image = self.get_image(atlas_path,
+                                     transparent_color = None)
+        
+        # views are only cut once the atlas has been prepared on the main thread
+        if self._is_preloading():
+            return None
+        
+        return self._get_asset(('atlas_entry', entry, transparent_color),
+                               lambda: self._surface_loader.load_view(atlas_image,
+                                                                      rect,
+                                                                      entry,
+                                                                      transparent_color = transparent_color))
+        
+    def get_atlas_images(self,
+                         entries,
+                         transparent_color = (255,255,255)):
+        '''Returns a list of shared surfaces for the atlas entries.'''
+        
+        return [self.get_atlas_image(entry,
+                                     transparent_color = transparent_color) for entry in entries]
+        
+    def get_sound(self,
+                  sound_path):
+        '''Returns the shared pygame.mixer.Sound object for the sound file at sound_path.'''
+        
+        asset_key = ('sound', sound_path)
+        
+        if self._is_preloading():
+            self._decode(asset_key,
+                         sound_path,
+                         self._read_file)
+            
+            return None
+        
+        return self._get_asset(asset_key,
+                               lambda: self._load_sound(sound_path))
+    
+    def _read_file(self,
+                   file_path):
+        '''Util function that returns the contents of the file at file_path.'''
+        
+        with open(file_path, 'rb') as asset_file:
+            return asset_file.read()
+        
+    def _load_sound(self,
+                    sound_path):
+        '''Util function that creates the Sound object for the sound file at sound_path,
+        from the file's contents if they have been preloaded.'''
+        
+        sound_file = self._pop_decoded(sound_path)
+        
+        if sound_file is None:
+            return pg.mixer.Sound(file=sound_path)
+        
+        return pg.mixer.Sound(file=io.BytesIO(sound_file))
+        
+    def _get_asset(self,
+                   asset_key,
+                   load_asset):
+        '''Util function that looks up an asset, loading it with the load_asset callable
+        on a cache miss, and adds a reference to it for the current level. Only called
+        from the main thread.'''
+        
+        with self._lock:
+            asset = self._assets.get(asset_key)
+            
+            if asset is not None:
+                self.hits += 1
+                self._assets.move_to_end(asset_key)
+                
+        if asset is None:
+            # the loader thread only reads the storage, so the lock is not held while loading
+            asset = load_asset()
+            
+            with self._lock:
+                self.misses += 1
+                
+                # store asset and its size estimate
+                self._assets[asset_key] = asset
+                self._asset_sizes[asset_key] = self._get_asset_size(asset)
+                self.memory_used += self._asset_sizes[asset_key]
+                    
+        with self._lock:
+            # reference asset from current level (once per level)
+            if self._current_level is not None and asset_key not in self._level_assets[self._current_level]:
+                self._level_assets[self._current_level].add(asset_key)
+                self._ref_counts[asset_key] = self._ref_counts.get(asset_key, 0) + 1
+                
+            self._evict()
+            
+        return asset
+    
+    def _get_asset_size(self,
+                        asset):
+        '''Util function that estimates the memory used by a surface or sound in bytes.'''
+        
+        if isinstance(asset, pg.Surface):
+            # views share their atlas' pixels, which are counted with the atlas
+            if asset.get_parent() is not None:
+                return 0
+            
+            width, height = asset.get_size()
+            
+            return width * height * asset.get_bytesize()
+        
+        # sounds are stored as raw samples in the mixer's format
+        mixer_specs = pg.mixer.get_init()
+        
+        if mixer_specs is None:
+            return 0
+        
+        frequency, sample_bits, n_channels = mixer_specs
+        
+        return int(asset.get_length() * frequency * abs(sample_bits) // 8 * n_channels)
+    
+    def _evict(self):
+        '''Util function that drops unreferenced assets in least recently used order
+        until the estimated memory use respects the memory budget.'''
+        
+        if self.memory_used <= self._memory_budget:
+            return
+        
+        for asset_key in list(self._assets.keys()):
+            if self.memory_used <= self._memory_budget:
+                break
+            
+            if asset_key in self._ref_counts:
+                continue
+            
+            # drop asset
+            del self._assets[asset_key]
+            self.memory_used -= self._asset_sizes.pop(asset_key)
+            self.evictions += 1
@@ -0,0 +1,213 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 22:37:26 2026
+
+@author: bettmensch
+"""
+
+'''This file contains the sprite atlas classes used in the game STAR WARS DOGFIGHTER.
+The animation and skin meta data refer to their images by atlas entry, i.e. the path of
+the image's BMP file relative to the graphics directory, without the extension (e.g.
+'explosion/explosion1' for ./graphics/explosion/explosion1.bmp).
+
+It contains the AtlasBuilder class, which packs the images of each animation family
+(explosion, muzzle flashes, engine flames, ...) and all sprite skins into one atlas image
+per family and writes a JSON index of where each entry sits in which atlas, and the
+AtlasIndex class, which reads that index back for the AssetManager. Loading one atlas per
+family instead of one file per image means far fewer file reads and decodes at startup
+and level load. The atlases are a build artefact (see misc/build_sprite_atlases.py);
+entries missing from the index, or a missing index, fall back on the entries' BMP files.'''
+
+import os
+import json
+
+import pygame as pg
+
+# increase whenever the index layout changes
+ATLAS_INDEX_VERSION = 1
+
+def get_entry_path(graphics_dir,
+                   entry):
+    '''Returns the path of the BMP file holding the image of the passed atlas entry.'''
+
+    return os.path.join(graphics_dir, *(entry + '.bmp').split('/'))
+
+def get_atlas_families(animations_meta_data,
+                       skins_meta_data):
+    '''Returns a dictionary mapping atlas names to the lists of atlas entries to pack into
+    them: one atlas per animation family of the animations meta data (the ship frames of
+    all colours sharing one), and one 'sprite_skins' atlas for all sprite skins.'''
+
+    families = {}
+
+    for family, animation_meta_data in animations_meta_data.items():
+        entries = list(animation_meta_data.get('atlas_entries', []))
+
+        # nested families like the ship frames hold their entries one level down
+        for value in animation_meta_data.values():
+            if isinstance(value, dict):
+                entries.extend(value.get('atlas_entries', []))
+
+        if entries:
+            families[family] = entries
+
+    families['sprite_skins'] = [entry for skin_meta_data in skins_meta_data.values() for entry in skin_meta_data['atlas_entries']]
+
+    return families
+
+class AtlasBuilder(object):
+    '''Packs atlas entries' images into atlas images and writes the atlas index. Works
+    without a display: images are packed as loaded from disk, and only converted to the
+    display format by the game.'''
+
+    def __init__(self,
+                 graphics_dir = './graphics',
+                 atlas_dir = None,
+                 padding = 1,
+                 max_width = 1024,
+                 background_color = (255,255,255)):
+        '''Arguments:
+
+            graphics_dir: path to the directory holding the entries' BMP files.
+            atlas_dir: path to the directory the atlas images and the index are written
+                    to. Defaults to the atlas subdirectory of graphics_dir.
+            padding: gap in pixels kept between two images in an atlas.
+            max_width: maximum width of an atlas in pixels, unless a single image is wider.
+            background_color: colour of the atlas area not covered by any image. Should be
+                    the images' transparent colour.'''
+
+        if atlas_dir is None:
+            atlas_dir = os.path.join(graphics_dir, 'atlas')
+
+        self._graphics_dir = graphics_dir
+        self._atlas_dir = atlas_dir
+        self._padding = padding
+        self._max_width = max_width
+        self._background_color = background_color
+
+    def _pack(self,
+              sizes):
+        '''Util function that places rectangles of the passed (width, height) sizes on
+        shelves, tallest first. Returns the atlas size and the list of (x, y) top left
+        positions in the order of sizes.'''
+
+        padding = self._padding
+        atlas_w = max([self._max_width] + [w for (w, h) in sizes])
+
+        # narrow families get an atlas about as wide as it is tall
+        total_area = sum([(w + padding) * (h + padding) for (w, h) in sizes])
+        atlas_w = min(atlas_w, max([int(total_area ** 0.5) + 1] + [w for (w, h) in sizes]))
+
+        positions = [None] * len(sizes)
+        x, y, shelf_h, used_w = 0, 0, 0, 0
+
+        for i in sorted(range(len(sizes)), key = lambda i: (-sizes[i][1], -sizes[i][0])):
+            w, h = sizes[i]
+
+            # start a new shelf if the image does not fit on the current one
+            if x and x + w > atlas_w:
+                x, y, shelf_h = 0, y + shelf_h + padding, 0
+
+            positions[i] = (x, y)
+            x += w + padding
+            shelf_h = max(shelf_h, h)
+            used_w = max(used_w, x - padding)
+
+        return (used_w, y + shelf_h), positions
+
+    def build(self,
+              families):
+        '''Builds one atlas per entry of the dictionary families, mapping atlas names to
+        lists of atlas entries (see get_atlas_families), and writes the atlas index.
+        Returns the index as a dictionary.'''
+
+        if not os.path.isdir(self._atlas_dir):
+            os.makedirs(self._atlas_dir)
+
+        index = {'version':ATLAS_INDEX_VERSION,
+                 'atlases':{}}
+
+        for atlas_name in sorted(families):
+            # each image is packed once, however often it is referred to
+            entries = sorted(set(families[atlas_name]))
+            images = [pg.image.load(get_entry_path(self._graphics_dir, entry)) for entry in entries]
+
+            atlas_size, positions = self._pack([image.get_size() for image in images])
+
+            atlas_image = pg.Surface(atlas_size, 0, 24)
+            atlas_image.fill(self._background_color)
+
+            atlas_entries = {}
+
+            for entry, image, (x, y) in zip(entries, images, positions):
+                atlas_image.blit(image, (x, y))
+                atlas_entries[entry] = [x, y, image.get_width(), image.get_height()]
+
+            atlas_file_name = atlas_name + '.bmp'
+            pg.image.save(atlas_image, os.path.join(self._atlas_dir, atlas_file_name))
+
+            index['atlases'][atlas_name] = {'image':atlas_file_name,
+                                            'entries':atlas_entries}
+
+        with open(os.path.join(self._atlas_dir, 'atlas_index.json'), 'w') as index_file:
+            json.dump(index, index_file, sort_keys = True)
+
+        return index
+
+class AtlasIndex(object):
+    '''Looks up where atlas entries sit in the built atlases. Without a (readable,
+    current) index file, no entry is found and all entries are loaded from their own
+    BMP files.'''
+
+    def __init__(self,
+                 graphics_dir = './graphics',
+                 atlas_dir = None):
+        '''Arguments:
+
+            graphics_dir: path to the directory holding the entries' BMP files.
+            atlas_dir: path to the directory holding the atlas images and the index.
+                    Defaults to the atlas subdirectory of graphics_dir.'''
+
+        if atlas_dir is None:
+            atlas_dir = os.path.join(graphics_dir, 'atlas')
+
+        self._graphics_dir = graphics_dir
+
+        # atlas entry -> (path of atlas image, pygame Rect of entry in atlas)
+        self._locations = {}
+
+        try:
+            with open(os.path.join(atlas_dir, 'atlas_index.json'), 'r') as index_file:
+                index = json.load(index_file)
+        except (OSError, ValueError):
+            return
+
+        if index.get('version') != ATLAS_INDEX_VERSION:
+            return
+
+        for atlas in index['atlases'].values():
+            atlas_path = os.path.join(atlas_dir, atlas['image'])
+
+            if not os.path.isfile(atlas_path):
+                continue
+
+            for entry, rect in atlas['entries'].items():
+                self._locations[entry] = (atlas_path, pg.Rect(rect))
+
+    def get_location(self,
+                     entry):
+        '''Returns the path of the atlas image holding the entry and the pygame Rect of
+        the entry's area in it, or None if the entry is not in any atlas.'''
+
+        return self._locations.get(entry)
+
+    def get_entry_path(self,
+                       entry):
+        '''Returns the path of the entry's own BMP file.'''
+
+        return get_entry_path(self._graphics_dir,
+                              entry)
+
+    def __len__(self):
+
+        return len(self._locations)
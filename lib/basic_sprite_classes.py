@@ -6,9 +6,11 @@ Created on Mon Jun  4 00:04:44 2018
 """
 
 from pygame.sprite import Sprite
-from math import cos, sin, pi
+from cache_classes import RotationCache
+from kinematics_classes import KinematicAttribute
+from clock_classes import WallClock
+from vector_math import get_velocity, interpolate
 
-import pygame as pg
 import numpy as np
 
 class TextSprite(Sprite):
@@ -38,6 +40,29 @@ class BasicSprite(Sprite):
     
     COCKPIT_BAR_WIDTH = 280
     
+    # process-wide cache of rotated image surfaces, shared by all sprites
+    ROTATION_CACHE = RotationCache()
+    
+    # opt-in shared KinematicsStore. If set, new sprites register with it and are
+    # moved by its vectorized step instead of update_positional_attributes
+    KINEMATICS_STORE = None
+    USES_KINEMATICS_STORE = True
+    
+    # clock read by all time dependent game logic; a SimulationClock during levels
+    CLOCK = WallClock()
+    
+    # process-wide SpritePool of the sprite type, if pooled. Sprites obtained from
+    # a pool carry it in their _pool attribute and are released to it when killed
+    POOL = None
+    _pool = None
+    
+    # positional attributes; backed by the kinematics store if registered with one
+    _center = KinematicAttribute('_center')
+    _angle = KinematicAttribute('_angle')
+    _speed = KinematicAttribute('_speed')
+    _d_angle = KinematicAttribute('_d_angle')
+    _d_speed = KinematicAttribute('_d_speed')
+    
     def __init__(self,
                  fps,
                  screen,
@@ -79,13 +104,20 @@ class BasicSprite(Sprite):
         self._screen = screen
         self._fps = fps
         
-        # if necessary, make original image surfaces transparent; then attach
+        # if necessary, make original image surfaces transparent; then attach.
+        # Surfaces that were already colour keyed at load time keep their
+        # (possibly RLE accelerated) colour key
         if is_transparent:
             for original_image in original_images:
-                original_image.set_colorkey(transparent_color)
+                if original_image.get_colorkey() is None:
+                    original_image.set_colorkey(transparent_color)
                 
         self._original_images = original_images
         
+        # not registered with a kinematics store (yet)
+        self._kinematics_store = None
+        self._kinematics_slot = None
+        
         # set positional attributes using initial values passed
         self._center = np.array(center,dtype='float')
         self._angle = angle
@@ -101,18 +133,23 @@ class BasicSprite(Sprite):
 
         # initialize image surface object
         self._image_scaling = image_scaling
-        self.image = pg.transform.rotozoom(self._original_images[self._image_index],
-                                           self._angle,
-                                           self._image_scaling)
-        
-        # update object type attribute: mask
-        self.mask = pg.mask.from_surface(self.image)
+        self._frame = self._get_rotated_frame()
+        self.image = self._frame.image
         
         # update object type attributes: positional rectangle
         self.rect = self.image.get_rect()
         
         self.rect.center = self._center
         
+        # centers at the end of the current and the previous step, for interpolated rendering
+        self._step_center = self._center.copy()
+        self._previous_center = self._step_center
+        
+        # if opted in, hand positional attributes over to the shared kinematics store
+        if BasicSprite.KINEMATICS_STORE is not None and self.USES_KINEMATICS_STORE:
+            BasicSprite.KINEMATICS_STORE.register(self,
+                                                  piloted = type(self).set_pilot_commands is not BasicSprite.set_pilot_commands)
+        
     def update_positional_attributes(self):
         '''Updates the sprites positional attributes '_angle' and '_speed'.
         Does not update the 'image','rect' or 'mask' attributes.'''
@@ -126,8 +163,11 @@ class BasicSprite(Sprite):
         # control speed
         self._control_speed()
         
-        # update center argument
-        self._center += self.get_velocity_vector()
+        # update center argument; plain floats are much cheaper than numpy scalars here
+        velocity_x, velocity_y = self.get_velocity_vector()
+        center_x, center_y = self._center.tolist()
+        center_x += velocity_x
+        center_y += velocity_y
         
         # get main screen and current sprite image's dimensions for wrap checks
         screen_w, screen_h= self._screen.get_size()
@@ -135,30 +175,44 @@ class BasicSprite(Sprite):
         buffer = BasicSprite.COCKPIT_BAR_WIDTH
         
         # wrap horizontaly if needed
-        if self._center[0] < buffer - image_w / 2:
-            self._center[0] = screen_w + image_w / 2 - buffer
-        elif self._center[0] > screen_w - buffer + image_w / 2:
-            self._center[0] = buffer - image_w / 2
+        if center_x < buffer - image_w / 2:
+            center_x = screen_w + image_w / 2 - buffer
+        elif center_x > screen_w - buffer + image_w / 2:
+            center_x = buffer - image_w / 2
                         
         # wrap vertically if needed
-        if self._center[1] < - image_h / 2:
-            self._center[1] = screen_h + image_h / 2
-        elif self._center[1] > screen_h + image_h / 2:
-            self._center[1] = - image_h / 2
+        if center_y < - image_h / 2:
+            center_y = screen_h + image_h / 2
+        elif center_y > screen_h + image_h / 2:
+            center_y = - image_h / 2
             
+        # write back in place
+        self._center[0] = center_x
+        self._center[1] = center_y
         
     def get_velocity_vector(self):
-        '''Calculates a 2-dim velocity vector (units: frames per second) based
-        on 'self._angle' and 'self._speed' attributes.'''
+        '''Calculates a 2-dim velocity vector (units: pixels per frame) based
+        on 'self._angle' and 'self._speed' attributes. Returns an (x, y) tuple.'''
         
-        # convert angle to radian
-        radian_angle = self._angle * pi / 180
+        return get_velocity(self._angle,
+                            self._speed)
+    
+    @property
+    def mask(self):
+        '''Collision mask of the sprite's current image. Only built when first
+        requested (i.e. by pygame's collide_mask) and then memoized on the
+        shared rotated frame.'''
         
-        # compute velocity vector
-        velocity = self._speed * np.array([cos(radian_angle),
-                                           -sin(radian_angle)]).reshape((1,2)) # in pygame coordinates, the y-axis has negative orientation
+        return self._frame.mask
+    
+    def _get_rotated_frame(self):
+        '''Util function that returns the cached frame for the current original image
+        rotated by the sprite's angle and scaled by its image scaling, looked up from
+        the shared rotation cache.'''
         
-        return velocity.reshape(2)
+        return BasicSprite.ROTATION_CACHE.get_frame(self._original_images[self._image_index],
+                                                    self._angle,
+                                                    self._image_scaling)
     
     def set_pilot_commands(self):
         '''Calculates and sets the scalar float values for attributes  _d_angle
@@ -173,24 +227,75 @@ class BasicSprite(Sprite):
         
         return
     
+    def _set_speed_limits(self,
+                          min_speed,
+                          max_speed):
+        '''Util function that passes the sprite's speed constraints (in pixels per
+        frame) on to its kinematics store, if it is registered with one. Outside a
+        store, speed constraints are enforced by _control_speed.'''
+        
+        if self._kinematics_slot is not None:
+            self._kinematics_store.set_speed_limits(self,
+                                                    min_speed,
+                                                    max_speed)
+            
+    def kill(self):
+        '''Base class kill method plus release from the kinematics store, if
+        registered with one, and release to the sprite's pool, if it was acquired
+        from one. The sprite keeps its last positional attributes.'''
+        
+        if self._kinematics_slot is not None:
+            self._kinematics_store.release(self)
+            
+        Sprite.kill(self)
+        
+        if self._pool is not None:
+            self._pool.release(self)
+    
     def update(self):
-        '''Updates the sprite's object type attributes 'image','rect' and 'mask' based on 
+        '''Updates the sprite's object type attributes 'image' and 'rect' (and through these 'mask') based on 
         updated numerical positional attributes'self._angle','self._speed' and self_center'.'''
         
-        # get directional changes
-        self.set_pilot_commands()
-        
-        # update numerical positional attributes
-        self.update_positional_attributes()
+        # sprites in a kinematics store have already been moved by the store's step
+        if self._kinematics_slot is None:
+            # get directional changes
+            self.set_pilot_commands()
+            
+            # update numerical positional attributes
+            self.update_positional_attributes()
         
-        # update object type attributes: surface
-        self.image = pg.transform.rotozoom(self._original_images[self._image_index],
-                                           self._angle,
-                                           self._image_scaling)
-
-        # update object type attribute: mask
-        self.mask = pg.mask.from_surface(self.image)
+        # update object type attributes: surface. The mask is looked up lazily
+        # from the same cached frame
+        self._frame = self._get_rotated_frame()
+        self.image = self._frame.image
         
         # update object type attributes: positional rectangle
         self.rect = self.image.get_rect()
         self.rect.center = self._center
+        
+        # let the store know the current image size for wrapping
+        if self._kinematics_slot is not None:
+            self._kinematics_store.set_extent(self,
+                                              self.rect.size)
+            
+        # remember centers of this and the previous step for interpolated rendering
+        self._previous_center = self._step_center
+        self._step_center = self._center.copy()
+        
+    def interpolate(self,
+                    alpha):
+        '''Positions the sprite's rect between its centers at the end of the previous
+        and the current simulation step, where alpha = 0 means the previous and alpha = 1
+        the current step. Used to render at a higher rate than the simulation runs.
+        Sprites that wrapped around the screen edges during the last step are drawn
+        at their current position.'''
+        
+        step_center = self._step_center.tolist()
+        previous_center = self._previous_center.tolist()
+        
+        if abs(step_center[0] - previous_center[0]) + abs(step_center[1] - previous_center[1]) > self._screen.get_height() / 2:
+            self.rect.center = step_center
+        else:
+            self.rect.center = interpolate(previous_center,
+                                           step_center,
+                                           alpha)
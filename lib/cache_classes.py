@@ -0,0 +1,304 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 10:12:31 2026
+
+@author: bettmensch
+"""
+
+'''This file contains the caching classes used in the game STAR WARS DOGFIGHTER.
+It contains the RotationCache class, which memoizes rotated (and scaled) copies
+of the sprites' original image surfaces so that sprites sharing the same skin
+do not need to call pygame's rotozoom every frame, and the RotatedFrame class
+holding one such cached surface together with its lazily built collision mask.
+It also contains the FontRegistry and TextCache classes, which keep loaded fonts and
+rendered text surfaces around so that HUD elements and labels do not need to hit the
+file system and the font renderer every time they are (re)drawn.'''
+
+from collections import OrderedDict
+
+import pygame as pg
+
+class RotatedFrame(object):
+    '''Cache entry holding a rotated surface. The surface's collision mask is only
+    built on first access and then kept for all sprites sharing this frame.'''
+    
+    __slots__ = ('image','_mask')
+    
+    def __init__(self,
+                 image):
+        
+        self.image = image
+        self._mask = None
+        
+    @property
+    def mask(self):
+        '''The pygame Mask of the rotated surface, built on first access.'''
+        
+        if self._mask is None:
+            self._mask = pg.mask.from_surface(self.image)
+            
+        return self._mask
+
+class RotationCache(object):
+    '''Process-wide LRU cache for rotated and scaled surfaces. Entries are keyed
+    by (source surface, angle bucket, scale), where the angle bucket is the sprite's
+    angle quantized to the cache's angular resolution.'''
+
+    def __init__(self,
+                 angle_resolution = 1,
+                 max_entries = 4096,
+                 smooth = True):
+        '''Arguments:
+
+            angle_resolution: width of one angle bucket in degrees. Angles within the same
+                    bucket share the same rotated surface. Default is 1 degree.
+            max_entries: maximum number of rotated frames held by the cache. When exceeded,
+                    the least recently used frame (and its mask) is evicted.
+            smooth: if set, frames are rotated with pygame's (anti-aliased) rotozoom. If not,
+                    unscaled frames are rotated with pygame's faster, unfiltered rotate.'''
+
+        # set cache specs
+        self._angle_resolution = angle_resolution
+        self._max_entries = max_entries
+        self._smooth = smooth
+
+        # initialize storage and statistics
+        self._entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def configure(self,
+                  angle_resolution = None,
+                  max_entries = None,
+                  smooth = None):
+        '''Util function that updates the cache specs. Changing the angular resolution
+        or the rotation method invalidates all existing entries.'''
+
+        if angle_resolution is not None and angle_resolution != self._angle_resolution:
+            self._angle_resolution = angle_resolution
+            self.clear()
+
+        if smooth is not None and smooth != self._smooth:
+            self._smooth = smooth
+            self.clear()
+
+        if max_entries is not None:
+            self._max_entries = max_entries
+            self._evict()
+
+    @property
+    def angle_resolution(self):
+        '''Width of one angle bucket in degrees.'''
+
+        return self._angle_resolution
+
+    @property
+    def smooth(self):
+        '''Whether frames are rotated with rotozoom rather than rotate.'''
+
+        return self._smooth
+
+    def clear(self):
+        '''Removes all cached surfaces.'''
+
+        self._entries.clear()
+
+    def get_angle_bucket(self,
+                         angle):
+        '''Util function that maps an angle in degrees onto its bucket index.'''
+
+        n_buckets = int(round(360 / self._angle_resolution))
+
+        return int(round(angle / self._angle_resolution)) % n_buckets
+
+    def get_frame(self,
+                  original_image,
+                  angle,
+                  scale = 1):
+        '''Returns the RotatedFrame holding the rotated and scaled version of the
+        original_image surface, either from the cache or by calling pygame's rotozoom
+        (or rotate, if the cache is not smooth and the frame is not scaled) on a cache
+        miss. Frames of RLE accelerated originals are RLE accelerated as well.'''
+
+        # get cache key
+        angle_bucket = self.get_angle_bucket(angle)
+        key = (original_image, angle_bucket, scale)
+
+        # look up rotated frame and mark as most recently used
+        rotated_frame = self._entries.get(key)
+
+        if rotated_frame is not None:
+            self.hits += 1
+            self._entries.move_to_end(key)
+
+            return rotated_frame
+
+        # on cache miss, rotate at the bucket's center angle and store
+        self.misses += 1
+        
+        if self._smooth or scale != 1:
+            rotated_image = pg.transform.rotozoom(self._get_rotation_source(original_image),
+                                                  angle_bucket * self._angle_resolution,
+                                                  scale)
+        else:
+            # rotate fills the corners with the colour key, so keyed surfaces stay transparent as they are
+            rotated_image = pg.transform.rotate(original_image,
+                                                angle_bucket * self._angle_resolution)
+            
+        # neither rotozoom nor rotate carry over the original's RLE acceleration
+        if original_image.get_flags() & (pg.RLEACCEL | pg.RLEACCELOK):
+            self._set_rle(rotated_image)
+            
+        rotated_frame = RotatedFrame(rotated_image)
+        self._entries[key] = rotated_frame
+        self._evict()
+
+        return rotated_frame
+
+    def _get_rotation_source(self,
+                             original_image):
+        '''Util function that returns the surface to hand to rotozoom for the
+        original_image surface. rotozoom only keeps a colour key transparent when it
+        has to convert the surface to 32 bit itself, which is no longer the case for
+        surfaces converted to the display format, so colour keyed surfaces are copied
+        onto a per-pixel alpha surface first.'''
+
+        if original_image.get_colorkey() is None or original_image.get_flags() & pg.SRCALPHA:
+            return original_image
+
+        # colour keyed pixels are skipped by the blit and stay fully transparent
+        rotation_source = pg.Surface(original_image.get_size(), pg.SRCALPHA, 32)
+        rotation_source.blit(original_image, (0,0))
+
+        return rotation_source
+
+    def _set_rle(self,
+                 rotated_image):
+        '''Util function that RLE accelerates the rotated_image surface, keeping its
+        transparency: per-pixel alpha for rotozoom's frames, the colour key for rotate's.'''
+
+        if rotated_image.get_flags() & pg.SRCALPHA:
+            rotated_image.set_alpha(255, pg.RLEACCEL)
+        else:
+            rotated_image.set_colorkey(rotated_image.get_colorkey(), pg.RLEACCEL)
+
+    def rotate(self,
+               original_image,
+               angle,
+               scale = 1):
+        '''Returns the rotated and scaled version of the original_image surface.
+        See get_frame.'''
+
+        return self.get_frame(original_image,
+                              angle,
+                              scale).image
+
+    def _evict(self):
+        '''Util function that drops least recently used entries until the cache
+        respects its size limit.'''
+
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+
+    def __len__(self):
+
+        return len(self._entries)
+
+class FontRegistry(object):
+    '''Registry of pygame Font objects keyed by (font path, size). Each font file is
+    only opened once per size.'''
+    
+    def __init__(self):
+        
+        self._fonts = {}
+        
+    def get_font(self,
+                 font_path,
+                 size):
+        '''Returns the shared pygame Font object for the given font file and size.'''
+        
+        key = (font_path, size)
+        font = self._fonts.get(key)
+        
+        if font is None:
+            font = pg.font.Font(font_path, size)
+            self._fonts[key] = font
+            
+        return font
+    
+class TextCache(object):
+    '''LRU cache of rendered text surfaces keyed by (font, text, colour, antialias,
+    background colour). The returned surfaces are shared and must not be drawn on.'''
+    
+    def __init__(self,
+                 font_registry = None,
+                 max_entries = 512):
+        '''Arguments:
+            
+            font_registry: FontRegistry object used to look up fonts by path and size.
+                    A new one is created if not specified.
+            max_entries: maximum number of rendered text surfaces held by the cache.'''
+            
+        if font_registry is None:
+            font_registry = FontRegistry()
+            
+        self.fonts = font_registry
+        self._max_entries = max_entries
+        
+        # initialize storage and statistics
+        self._entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        
+    def render(self,
+               text,
+               font_path,
+               size,
+               text_color,
+               antialias = True,
+               background_color = None):
+        '''Returns the surface showing text rendered with the font at font_path in
+        the given size and colour(s). See pygame's Font.render.'''
+        
+        return self.render_with_font(text,
+                                     self.fonts.get_font(font_path, size),
+                                     text_color,
+                                     antialias = antialias,
+                                     background_color = background_color)
+    
+    def render_with_font(self,
+                         text,
+                         font,
+                         text_color,
+                         antialias = True,
+                         background_color = None):
+        '''Returns the surface showing text rendered with the passed pygame Font
+        object, either from the cache or by rendering it on a cache miss.'''
+        
+        # get cache key; colours can be passed as lists
+        if background_color is not None:
+            background_color = tuple(background_color)
+            
+        key = (font, text, tuple(text_color), antialias, background_color)
+        
+        # look up text surface and mark as most recently used
+        text_surface = self._entries.get(key)
+        
+        if text_surface is not None:
+            self.hits += 1
+            self._entries.move_to_end(key)
+            
+            return text_surface
+        
+        # on cache miss, render and store
+        self.misses += 1
+        text_surface = font.render(text, antialias, text_color, background_color)
+        self._entries[key] = text_surface
+        
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+        
+        return text_surface
+    
+# process-wide text cache shared by all HUD elements and labels
+TEXT_CACHE = TextCache()
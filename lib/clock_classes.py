@@ -0,0 +1,60 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 18:04:55 2026
+
+@author: bettmensch
+"""
+
+'''This file contains the clock classes used in the game STAR WARS DOGFIGHTER.
+All game logic that depends on elapsed time (laser cooldowns, hit flashing, the AI's
+stun after being hit) reads the clock injected as BasicSprite.CLOCK instead of pygame's
+wall clock. During a level this is a SimulationClock, which only advances by one fixed
+time step per simulation step, so that gameplay does not depend on how long a frame
+took to compute or draw, and headless simulations can run as fast as the CPU allows.
+Outside of levels, the WallClock class simply passes pygame's clock through.'''
+
+import pygame as pg
+
+class WallClock(object):
+    '''Clock reporting pygame's wall clock time.'''
+
+    def get_ticks(self):
+        '''Returns the number of milliseconds since pygame.init() was called.'''
+
+        return pg.time.get_ticks()
+
+class SimulationClock(object):
+    '''Clock reporting simulated time. Advances by step_seconds with every call
+    to advance, i.e. with every fixed simulation step.'''
+
+    def __init__(self,
+                 step_seconds):
+        '''Arguments:
+
+            step_seconds: length of one simulation step in seconds. Sprite speeds and turn
+                    rates are set up per frame at the game's fps, so this should be 1 / fps.'''
+
+        self.step_seconds = step_seconds
+        self.reset()
+
+    def reset(self):
+        '''Sets the simulated time back to zero.'''
+
+        self.n_steps = 0
+        self._ticks = 0
+
+    def advance(self):
+        '''Advances the simulated time by one step.'''
+
+        self.n_steps += 1
+        self._ticks = self.n_steps * self.step_seconds * 1000
+
+    def get_ticks(self):
+        '''Returns the simulated time in milliseconds, like pygame.time.get_ticks.'''
+
+        return self._ticks
+
+    def get_seconds(self):
+        '''Returns the simulated time in seconds.'''
+
+        return self.n_steps * self.step_seconds
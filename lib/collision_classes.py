@@ -0,0 +1,90 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 14:05:52 2026
+
+@author: bettmensch
+"""
+
+'''This file contains the collision detection classes used in the game STAR WARS DOGFIGHTER.
+It contains the CollisionEngine class, which replaces repeated calls to pygame's
+groupcollide: ships are hashed into a uniform grid once per frame (broadphase), so
+that each projectile only needs to be tested against the few ships sharing its grid
+cells, and a single mask based narrow-phase pass yields the (ship, projectile) pairs
+that are used for all hit handling.'''
+
+from pygame.sprite import collide_mask
+
+class CollisionEngine(object):
+    '''Spatial hash broadphase plus mask based narrow phase for ship vs projectile
+    collisions. Call rebuild once per frame, then find_hits for each side.'''
+
+    def __init__(self,
+                 cell_size = 64):
+        '''Arguments:
+
+            cell_size: side length of the grid cells in pixels. Should be roughly the size
+                    of a ship sprite.'''
+
+        self._cell_size = cell_size
+
+        # one grid per side, mapping cell coordinates to a list of ships
+        self._grids = {}
+
+    def _get_cells(self,
+                   rect):
+        '''Util function that returns the coordinates of all grid cells covered by
+        the passed rectangle.'''
+
+        cell_size = self._cell_size
+
+        x_cells = range(rect.left // cell_size, (rect.right - 1) // cell_size + 1)
+        y_cells = range(rect.top // cell_size, (rect.bottom - 1) // cell_size + 1)
+
+        return [(x_cell, y_cell) for x_cell in x_cells for y_cell in y_cells]
+
+    def rebuild(self,
+                ship_groups):
+        '''Rebuilds the spatial hash from a dictionary mapping side (e.g. 'ally',
+        'hostile') to the pygame Group holding that side's ships.'''
+
+        self._grids = {}
+
+        for side, ship_group in ship_groups.items():
+            grid = {}
+
+            for ship in ship_group.sprites():
+                for cell in self._get_cells(ship.rect):
+                    if cell in grid:
+                        grid[cell].append(ship)
+                    else:
+                        grid[cell] = [ship]
+
+            self._grids[side] = grid
+
+    def find_hits(self,
+                  side,
+                  projectile_group):
+        '''Returns the list of (ship, projectile) pairs for which a projectile from
+        projectile_group overlaps (on pixel level) a ship of the specified side,
+        as hashed by the last rebuild.'''
+
+        grid = self._grids.get(side, {})
+        hits = []
+
+        if not grid:
+            return hits
+
+        for projectile in projectile_group.sprites():
+            # gather candidate ships from the projectile's cells, without duplicates
+            candidates = {}
+
+            for cell in self._get_cells(projectile.rect):
+                for ship in grid.get(cell, ()):
+                    candidates[ship] = True
+
+            # narrow phase: rectangle, then mask test
+            for ship in candidates:
+                if ship.rect.colliderect(projectile.rect) and collide_mask(ship, projectile):
+                    hits.append((ship, projectile))
+
+        return hits
@@ -0,0 +1,270 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 21:26:40 2026
+
+@author: bettmensch
+"""
+
+'''This file contains the cockpit HUD classes used for large battles in the game
+STAR WARS DOGFIGHTER. The cockpit bars only have room for a handful of ShipBio cards
+per side. For squadrons that do not fit, the SquadronPanel sprite takes the first
+card slot and shows the squadron's aggregated stats (ships alive, total hit points)
+and a short threat list of the squadron's ships with the most hostiles on their tail.
+The remaining slots show virtualized ShipBio cards: cards only exist for ships that
+have been on display, and only the cards currently shown are in the cockpit group,
+i.e. get updated and drawn. Which ships are shown is re-evaluated every few frames,
+focused ships (e.g. the player's current target) first, then the most threatened
+ones. Updating and drawing cards therefore costs the same for any squadron size; only
+the light aggregation pass over the squadron grows with it, and it runs every few
+frames.'''
+
+from pygame.sprite import Sprite
+from cache_classes import TEXT_CACHE
+
+import pygame as pg
+
+class SquadronPanel(Sprite):
+    '''Sprite showing a squadron's aggregated stats and managing the virtualized
+    ShipBio cards of the squadron's ships in the card slots below it.'''
+
+    # panels refresh every refresh_frames times this many frames; raised by the game's
+    # quality controller to refresh the HUD less often when frames take too long
+    REFRESH_INTERVAL = 1
+
+    def __init__(self,
+                 side,
+                 cockpit_group,
+                 create_card,
+                 center,
+                 card_centers,
+                 get_engagement,
+                 focus_group = None,
+                 n_threats = 4,
+                 refresh_frames = 10,
+                 font = 'freesansbold.ttf',
+                 size = 15,
+                 small_size = 12):
+        '''Arguments:
+
+            side: 'ally' or 'hostile'. Sets the panel's colours and title.
+            cockpit_group: pygame Group of the cockpit HUD. The panel adds itself and the
+                    cards on display to this group.
+            create_card: function taking a ship and its max hit points and returning a new
+                    ShipBio for it, not added to any group.
+            center: center position of the panel on the main screen.
+            card_centers: list of center positions of the card slots under the panel.
+            get_engagement: function taking a ship and returning the number of hostiles
+                    currently targeting it, e.g. the AI's target index's get_engagement.
+            focus_group: optional pygame Group (e.g. the player's current target group).
+                    Squadron ships in this group are always shown first.
+            n_threats: number of entries in the threat list.
+            refresh_frames: number of frames between two refreshes of the panel and the
+                    card slot assignments.
+            font: path to the font file used.
+            size: font size of title and stats.
+            small_size: font size of the threat list.'''
+
+        Sprite.__init__(self,
+                        cockpit_group)
+
+        self._side = side
+        self._cockpit_group = cockpit_group
+        self._create_card = create_card
+        self._card_centers = card_centers
+        self._get_engagement = get_engagement
+        self._focus_group = focus_group
+        self._n_threats = n_threats
+        self._refresh_frames = refresh_frames
+
+        if side == 'hostile':
+            self.frame_color = (255,0,0) # red
+            self._title = "Hostile squadron"
+        else:
+            self.frame_color = (0,255,0) # green
+            self._title = "Allied squadron"
+
+        self.base_text_color = (0,200,200) # light blue
+        self.base_display_color = (0,70,70) # dark blue
+
+        # attach fonts; shared with the cards via the text cache's font registry
+        self._font = TEXT_CACHE.fonts.get_font(font,size)
+        self._small_font = TEXT_CACHE.fonts.get_font(font,small_size)
+
+        # squadron as spawned: ships in spawn order and their max hit points
+        self._ships = []
+        self._max_hit_points = {}
+
+        # virtualized cards: created on first display, kept while the ship lives
+        self._cards = {}
+        self._shown_ships = []
+
+        self._frames_since_refresh = 0
+        self._stats = None
+
+        self.image = self._get_static_layer()
+        self.rect = self.image.get_rect()
+        self.rect.center = center
+
+    def add_ship(self,
+                 ship):
+        '''Registers a newly spawned ship of the squadron. No card is created yet.'''
+
+        self._ships.append(ship)
+        self._max_hit_points[ship] = ship._hit_points
+
+        # show the first ships right away
+        self._frames_since_refresh = self._refresh_frames * SquadronPanel.REFRESH_INTERVAL
+
+    def _get_static_layer(self):
+        '''Util function that renders the panel's background, frame and title.'''
+
+        panel = pg.Surface((280,120))
+        panel.fill(self.base_display_color)
+        pg.draw.rect(panel, self.frame_color, pg.Rect(0,0,280,120), 5)
+
+        panel.blit(TEXT_CACHE.render_with_font(self._title,
+                                               self._font,
+                                               self.frame_color),
+                   (12,8))
+
+        return panel
+
+    def _get_stats(self):
+        '''Util function that aggregates the squadron's stats. Returns ships alive,
+        ships spawned, total hit points, total max hit points and the threat list as
+        a list of (ship id, number of hostiles on its tail) tuples.'''
+
+        # ships of the side's group that were not spawned with the squadron (i.e. the player) do not count
+        live_ships = [ship for ship in self._ships if ship._alive]
+        get_engagement = self._get_engagement
+
+        hit_points = sum([max(ship._hit_points, 0) for ship in live_ships])
+        max_hit_points = sum(self._max_hit_points.values())
+
+        # most threatened live ships first; ships nobody is after are no threat
+        engagements = [(get_engagement(ship), ship) for ship in live_ships]
+        engagements = [(engagement, ship) for (engagement, ship) in engagements if engagement]
+        engagements.sort(key = lambda item: -item[0])
+
+        threats = tuple([(ship._ship_id, engagement) for (engagement, ship) in engagements[:self._n_threats]])
+
+        return (len(live_ships), len(self._ships), hit_points, max_hit_points, threats), engagements
+
+    def _render(self,
+                stats):
+        '''Util function that renders the panel for the passed stats.'''
+
+        n_alive, n_spawned, hit_points, max_hit_points, threats = stats
+
+        panel = self._get_static_layer()
+
+        # ships alive and total hit points
+        panel.blit(TEXT_CACHE.render_with_font("Alive " + str(n_alive) + " / " + str(n_spawned),
+                                               self._font,
+                                               self.base_text_color),
+                   (12,30))
+        panel.blit(TEXT_CACHE.render_with_font("HP " + str(hit_points) + " / " + str(max_hit_points),
+                                               self._font,
+                                               self.base_text_color),
+                   (12,50))
+
+        # hit point bar, coloured like the cards' hit points
+        hp_share = hit_points / max_hit_points if max_hit_points else 0
+
+        if 0.2 <= hp_share < 0.5:
+            hp_color = (255,255,0) # yellow
+        elif hp_share < 0.2:
+            hp_color = (255,0,0) # RED
+        else:
+            hp_color = (0,255,0) # green
+
+        pg.draw.rect(panel, self.base_text_color, pg.Rect(12,70,256,6), 1)
+        pg.draw.rect(panel, hp_color, pg.Rect(12,70,int(256 * hp_share),6))
+
+        # threat list, two entries per line
+        for i, (ship_id, engagement) in enumerate(threats):
+            panel.blit(TEXT_CACHE.render_with_font(ship_id + " x" + str(engagement),
+                                                   self._small_font,
+                                                   self.frame_color),
+                       (12 + (i % 2) * 130, 82 + (i // 2) * 16))
+
+        self.image = panel
+
+    def _get_ships_to_show(self,
+                           engagements):
+        '''Util function that returns the live ships to put in the card slots: focused
+        ships first, then the most threatened ships, then the remaining ones in spawn
+        order.'''
+
+        n_slots = len(self._card_centers)
+
+        ships_to_show = []
+
+        if self._focus_group is not None:
+            ships_to_show.extend([ship for ship in self._focus_group.sprites() if ship in self._max_hit_points and ship._alive])
+
+        for (engagement, ship) in engagements:
+            if len(ships_to_show) >= n_slots:
+                break
+
+            if ship not in ships_to_show:
+                ships_to_show.append(ship)
+
+        for ship in self._ships:
+            if len(ships_to_show) >= n_slots:
+                break
+
+            if ship._alive and ship not in ships_to_show:
+                ships_to_show.append(ship)
+
+        return ships_to_show[:n_slots]
+
+    def _show_cards(self,
+                    ships_to_show):
+        '''Util function that puts the cards of the passed ships in the card slots and
+        takes all other cards out of the cockpit group.'''
+
+        # take cards of ships no longer shown off the cockpit, forget those of dead ships
+        for ship in self._shown_ships:
+            if ship not in ships_to_show:
+                self._cards[ship].remove(self._cockpit_group)
+
+        for ship in list(self._cards.keys()):
+            if not ship._alive and ship not in ships_to_show:
+                del self._cards[ship]
+
+        # create missing cards, then place cards in slots in order
+        for ship, card_center in zip(ships_to_show, self._card_centers):
+            card = self._cards.get(ship)
+
+            if card is None:
+                card = self._create_card(ship,
+                                         self._max_hit_points.get(ship, ship._hit_points))
+                self._cards[ship] = card
+
+            if tuple(card.rect.center) != tuple(card_center):
+                card.rect.center = card_center
+                card.dirty = 1
+
+            card.add(self._cockpit_group)
+
+        self._shown_ships = ships_to_show
+
+    def update(self):
+        '''Refreshes the panel's stats and the card slots every refresh_frames times
+        REFRESH_INTERVAL frames. The panel is only re-rendered if its stats have changed.'''
+
+        self._frames_since_refresh += 1
+
+        if self._frames_since_refresh < self._refresh_frames * SquadronPanel.REFRESH_INTERVAL:
+            return
+
+        self._frames_since_refresh = 0
+
+        stats, engagements = self._get_stats()
+
+        if stats != self._stats:
+            self._render(stats)
+            self._stats = stats
+
+        self._show_cards(self._get_ships_to_show(engagements))
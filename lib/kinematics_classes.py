@@ -0,0 +1,241 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 15:11:26 2026
+
+@author: bettmensch
+"""
+
+'''This file contains the kinematics classes used in the game STAR WARS DOGFIGHTER.
+It contains the KinematicsStore class, an opt-in shared store that keeps the positional
+attributes (center, angle, speed, their rates of change and speed limits) of all live
+sprites in contiguous numpy arrays and integrates and wraps them in a few vectorized
+operations per frame, and the KinematicAttribute descriptor through which sprites keep
+accessing their positional attributes as before, whether they live in a store or not.'''
+
+import numpy as np
+
+class KinematicAttribute(object):
+    '''Descriptor for a sprite's positional attribute. Reads and writes go to the
+    sprite's slot in its KinematicsStore if the sprite is registered with one, and
+    to a plain instance attribute otherwise.'''
+
+    def __init__(self,
+                 array_name):
+        '''Arguments:
+
+            array_name: name of the KinematicsStore array backing this attribute.'''
+
+        self._array_name = array_name
+        self._local_name = '_local_' + array_name
+
+    def __get__(self,
+                sprite,
+                owner):
+
+        if sprite is None:
+            return self
+
+        slot = sprite.__dict__.get('_kinematics_slot')
+
+        if slot is None:
+            return sprite.__dict__[self._local_name]
+
+        # for the center attribute, this returns a view on the store's row
+        return getattr(sprite._kinematics_store, self._array_name)[slot]
+
+    def __set__(self,
+                sprite,
+                value):
+
+        slot = sprite.__dict__.get('_kinematics_slot')
+
+        if slot is None:
+            sprite.__dict__[self._local_name] = value
+        else:
+            getattr(sprite._kinematics_store, self._array_name)[slot] = value
+
+class KinematicsStore(object):
+    '''Shared store for the positional attributes of all registered sprites. Each
+    registered sprite occupies one slot (row) of the store's arrays. Calling step once
+    per frame collects the pilot commands of all registered sprites, then updates
+    angles, speeds and centers and applies the 'donut topology' wrap of all sprites at
+    once, replicating BasicSprite.update_positional_attributes.'''
+
+    # positional attributes held by the store, in the sprites' attribute naming
+    ATTRIBUTE_NAMES = ('_center','_angle','_speed','_d_angle','_d_speed')
+
+    def __init__(self,
+                 screen_size,
+                 buffer,
+                 capacity = 256):
+        '''Arguments:
+
+            screen_size: (width, height) of the main screen in pixels.
+            buffer: width of the cockpit bars on either side of the screen. Sprites wrap
+                    horizontally at the inner edges of the cockpit bars.
+            capacity: initial number of slots. The store grows as needed.'''
+
+        self._screen_w, self._screen_h = screen_size
+        self._buffer = buffer
+
+        # allocate arrays
+        self._capacity = 0
+        self._allocate(capacity)
+
+        # slot bookkeeping
+        self._sprites = {} # slot -> sprite
+        self._piloted_sprites = {} # slot -> sprite for sprites with custom pilot commands
+        self._free_slots = []
+        self._n_slots = 0 # high water mark; slots above this are unused
+
+    def _allocate(self,
+                  capacity):
+        '''Util function that (re)allocates the store's arrays with the specified
+        capacity, keeping the values of existing slots.'''
+
+        n_old = self._capacity
+
+        new_arrays = {'_center':np.zeros((capacity,2)),
+                      '_angle':np.zeros(capacity),
+                      '_speed':np.zeros(capacity),
+                      '_d_angle':np.zeros(capacity),
+                      '_d_speed':np.zeros(capacity),
+                      '_min_speed':np.full(capacity,-np.inf),
+                      '_max_speed':np.full(capacity,np.inf),
+                      '_extent':np.zeros((capacity,2))}
+
+        for array_name, new_array in new_arrays.items():
+            if n_old:
+                new_array[:n_old] = getattr(self, array_name)
+
+            setattr(self, array_name, new_array)
+
+        self._capacity = capacity
+
+    def register(self,
+                 sprite,
+                 piloted = True):
+        '''Assigns a slot to the sprite, moves the sprite's current positional
+        attributes into the store and attaches the store to the sprite. If piloted
+        is set, the sprite's set_pilot_commands method is called at each step.'''
+
+        # get free slot, growing arrays if needed
+        if self._free_slots:
+            slot = self._free_slots.pop()
+        else:
+            if self._n_slots == self._capacity:
+                self._allocate(2 * self._capacity)
+
+            slot = self._n_slots
+            self._n_slots += 1
+
+        # copy sprite's values into its slot
+        for attribute_name in KinematicsStore.ATTRIBUTE_NAMES:
+            getattr(self, attribute_name)[slot] = getattr(sprite, attribute_name)
+
+        self._min_speed[slot] = -np.inf
+        self._max_speed[slot] = np.inf
+        self._extent[slot] = sprite.image.get_size()
+
+        # attach store to sprite
+        sprite._kinematics_store = self
+        sprite._kinematics_slot = slot
+
+        # remember sprite; only sprites with their own piloting logic need command calls
+        self._sprites[slot] = sprite
+
+        if piloted:
+            self._piloted_sprites[slot] = sprite
+
+    def release(self,
+                sprite):
+        '''Frees the sprite's slot. The sprite's current positional attributes are
+        copied back into plain instance attributes, so it keeps working outside the store.'''
+
+        slot = sprite._kinematics_slot
+
+        # copy values out of the store
+        values = {}
+
+        for attribute_name in KinematicsStore.ATTRIBUTE_NAMES:
+            values[attribute_name] = getattr(self, attribute_name)[slot].copy()
+
+        # detach sprite and restore local values
+        sprite._kinematics_slot = None
+
+        for attribute_name, value in values.items():
+            setattr(sprite, attribute_name, value)
+
+        # reset slot so that integrating it is harmless
+        self._speed[slot] = self._d_speed[slot] = self._d_angle[slot] = 0
+        self._min_speed[slot] = -np.inf
+        self._max_speed[slot] = np.inf
+
+        del self._sprites[slot]
+        self._piloted_sprites.pop(slot, None)
+        self._free_slots.append(slot)
+
+    def set_speed_limits(self,
+                         sprite,
+                         min_speed,
+                         max_speed):
+        '''Sets the speed limits (in pixels per frame) enforced on the sprite when
+        integrating.'''
+
+        self._min_speed[sprite._kinematics_slot] = min_speed
+        self._max_speed[sprite._kinematics_slot] = max_speed
+
+    def set_extent(self,
+                   sprite,
+                   size):
+        '''Records the size of the sprite's current image, used for wrapping.'''
+
+        self._extent[sprite._kinematics_slot] = size
+
+    def step(self):
+        '''Collects pilot commands from all registered sprites, then integrates and
+        wraps all of them.'''
+
+        # get directional changes
+        for sprite in list(self._piloted_sprites.values()):
+            sprite.set_pilot_commands()
+
+        n = self._n_slots
+
+        if not n:
+            return
+
+        # update angle and speed; control speed
+        angle = self._angle[:n]
+        speed = self._speed[:n]
+
+        angle += self._d_angle[:n]
+        speed += self._d_speed[:n]
+        np.clip(speed, self._min_speed[:n], self._max_speed[:n], out=speed)
+
+        # update centers; in pygame coordinates, the y-axis has negative orientation
+        radian_angle = np.radians(angle)
+        center = self._center[:n]
+        center[:,0] += speed * np.cos(radian_angle)
+        center[:,1] -= speed * np.sin(radian_angle)
+
+        # wrap horizontally at cockpit bars, vertically at screen edges if needed
+        half_w = self._extent[:n,0] / 2
+        half_h = self._extent[:n,1] / 2
+        buffer = self._buffer
+
+        x, y = center[:,0], center[:,1]
+
+        too_left = x < buffer - half_w
+        too_right = x > self._screen_w - buffer + half_w
+        x[too_left] = (self._screen_w + half_w - buffer)[too_left]
+        x[too_right] = (buffer - half_w)[too_right]
+
+        too_high = y < - half_h
+        too_low = y > self._screen_h + half_h
+        y[too_high] = (self._screen_h + half_h)[too_high]
+        y[too_low] = (- half_h)[too_low]
+
+    def __len__(self):
+
+        return len(self._sprites)
@@ -0,0 +1,356 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 22:10:44 2026
+
+@author: bettmensch
+"""
+
+'''This file contains the meta data loading classes used in the game STAR WARS DOGFIGHTER.
+It contains the MetaDataLoader class, which reads the game's four YAML meta data files
+from the meta directory. Parsing YAML in pure Python is slow, so the loader only does it
+when one of the files has changed: it then parses the files with libyaml's C parser
+(where available), validates them against the schemas below, normalizes the 2-dim
+coordinates (ship centers, gun and engine offsets) into float numpy arrays and pickles
+the result into a cache file. On all other launches, the cache file is unpickled instead.
+
+Cache entries are keyed by the YAML files' modification times and sizes, with the files'
+SHA-1 hashes as a fallback, so that touching a file without changing it (e.g. checking it
+out again) does not trigger a rebuild.
+
+The files are parsed with a safe loader that additionally understands the !!python/tuple
+tags written by meta_yaml_editor.py, so they no longer need the full, unsafe loader. The
+yaml module is only imported when the cache needs rebuilding, keeping it out of the boot.'''
+
+import os
+import pickle
+import hashlib
+
+import numpy as np
+
+# increase whenever schemas or normalization change, to invalidate existing caches
+CACHE_VERSION = 3
+
+# yaml loader class; created on first use, see _get_yaml_loader
+_MetaDataYamlLoader = None
+
+def _get_yaml_loader():
+    '''Util function that imports yaml and returns the safe YAML loader class (libyaml
+    based if available) that also constructs !!python/tuple sequences, as tuples.'''
+
+    global _MetaDataYamlLoader
+
+    if _MetaDataYamlLoader is None:
+        import yaml
+
+        class MetaDataYamlLoader(getattr(yaml, 'CSafeLoader', yaml.SafeLoader)):
+
+            def construct_python_tuple(self,
+                                       node):
+
+                return tuple(self.construct_sequence(node))
+
+        MetaDataYamlLoader.add_constructor('tag:yaml.org,2002:python/tuple',
+                                           MetaDataYamlLoader.construct_python_tuple)
+
+        _MetaDataYamlLoader = MetaDataYamlLoader
+
+    return _MetaDataYamlLoader
+
+class Optional(object):
+    '''Marks a key of a dictionary schema as optional.'''
+
+    def __init__(self,
+                 key):
+
+        self.key = key
+
+# schema building blocks. A schema is a type or tuple of types (value must be an instance),
+# a one element list (value must be a list or tuple of values matching the element schema),
+# a dictionary (value must be a dictionary with the schema's keys, each matching its schema;
+# keys wrapped in Optional may be missing, and the key None matches all other keys)
+NUMBER = (int, float)
+POINT = [NUMBER]
+IMAGE_PATHS = [str]
+ATLAS_ENTRIES = [str]
+
+SHIP_SPECS_SCHEMA = {'ship':{'empire':str,
+                             'rebel':str},
+                     'laser':{'empire':str,
+                              'rebel':str},
+                     'ship_init_kwargs':{'center':[NUMBER],
+                                         None:NUMBER}}
+
+SQUADRON_SPECS_SCHEMA = {'ship':{'empire':str,
+                                 'rebel':str},
+                         'laser':{'empire':str,
+                                  'rebel':str},
+                         'ship_init_kwargs':{'center':[POINT],
+                                             None:[NUMBER]}}
+
+META_DATA_SCHEMAS = {'sprite_skins_meta_data':{None:{'atlas_entries':ATLAS_ENTRIES,
+                                                     Optional('gun_offsets'):[POINT],
+                                                     Optional('engine_offsets'):[POINT],
+                                                     Optional('fire_modes'):list}},
+                     'animations_meta_data':{None:{Optional('atlas_entries'):ATLAS_ENTRIES,
+                                                   Optional('sound'):str,
+                                                   Optional('spi'):NUMBER,
+                                                   Optional('red'):{'atlas_entries':ATLAS_ENTRIES},
+                                                   Optional('green'):{'atlas_entries':ATLAS_ENTRIES},
+                                                   Optional('yellow'):{'atlas_entries':ATLAS_ENTRIES}}},
+                     'game_level_meta_data':[{'music':{'sound':str,
+                                                       'volume':NUMBER},
+                                              'player':SHIP_SPECS_SCHEMA,
+                                              Optional('ally'):SQUADRON_SPECS_SCHEMA,
+                                              'hostile':SQUADRON_SPECS_SCHEMA,
+                                              Optional('target_reevaluation_seconds'):NUMBER}],
+                     'game_meta_data':{'empire':{'image_paths':IMAGE_PATHS},
+                                       'rebel':{'image_paths':IMAGE_PATHS},
+                                       Optional('quality'):dict,
+                                       Optional('sound_mixer'):dict}}
+
+class MetaDataLoader(object):
+    '''Loads the game's meta data files, from the compiled cache if it is up to date.
+    After each load, the 'rebuilt' attribute tells whether the YAML files had to be
+    parsed.'''
+
+    def __init__(self,
+                 meta_dir = './meta',
+                 cache_path = None):
+        '''Arguments:
+
+            meta_dir: path to the directory holding the YAML meta data files.
+            cache_path: path of the cache file. Defaults to meta_data.pickle in the cache
+                    subdirectory of meta_dir. If the cache can not be written (e.g. on a
+                    read-only installation), the YAML files are parsed on every load.'''
+
+        self._meta_dir = meta_dir
+
+        if cache_path is None:
+            cache_path = os.path.join(meta_dir, 'cache', 'meta_data.pickle')
+
+        self._cache_path = cache_path
+
+        self.rebuilt = False
+
+    def load(self):
+        '''Returns a dictionary mapping the meta data file names (without extension, i.e.
+        the keys of META_DATA_SCHEMAS) to their validated and normalized contents.'''
+
+        sources = self._get_sources()
+        cache = self._read_cache()
+
+        if cache is not None and self._is_cache_valid(cache, sources):
+            self.rebuilt = False
+
+            return cache['meta_data']
+
+        # parse, validate and normalize all files, then cache the result
+        import yaml
+
+        yaml_loader = _get_yaml_loader()
+        meta_data = {}
+
+        for name in META_DATA_SCHEMAS:
+            with open(self._get_path(name), 'rb') as meta_data_file:
+                raw_meta_data = yaml.load(meta_data_file, Loader = yaml_loader)
+
+            validate(raw_meta_data,
+                     META_DATA_SCHEMAS[name],
+                     name)
+
+            meta_data[name] = normalize(name,
+                                        raw_meta_data)
+
+        for name in sources:
+            sources[name]['hash'] = self._get_hash(name)
+
+        self._write_cache({'version':CACHE_VERSION,
+                           'sources':sources,
+                           'meta_data':meta_data})
+
+        self.rebuilt = True
+
+        return meta_data
+
+    def _get_path(self,
+                  name):
+        '''Util function that returns the path of the named meta data file.'''
+
+        return os.path.join(self._meta_dir, name + '.yaml')
+
+    def _get_sources(self):
+        '''Util function that returns a dictionary mapping meta data file names to
+        dictionaries holding the files' modification times and sizes.'''
+
+        sources = {}
+
+        for name in META_DATA_SCHEMAS:
+            file_stat = os.stat(self._get_path(name))
+            sources[name] = {'mtime':file_stat.st_mtime,
+                             'size':file_stat.st_size}
+
+        return sources
+
+    def _get_hash(self,
+                  name):
+        '''Util function that returns the SHA-1 hex digest of the named meta data file.'''
+
+        with open(self._get_path(name), 'rb') as meta_data_file:
+            return hashlib.sha1(meta_data_file.read()).hexdigest()
+
+    def _is_cache_valid(self,
+                        cache,
+                        sources):
+        '''Util function that checks the cache against the current meta data files. Files
+        with a new modification time but unchanged contents are accepted, and their new
+        modification times are written back to the cache.'''
+
+        if cache.get('version') != CACHE_VERSION or set(cache.get('sources', {})) != set(sources):
+            return False
+
+        touched = False
+
+        for name, source in sources.items():
+            cached_source = cache['sources'][name]
+
+            if cached_source['mtime'] == source['mtime'] and cached_source['size'] == source['size']:
+                continue
+
+            if cached_source['size'] != source['size'] or cached_source['hash'] != self._get_hash(name):
+                return False
+
+            cached_source['mtime'] = source['mtime']
+            touched = True
+
+        if touched:
+            self._write_cache(cache)
+
+        return True
+
+    def _read_cache(self):
+        '''Util function that returns the unpickled cache, or None if there is no
+        readable cache file.'''
+
+        try:
+            with open(self._cache_path, 'rb') as cache_file:
+                return pickle.load(cache_file)
+        except (OSError, EOFError, pickle.UnpicklingError, AttributeError, ImportError):
+            return None
+
+    def _write_cache(self,
+                     cache):
+        '''Util function that pickles the cache to the cache file. Failing to write the
+        cache only costs the next launch a rebuild.'''
+
+        try:
+            cache_dir = os.path.dirname(self._cache_path)
+
+            if cache_dir and not os.path.isdir(cache_dir):
+                os.makedirs(cache_dir)
+
+            # write to a temporary file first, so that other processes never read a partial cache
+            temp_path = self._cache_path + '.tmp'
+
+            with open(temp_path, 'wb') as cache_file:
+                pickle.dump(cache, cache_file, protocol = pickle.HIGHEST_PROTOCOL)
+
+            os.replace(temp_path, self._cache_path)
+        except OSError:
+            pass
+
+def validate(value,
+             schema,
+             path):
+    '''Checks value against the schema (see META_DATA_SCHEMAS) and raises a ValueError
+    naming the offending entry's path if it does not match.'''
+
+    if isinstance(schema, dict):
+        if not isinstance(value, dict):
+            raise ValueError(path + ": expected a mapping, got " + type(value).__name__)
+
+        # validate the schema's named keys first, then all other keys against the wildcard
+        named_keys = set()
+
+        for key, key_schema in schema.items():
+            if key is None:
+                continue
+
+            optional = isinstance(key, Optional)
+
+            if optional:
+                key = key.key
+
+            named_keys.add(key)
+
+            if key not in value:
+                if not optional:
+                    raise ValueError(path + ": missing key '" + str(key) + "'")
+
+                continue
+
+            validate(value[key], key_schema, path + "." + str(key))
+
+        for key in value:
+            if key in named_keys:
+                continue
+
+            if None not in schema:
+                raise ValueError(path + ": unexpected key '" + str(key) + "'")
+
+            validate(value[key], schema[None], path + "." + str(key))
+
+    elif isinstance(schema, list):
+        if not isinstance(value, (list, tuple)):
+            raise ValueError(path + ": expected a sequence, got " + type(value).__name__)
+
+        for i, item in enumerate(value):
+            validate(item, schema[0], path + "[" + str(i) + "]")
+
+    else:
+        schema_types = schema if isinstance(schema, tuple) else (schema,)
+
+        # bools pass as ints, but are never valid numbers in the meta data
+        if not isinstance(value, schema_types) or (isinstance(value, bool) and bool not in schema_types):
+            raise ValueError(path + ": expected " + _get_schema_name(schema) + ", got " + repr(value))
+
+def _get_schema_name(schema):
+    '''Util function that returns a readable name of a type or tuple of types schema.'''
+
+    if isinstance(schema, tuple):
+        return " or ".join([schema_type.__name__ for schema_type in schema])
+
+    return schema.__name__
+
+def _get_points(points):
+    '''Util function that returns the list of 2-dim points as a float numpy array of
+    shape (n, 2).'''
+
+    return np.array(points, dtype = 'float').reshape((-1,2))
+
+def normalize(name,
+              meta_data):
+    '''Returns the validated meta data of the named file with all 2-dim coordinates
+    turned into float numpy arrays: ship centers in the level meta data (shape (2,) for
+    the player, (n, 2) for squadrons) and the skins' gun and engine offsets (shape
+    (n, 2)). All other values are left as they are.'''
+
+    if name == 'sprite_skins_meta_data':
+        for skin in meta_data.values():
+            for offsets_key in ('gun_offsets','engine_offsets'):
+                if offsets_key in skin:
+                    skin[offsets_key] = _get_points(skin[offsets_key])
+
+    elif name == 'game_level_meta_data':
+        for level_specs in meta_data:
+            for side in ('player','ally','hostile'):
+                if side not in level_specs:
+                    continue
+
+                ship_init_kwargs = level_specs[side]['ship_init_kwargs']
+
+                if side == 'player':
+                    ship_init_kwargs['center'] = np.array(ship_init_kwargs['center'], dtype = 'float')
+                else:
+                    ship_init_kwargs['center'] = _get_points(ship_init_kwargs['center'])
+
+    return meta_data
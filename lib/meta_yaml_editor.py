@@ -18,20 +18,21 @@ os.chdir('C:/Users/bettmensch/GitReps/star_wars_dogfighter/meta')
 
 # each entry in the animation meta data needs:
 #   - sound: path to sound file (optional)
-#   - image_paths: list of paths to all images used to create sequence
+#   - atlas_entries: list of atlas entries of all images used to create sequence, i.e.
+#     the images' paths relative to ./graphics, without the .bmp extension
 #   - spi: seconds per image
 
 animations_meta_data = {}
 
 # create meta data for red laser muzzle flash animation
-animations_meta_data['red'] = {'image_paths':['./graphics/red_muzzle_flash/red_muzzle_flash' + str(i+1) + '.bmp' for i in range(6)],
+animations_meta_data['red'] = {'atlas_entries':['red_muzzle_flash/red_muzzle_flash' + str(i+1) for i in range(6)],
                                 'sound':'./sounds/missile.wav',
                                 #'sound':'./sounds/slinky_laser.wav',
                                 #'sound':'./sounds/diy_missile_1.wav',
                                 'spi':0.02}
 
 # create meta data for green laser muzzle flash animation
-animations_meta_data['green'] = {'image_paths':['./graphics/green_muzzle_flash/green_muzzle_flash' + str(i+1) + '.bmp' for i in range(6)],
+animations_meta_data['green'] = {'atlas_entries':['green_muzzle_flash/green_muzzle_flash' + str(i+1) for i in range(6)],
                                 #'sound':'./sounds/missile.wav',
                                 'sound':'./sounds/slinky_laser.wav',
                                 #'sound':'./sounds/diy_missile_1.wav',
@@ -39,12 +40,12 @@ animations_meta_data['green'] = {'image_paths':['./graphics/green_muzzle_flash/g
                                 'spi':0.02}
 
 # create meta data for ship frames
-animations_meta_data['ship_frame'] = {'red':{'image_paths':['./graphics/misc/hostile_frame.bmp']},
-                    'green':{'image_paths':['./graphics/misc/ally_frame.bmp']},
-                    'yellow':{'image_paths':['./graphics/misc/player_frame.bmp']}}
+animations_meta_data['ship_frame'] = {'red':{'atlas_entries':['misc/hostile_frame']},
+                    'green':{'atlas_entries':['misc/ally_frame']},
+                    'yellow':{'atlas_entries':['misc/player_frame']}}
 
 # create meta data for explosion animation
-animations_meta_data['explosion'] = {'image_paths':['./graphics/explosion/explosion' + str(i+1) + '.bmp' for i in range(9)],
+animations_meta_data['explosion'] = {'atlas_entries':['explosion/explosion' + str(i+1) for i in range(9)],
                                     #'sound':'./sounds/explosion.wav',
                                     #'sound':'./sounds/blastwave_safe.wav',
                                     'sound':'./sounds/pt_blast.wav',
@@ -55,22 +56,22 @@ animations_meta_data['hit'] = {'sound':'./sounds/explosion.wav',
                                 'spi':0.04}
 
 # create meta data for engine flames
-animations_meta_data['engine'] = {'image_paths':['./graphics/engine_flame/engine_flame' + str(i+1) + '.bmp' for i in range(4)],
+animations_meta_data['engine'] = {'atlas_entries':['engine_flame/engine_flame' + str(i+1) for i in range(4)],
                                     'spi':0.3}
 
 # create meta data for engine flames
-animations_meta_data['engine_trail'] = {'image_paths':['./graphics/engine_trail/engine_trail' + str(i+1) + '.bmp' for i in range(4)],
+animations_meta_data['engine_trail'] = {'atlas_entries':['engine_trail/engine_trail' + str(i+1) for i in range(4)],
                                     'spi':0.15}
 
 # create meta data for rebel pilot images
-animations_meta_data['rebel_pilot'] = {'image_paths':['./graphics/cockpit/rebel_pilot1.bmp',
-                                                        './graphics/cockpit/skull.bmp']}
-                                                        #'./graphics/cockpit/skull2.bmp']}
+animations_meta_data['rebel_pilot'] = {'atlas_entries':['cockpit/rebel_pilot1',
+                                                        'cockpit/skull']}
+                                                        #'cockpit/skull2']}
 
 # create meta data for empire pilot images
-animations_meta_data['empire_pilot'] = {'image_paths':['./graphics/cockpit/empire_pilot1.bmp',
-                                                        './graphics/cockpit/skull.bmp']}
-                                                        #'./graphics/cockpit/skull2.bmp']}
+animations_meta_data['empire_pilot'] = {'atlas_entries':['cockpit/empire_pilot1',
+                                                        'cockpit/skull']}
+                                                        #'cockpit/skull2']}
 
 with open('animations_meta_data.yaml','w') as animations_meta_data_file:
     yaml.dump(animations_meta_data,animations_meta_data_file)
@@ -82,8 +83,8 @@ with open('animations_meta_data.yaml','w') as animations_meta_data_file:
 skins_meta_data = {}
 
 # create meta data for snowspeeder skin
-skins_meta_data['snowspeeder'] = {'image_paths':['./graphics/sprite_skins/snowspeeder1.bmp',
-                                                 './graphics/sprite_skins/snowspeeder2.bmp'],
+skins_meta_data['snowspeeder'] = {'atlas_entries':['sprite_skins/snowspeeder1',
+                                                 'sprite_skins/snowspeeder2'],
                'gun_offsets':[[22,-11],
                               [22,11]],
                'engine_offsets':[[-22,-5],
@@ -93,8 +94,8 @@ skins_meta_data['snowspeeder'] = {'image_paths':['./graphics/sprite_skins/snowsp
                                [1]]]}
 
 # create meta data for awing skin
-skins_meta_data['awing'] = {'image_paths':['./graphics/sprite_skins/awing1.bmp',
-                                           './graphics/sprite_skins/awing2.bmp'],
+skins_meta_data['awing'] = {'atlas_entries':['sprite_skins/awing1',
+                                           'sprite_skins/awing2'],
                'gun_offsets':[[9,-15],
                               [9,15]],
                'engine_offsets':[[-20,-7],
@@ -104,8 +105,8 @@ skins_meta_data['awing'] = {'image_paths':['./graphics/sprite_skins/awing1.bmp',
                                [1]]]}
 
 # create meta data for xwing skin
-skins_meta_data['xwing'] = {'image_paths':['./graphics/sprite_skins/xwing1.bmp',
-                                           './graphics/sprite_skins/xwing2.bmp'],
+skins_meta_data['xwing'] = {'atlas_entries':['sprite_skins/xwing1',
+                                           'sprite_skins/xwing2'],
                'gun_offsets':[[13,-18],
                               [13,18],
                               [14,-16],
@@ -121,8 +122,8 @@ skins_meta_data['xwing'] = {'image_paths':['./graphics/sprite_skins/xwing1.bmp',
                                [3]]]}
 
 # create meta data for tie fighter skin
-skins_meta_data['tiefighter'] = {'image_paths':['./graphics/sprite_skins/tiefighter1.bmp',
-                                               './graphics/sprite_skins/tiefighter2.bmp'],
+skins_meta_data['tiefighter'] = {'atlas_entries':['sprite_skins/tiefighter1',
+                                               'sprite_skins/tiefighter2'],
                'gun_offsets':[[9,-2],
                               [9,3]],
                'engine_offsets':[[-11,0]],
@@ -131,8 +132,8 @@ skins_meta_data['tiefighter'] = {'image_paths':['./graphics/sprite_skins/tiefigh
                                [1]]]}
 
 # create meta data for the tie interceptor skin                
-skins_meta_data['tieinterceptor'] = {'image_paths':['./graphics/sprite_skins/tieinterceptor1.bmp',
-                                                   './graphics/sprite_skins/tieinterceptor2.bmp'],
+skins_meta_data['tieinterceptor'] = {'atlas_entries':['sprite_skins/tieinterceptor1',
+                                                   'sprite_skins/tieinterceptor2'],
                'gun_offsets':[[20,-17],
                               [20,17],
                               [20,-13],
@@ -147,8 +148,8 @@ skins_meta_data['tieinterceptor'] = {'image_paths':['./graphics/sprite_skins/tie
                                [3]]]}
 
 # create meta data for vader's tie fighter
-skins_meta_data['tievader'] = {'image_paths':['./graphics/sprite_skins/tievader1.bmp',
-                                               './graphics/sprite_skins/tievader2.bmp'],
+skins_meta_data['tievader'] = {'atlas_entries':['sprite_skins/tievader1',
+                                               'sprite_skins/tievader2'],
                'gun_offsets':[[18,-9],
                               [18,9]],
                'engine_offsets':[[-18,-3],
@@ -158,8 +159,8 @@ skins_meta_data['tievader'] = {'image_paths':['./graphics/sprite_skins/tievader1
                                [1]]]}
 
 # create meta data for hornet skin
-skins_meta_data['hornet'] = {'image_paths':['./graphics/sprite_skins/hornet.bmp',
-                                           './graphics/sprite_skins/hornet.bmp'],
+skins_meta_data['hornet'] = {'atlas_entries':['sprite_skins/hornet',
+                                           'sprite_skins/hornet'],
                'gun_offsets':[[6,-2],
                               [6,3]],
                'engine_offsets':[[-20,0]],
@@ -168,8 +169,8 @@ skins_meta_data['hornet'] = {'image_paths':['./graphics/sprite_skins/hornet.bmp'
                                [1]]]}
 
 # create meta data for f35 skin
-skins_meta_data['f35'] = {'image_paths':['./graphics/sprite_skins/f35.bmp',
-                                         './graphics/sprite_skins/f35.bmp'],
+skins_meta_data['f35'] = {'atlas_entries':['sprite_skins/f35',
+                                         'sprite_skins/f35'],
                'gun_offsets':[[6,-2],
                               [6,3]],
                'engine_offsets':[[-17,0]],
@@ -178,10 +179,10 @@ skins_meta_data['f35'] = {'image_paths':['./graphics/sprite_skins/f35.bmp',
                                [1]]]}
 
 # create meta data for red laser beam skin
-skins_meta_data['red'] = {'image_paths':['./graphics/sprite_skins/redlaser.bmp']}
+skins_meta_data['red'] = {'atlas_entries':['sprite_skins/redlaser']}
 
 # create meta data for green laser beam skin
-skins_meta_data['green'] = {'image_paths':['./graphics/sprite_skins/greenlaser.bmp']}
+skins_meta_data['green'] = {'atlas_entries':['sprite_skins/greenlaser']}
 
 with open('sprite_skins_meta_data.yaml','w') as skins_meta_data_file:
     yaml.dump(skins_meta_data,skins_meta_data_file)
@@ -561,6 +562,42 @@ game_meta_data['empire'] = {'image_paths': ['./graphics/misc/empire_logo' + str(
 # load both versions of the alliance logo
 game_meta_data['rebel'] = {'image_paths': ['./graphics/misc/alliance_logo' + str(i+1) + '.bmp' for i in range(2)]}
 
+# quality tiers, best first, stepped through by the game's quality controller when rendered
+# frames take too long; tiers only need to specify the settings that differ from the first
+game_meta_data['quality'] = {'enabled':True,
+                             'window_frames':30,
+                             'downgrade_load':0.9,
+                             'upgrade_load':0.6,
+                             'upgrade_hold_frames':120,
+                             'tiers':[{'name':'high',
+                                       'smooth_rotation':True,
+                                       'angle_resolution':1,
+                                       'engine_trail_interval':1,
+                                       'muzzle_flashes':True,
+                                       'hud_refresh_interval':1},
+                                      {'name':'medium',
+                                       'smooth_rotation':False},
+                                      {'name':'low',
+                                       'smooth_rotation':False,
+                                       'angle_resolution':3,
+                                       'engine_trail_interval':2},
+                                      {'name':'lowest',
+                                       'smooth_rotation':False,
+                                       'angle_resolution':6,
+                                       'engine_trail_interval':3,
+                                       'muzzle_flashes':False,
+                                       'hud_refresh_interval':3}]}
+
+# sound mixer: sound effects are played on a fixed budget of voices, most important
+# categories first; requests for the same sound within a frame are merged
+game_meta_data['sound_mixer'] = {'enabled':True,
+                                 'n_voices':16,
+                                 'max_plays_per_frame':16,
+                                 'priorities':{'explosion':3,
+                                               'player laser':2,
+                                               'hit':1,
+                                               'laser':0}}
+
 with open('game_meta_data.yaml','w') as game_data_file:
     yaml.dump(game_meta_data,game_data_file)
     
\ No newline at end of file
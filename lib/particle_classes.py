@@ -0,0 +1,241 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 16:47:13 2026
+
+@author: bettmensch
+"""
+
+'''This file contains the particle classes used in the game STAR WARS DOGFIGHTER.
+It contains the ParticleEmitter class, which replaces the stationary, short lived
+BasicAnimation sprites (engine trails, hit sparks) with particles: each particle is one
+row in a handful of numpy arrays holding its position, age, angle bucket and animation
+sequence. All particles are aged and retired in bulk, and drawn from pre-rotated frames
+of the shared rotation cache with a single Surface.blits call.
+
+The emitter mimics the pygame Group interface used by the game loop (update, draw) and
+exposes get_draw_items for the DirtyRectRenderer.'''
+
+from basic_sprite_classes import BasicSprite
+
+import pygame as pg
+import numpy as np
+
+class ParticleEmitter(object):
+    '''Holds and animates stationary particles. A particle plays an image sequence
+    once, showing each image for the same number of frames, and then disappears, just
+    like a non looping BasicAnimation with zero speed.'''
+
+    def __init__(self,
+                 fps,
+                 capacity = 1024,
+                 transparent_color = (255,255,255)):
+        '''Arguments:
+
+            fps: frames per second ratio of surrounding pygame
+            capacity: initial number of particles the arrays can hold. The emitter grows
+                    as needed.
+            transparent_color: color key set on image sequences that are not colour keyed yet.'''
+
+        self._fps = fps
+        self._transparent_color = transparent_color
+
+        # registered image sequences and their timing specs, indexed by sequence id
+        self._sequence_ids = {}
+        self._sequences = []
+        self._frames_per_image = np.zeros(0)
+        self._lifetimes = np.zeros(0)
+
+        # rotated frames by (sequence id, image index, angle bucket), and the rotation
+        # cache settings they were rotated with
+        self._frames = {}
+        self._frames_resolution = BasicSprite.ROTATION_CACHE.angle_resolution
+        self._frames_smooth = BasicSprite.ROTATION_CACHE.smooth
+
+        # particle arrays
+        self._capacity = 0
+        self._n_particles = 0
+        self._allocate(capacity)
+
+    def _allocate(self,
+                  capacity):
+        '''Util function that (re)allocates the particle arrays with the specified
+        capacity, keeping the existing particles.'''
+
+        n = self._n_particles
+
+        new_arrays = {'_centers':np.zeros((capacity,2)),
+                      '_ages':np.zeros(capacity,dtype='int'),
+                      '_angles':np.zeros(capacity),
+                      '_angle_buckets':np.zeros(capacity,dtype='int'),
+                      '_sequence_indices':np.zeros(capacity,dtype='int'),
+                      '_image_indices':np.zeros(capacity,dtype='int')}
+
+        for array_name, new_array in new_arrays.items():
+            if n:
+                new_array[:n] = getattr(self, array_name)[:n]
+
+            setattr(self, array_name, new_array)
+
+        self._capacity = capacity
+
+    def _get_sequence_id(self,
+                         original_images,
+                         seconds_per_image,
+                         scale):
+        '''Util function that returns the id of the specified image sequence,
+        registering it on first use.'''
+
+        key = (tuple(original_images), seconds_per_image, scale)
+
+        if key not in self._sequence_ids:
+            # make sure images are transparent, as BasicSprite would
+            for original_image in original_images:
+                if original_image.get_colorkey() is None:
+                    original_image.set_colorkey(self._transparent_color)
+
+            frames_per_image = float(self._fps) * seconds_per_image
+
+            self._sequence_ids[key] = len(self._sequences)
+            self._sequences.append((list(original_images), scale))
+            self._frames_per_image = np.append(self._frames_per_image, frames_per_image)
+            self._lifetimes = np.append(self._lifetimes, len(original_images) * frames_per_image)
+
+        return self._sequence_ids[key]
+
+    def emit(self,
+             original_images,
+             seconds_per_image,
+             center,
+             angle = 0,
+             scale = 1):
+        '''Adds a particle playing the original_images sequence at the specified
+        position, orientation (in degrees) and scale.'''
+
+        sequence_id = self._get_sequence_id(original_images,
+                                            seconds_per_image,
+                                            scale)
+
+        # grow arrays if needed
+        if self._n_particles == self._capacity:
+            self._allocate(2 * self._capacity)
+
+        i = self._n_particles
+
+        self._centers[i] = center
+        self._ages[i] = 1 # same as a new animation's frame counter
+        self._angles[i] = angle
+        self._angle_buckets[i] = BasicSprite.ROTATION_CACHE.get_angle_bucket(angle)
+        self._sequence_indices[i] = sequence_id
+        self._image_indices[i] = 0
+
+        self._n_particles += 1
+
+    def update(self):
+        '''Ages all particles by one frame, advances their image sequences and
+        removes particles whose sequence has ended.'''
+
+        n = self._n_particles
+
+        if not n:
+            return
+
+        # age particles
+        ages = self._ages[:n]
+        ages += 1
+
+        # retire particles whose sequence has ended
+        sequence_indices = self._sequence_indices[:n]
+        is_alive = ages <= self._lifetimes[sequence_indices]
+
+        if not is_alive.all():
+            keep = np.flatnonzero(is_alive)
+            n = len(keep)
+
+            for array_name in ('_centers','_ages','_angles','_angle_buckets','_sequence_indices'):
+                array = getattr(self, array_name)
+                array[:n] = array[keep]
+
+            self._n_particles = n
+            ages = self._ages[:n]
+            sequence_indices = self._sequence_indices[:n]
+
+        # get current image index; image k is shown for ages in (k * fpi, (k+1) * fpi]
+        self._image_indices[:n] = np.ceil(ages / self._frames_per_image[sequence_indices]) - 1
+
+    def _get_frame(self,
+                   key):
+        '''Util function that returns the (surface, half width, half height) tuple
+        for the (sequence id, image index, angle bucket) key, rotating via the shared
+        rotation cache on first use.'''
+
+        sequence_id, image_index, angle_bucket = key
+        original_images, scale = self._sequences[sequence_id]
+
+        image = BasicSprite.ROTATION_CACHE.get_frame(original_images[image_index],
+                                                     angle_bucket * self._frames_resolution,
+                                                     scale).image
+
+        frame = (image, image.get_width() // 2, image.get_height() // 2)
+        self._frames[key] = frame
+
+        return frame
+
+    def _get_blit_sequence(self):
+        '''Util function that returns the list of (surface, topleft) tuples of all
+        particles in emission order.'''
+
+        n = self._n_particles
+
+        # rotated frames become stale if the rotation cache's resolution or rotation method changed
+        if BasicSprite.ROTATION_CACHE.smooth != self._frames_smooth:
+            self._frames = {}
+            self._frames_smooth = BasicSprite.ROTATION_CACHE.smooth
+
+        if BasicSprite.ROTATION_CACHE.angle_resolution != self._frames_resolution:
+            self._frames = {}
+            self._frames_resolution = BasicSprite.ROTATION_CACHE.angle_resolution
+            self._angle_buckets[:n] = [BasicSprite.ROTATION_CACHE.get_angle_bucket(angle) for angle in self._angles[:n]]
+
+        keys = zip(self._sequence_indices[:n].tolist(),
+                   self._image_indices[:n].tolist(),
+                   self._angle_buckets[:n].tolist())
+        # round half away from zero, like pygame's Rect does for float coordinates
+        centers = self._centers[:n]
+        centers = (np.sign(centers) * np.floor(np.abs(centers) + 0.5)).astype('int').tolist()
+
+        frames = self._frames
+        blit_sequence = []
+
+        for key, (x, y) in zip(keys, centers):
+            frame = frames.get(key) or self._get_frame(key)
+            blit_sequence.append((frame[0], (x - frame[1], y - frame[2])))
+
+        return blit_sequence
+
+    def get_draw_items(self):
+        '''Returns a list of (image, rect) tuples of all particles, as used by the
+        DirtyRectRenderer.'''
+
+        return [(image, pg.Rect(topleft, image.get_size())) for (image, topleft) in self._get_blit_sequence()]
+
+    def draw(self,
+             surface):
+        '''Draws all particles onto the surface, in a single call where supported.'''
+
+        blit_sequence = self._get_blit_sequence()
+
+        # Surface.blits is only available from pygame 1.9.4 onwards
+        if hasattr(surface, 'blits'):
+            surface.blits(blit_sequence, 0)
+        else:
+            for image, topleft in blit_sequence:
+                surface.blit(image, topleft)
+
+    def empty(self):
+        '''Removes all particles.'''
+
+        self._n_particles = 0
+
+    def __len__(self):
+
+        return self._n_particles
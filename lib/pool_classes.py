@@ -0,0 +1,136 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 16:02:40 2026
+
+@author: bettmensch
+"""
+
+'''This file contains the pooling classes used in the game STAR WARS DOGFIGHTER.
+It contains the SpritePool class, a free list of killed sprites of one type. Short
+lived sprites (engine trails, muzzle flashes, laser beams, hit explosions) are handed
+back to their pool when killed and reinitialized in place the next time a sprite of
+that type is needed, instead of allocating and garbage collecting thousands of sprite
+objects per second.'''
+
+from collections import OrderedDict
+
+class SpritePool(object):
+    '''Free list pool for sprites of the class sprite_class. Sprites are obtained with
+    acquire, which takes the same arguments as the sprite class' initializer, and are
+    released back to the pool automatically when killed (see BasicSprite.kill).
+
+    Live sprites are tracked in creation order. If a cap on the number of live sprites
+    is set and reached, the oldest live sprite is killed and recycled first.'''
+
+    def __init__(self,
+                 sprite_class,
+                 max_free = 512,
+                 max_live = None):
+        '''Arguments:
+
+            sprite_class: BasicSprite (based) class of the pooled sprites.
+            max_free: maximum number of killed sprites kept for reuse. Sprites released
+                    to a full pool are discarded.
+            max_live: maximum number of sprites from this pool that can be alive at the same
+                    time. Default is None, i.e. no cap.'''
+
+        self._sprite_class = sprite_class
+        self._max_free = max_free
+        self._max_live = max_live
+
+        # killed sprites ready for reuse, and live sprites in creation order
+        self._free = []
+        self._live = OrderedDict()
+
+        # statistics
+        self.hits = 0
+        self.misses = 0
+        self.recycled = 0
+        self.discarded = 0
+
+    def configure(self,
+                  max_free = None,
+                  max_live = None):
+        '''Util function that updates the pool's caps. Pass max_live = 0 to remove
+        the cap on live sprites.'''
+
+        if max_free is not None:
+            self._max_free = max_free
+            del self._free[max_free:]
+
+        if max_live is not None:
+            self._max_live = max_live or None
+
+    def acquire(self,
+                *args,
+                **kwargs):
+        '''Returns a live sprite initialized with the passed arguments, reusing a
+        killed sprite from the free list if one is available.'''
+
+        # enforce cap on live sprites by recycling the oldest ones
+        while self._max_live is not None and len(self._live) >= self._max_live:
+            oldest_sprite = next(iter(self._live))
+            oldest_sprite.kill()
+            self.recycled += 1
+
+            # sprites that do not release themselves on kill are dropped from the pool here
+            self._live.pop(oldest_sprite, None)
+
+        if self._free:
+            # reinitialize a killed sprite in place
+            self.hits += 1
+            sprite = self._free.pop()
+            sprite.__init__(*args, **kwargs)
+        else:
+            self.misses += 1
+            sprite = self._sprite_class(*args, **kwargs)
+
+        # attach pool so the sprite finds its way back when killed
+        sprite._pool = self
+        self._live[sprite] = True
+
+        return sprite
+
+    def release(self,
+                sprite):
+        '''Returns a killed sprite to the free list. Releasing a sprite that is not
+        live (e.g. when it is killed twice in the same frame) does nothing.'''
+
+        if self._live.pop(sprite, None) is None:
+            return
+
+        if len(self._free) < self._max_free:
+            self._free.append(sprite)
+        else:
+            self.discarded += 1
+
+    def release_all(self):
+        '''Kills all live sprites of the pool, returning them to the free list. Used
+        when a level ends and its sprite groups are discarded.'''
+
+        for sprite in list(self._live.keys()):
+            sprite.kill()
+
+            # sprites that do not release themselves on kill are dropped from the pool here
+            self._live.pop(sprite, None)
+
+    def get_hit_rate(self):
+        '''Returns the share of acquired sprites that were reused from the free list.'''
+
+        n_acquired = self.hits + self.misses
+
+        if not n_acquired:
+            return 0
+
+        return self.hits / n_acquired
+
+    def get_stats(self):
+        '''Returns a dictionary of the pool's counters and current sizes.'''
+
+        return {'live':len(self._live),
+                'free':len(self._free),
+                'hits':self.hits,
+                'misses':self.misses,
+                'hit_rate':self.get_hit_rate(),
+                'recycled':self.recycled,
+                'discarded':self.discarded}
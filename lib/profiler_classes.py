@@ -0,0 +1,224 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 19:20:44 2026
+
+@author: bettmensch
+"""
+
+'''This file contains the profiling classes used in the game STAR WARS DOGFIGHTER.
+It contains the FrameProfiler class, which records how long each phase of the main game
+loop (event handling, updating and drawing each sprite group, collisions, flipping the
+display, idling in the clock) takes over a rolling window of frames, and the
+ProfilerOverlay sprite, which shows these timings together with live sprite counts
+in the cockpit bar.'''
+
+from collections import deque
+from pygame.sprite import Sprite
+from cache_classes import TEXT_CACHE
+
+import time
+
+import pygame as pg
+
+class FrameProfiler(object):
+    '''Rolling per-phase frame timer. Wrap each phase of a frame in start(phase)
+    and stop(phase) calls (a phase can be timed several times per frame, e.g. once
+    per simulation step; its times are summed) and call end_frame once per frame.
+    While disabled, all calls return immediately.'''
+
+    def __init__(self,
+                 window = 60):
+        '''Arguments:
+
+            window: number of most recent frames the rolling statistics are taken over.'''
+
+        self._window = window
+        self.enabled = False
+
+        self.reset()
+
+    def reset(self):
+        '''Discards all recorded timings.'''
+
+        # phase names in order of first appearance, rolling history and current frame
+        self._phases = []
+        self._history = {}
+        self._current = {}
+        self._starts = {}
+
+        # live sprite counts as of the last frame
+        self.counts = {}
+
+        self._t_last_frame = None
+
+    def toggle(self):
+        '''Switches the profiler on or off. Timings start from scratch when switched on.'''
+
+        self.enabled = not self.enabled
+
+        if self.enabled:
+            self.reset()
+
+        return self.enabled
+
+    def start(self,
+              phase):
+        '''Starts timing the named phase.'''
+
+        if not self.enabled:
+            return
+
+        self._starts[phase] = time.perf_counter()
+
+    def stop(self,
+             phase):
+        '''Stops timing the named phase and adds the elapsed time to the current frame.'''
+
+        # phases started before the profiler was switched on are not recorded
+        t_start = self._starts.pop(phase, None)
+
+        if not self.enabled or t_start is None:
+            return
+
+        elapsed = time.perf_counter() - t_start
+
+        if phase not in self._history:
+            self._phases.append(phase)
+            self._history[phase] = deque(maxlen=self._window)
+
+        self._current[phase] = self._current.get(phase, 0) + elapsed
+
+    def end_frame(self,
+                  counts = None):
+        '''Closes the current frame: pushes its phase timings into the rolling history
+        and records the whole frame's duration. counts is an optional dictionary of live
+        sprite counts to display.'''
+
+        if not self.enabled:
+            return
+
+        # time since the last frame ended, i.e. the whole frame including idle time
+        t_now = time.perf_counter()
+
+        if self._t_last_frame is not None:
+            self._current['frame'] = t_now - self._t_last_frame
+
+            if 'frame' not in self._history:
+                self._history['frame'] = deque(maxlen=self._window)
+
+        self._t_last_frame = t_now
+
+        # phases that did not occur in this frame took no time
+        for phase, history in self._history.items():
+            history.append(self._current.get(phase, 0))
+
+        self._current = {}
+
+        if counts is not None:
+            self.counts = counts
+
+    def get_stats(self):
+        '''Returns a list of (phase, mean milliseconds, max milliseconds) tuples over the
+        rolling window, with the whole frame first and the phases in order of appearance.'''
+
+        stats = []
+
+        for phase in ['frame'] + self._phases:
+            history = self._history.get(phase)
+
+            if not history:
+                continue
+
+            stats.append((phase,
+                          1000 * sum(history) / len(history),
+                          1000 * max(history)))
+
+        return stats
+
+class ProfilerOverlay(Sprite):
+    '''Sprite showing a FrameProfiler's rolling timings and sprite counts as a
+    compact table. The text is re-rendered every few frames only.'''
+
+    def __init__(self,
+                 profiler,
+                 groups,
+                 bottomleft = (10,690),
+                 width = 260,
+                 budget_ms = 50,
+                 refresh_frames = 10,
+                 font = None,
+                 font_size = 15,
+                 text_color = (0,255,0),
+                 alarm_color = (255,0,0),
+                 background_color = (0,0,0)):
+        '''Arguments:
+
+            profiler: FrameProfiler object whose statistics are shown.
+            groups: list of pygame Group objects (e.g. the cockpit group). The overlay will
+                    add itself to each of these when initialized.
+            bottomleft: position of the overlay's bottom left corner on the main screen.
+            width: width of the overlay in pixels.
+            budget_ms: frame time budget in milliseconds. Phases whose maximum exceeds it are
+                    shown in the alarm color.
+            refresh_frames: number of frames between two re-renders of the overlay.
+            font: path to the font file used. Default is pygame's default font.
+            font_size: font size of the table.'''
+
+        Sprite.__init__(self,*groups)
+
+        self._profiler = profiler
+        self._bottomleft = bottomleft
+        self._width = width
+        self._budget_ms = budget_ms
+        self._refresh_frames = refresh_frames
+        self._font = TEXT_CACHE.fonts.get_font(font, font_size)
+        self._text_color = text_color
+        self._alarm_color = alarm_color
+        self._background_color = background_color
+
+        self._frames_since_refresh = 0
+
+        self._render()
+
+    def _get_lines(self):
+        '''Util function that returns the list of (text, color) lines to display.'''
+
+        lines = [('{:<14}{:>7}{:>7}'.format('phase (ms)', 'mean', 'max'), self._text_color)]
+
+        for phase, mean_ms, max_ms in self._profiler.get_stats():
+            color = self._alarm_color if max_ms > self._budget_ms else self._text_color
+            lines.append(('{:<14}{:>7.1f}{:>7.1f}'.format(phase[:14], mean_ms, max_ms), color))
+
+        counts = ['{} {}'.format(name, count) for (name, count) in self._profiler.counts.items()]
+
+        # two counts per line
+        for i in range(0, len(counts), 2):
+            lines.append(('  '.join(counts[i:i+2]), self._text_color))
+
+        return lines
+
+    def _render(self):
+        '''Util function that renders the overlay's image and positions its rect.'''
+
+        lines = self._get_lines()
+        line_height = self._font.get_linesize()
+
+        self.image = pg.Surface((self._width, line_height * len(lines) + 6))
+        self.image.fill(self._background_color)
+
+        for i, (text, color) in enumerate(lines):
+            # numbers change every frame, so the text is not worth caching
+            self.image.blit(self._font.render(text, True, color, self._background_color),
+                            (4, 3 + i * line_height))
+
+        self.rect = self.image.get_rect()
+        self.rect.bottomleft = self._bottomleft
+
+    def update(self):
+        '''Re-renders the overlay every refresh_frames frames.'''
+
+        self._frames_since_refresh += 1
+
+        if self._frames_since_refresh >= self._refresh_frames:
+            self._frames_since_refresh = 0
+            self._render()
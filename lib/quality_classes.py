@@ -0,0 +1,170 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 21:48:13 2026
+
+@author: bettmensch
+"""
+
+'''This file contains the adaptive quality classes used in the game STAR WARS DOGFIGHTER.
+It contains the QualityController class, which keeps a rolling window of the measured
+frame times (the time spent on a frame before waiting for the next one) and steps through
+a list of quality tiers: one tier down when the window's average frame time eats up
+most of the frame budget, and one tier back up once there has been plenty of headroom
+for a while. Upgrades that get undone right away make the controller wait longer before
+trying again, so that it does not keep flipping between two tiers.
+
+Each tier is a dictionary of detail settings, see DEFAULT_QUALITY_TIERS. The game applies
+them to the rotation cache and the sprite classes; the controller only picks the tier.'''
+
+from collections import deque
+
+# default quality tiers, best first. Tiers loaded from the meta data only need to
+# specify the settings that differ from the first tier
+DEFAULT_QUALITY_TIERS = [{'name':'high', # tier name
+                          'smooth_rotation':True, # rotozoom (True) or rotate (False) sprite frames
+                          'angle_resolution':1, # width of the rotation cache's angle buckets in degrees
+                          'engine_trail_interval':1, # ships leave an engine trail every this many updates
+                          'muzzle_flashes':True, # show muzzle flashes when firing
+                          'hud_refresh_interval':1}, # HUD cards and panels refresh this many times less often
+                         {'name':'medium',
+                          'smooth_rotation':False},
+                         {'name':'low',
+                          'smooth_rotation':False,
+                          'angle_resolution':3,
+                          'engine_trail_interval':2},
+                         {'name':'lowest',
+                          'smooth_rotation':False,
+                          'angle_resolution':6,
+                          'engine_trail_interval':3,
+                          'muzzle_flashes':False,
+                          'hud_refresh_interval':3}]
+
+class QualityController(object):
+    '''Picks the quality tier from the measured frame times. Call record once per
+    rendered frame; it returns True whenever the tier has changed and the new tier
+    needs to be applied.'''
+
+    def __init__(self,
+                 budget_seconds,
+                 tiers = None,
+                 enabled = True,
+                 window_frames = 30,
+                 downgrade_load = 0.9,
+                 upgrade_load = 0.6,
+                 upgrade_hold_frames = 120,
+                 max_upgrade_hold_frames = 1920):
+        '''Arguments:
+
+            budget_seconds: time available per frame in seconds, i.e. 1 / rendering rate.
+            tiers: list of tier dictionaries, best first. Settings missing from a tier are
+                    taken from the first tier, and settings missing from the first tier from
+                    the first of the DEFAULT_QUALITY_TIERS. Defaults to DEFAULT_QUALITY_TIERS.
+            enabled: if not set, the controller stays at the first tier.
+            window_frames: number of frames whose average frame time is compared against
+                    the budget. The window is emptied on every tier change.
+            downgrade_load: step down a tier if the average frame time exceeds this share
+                    of the budget.
+            upgrade_load: step up a tier if the average frame time stays below this share
+                    of the budget...
+            upgrade_hold_frames: ...for at least this many frames since the last tier change.
+                    Doubled whenever an upgrade is undone within that many frames, up to
+                    max_upgrade_hold_frames, and reset on any other downgrade.'''
+
+        if not tiers:
+            tiers = DEFAULT_QUALITY_TIERS
+
+        # complete tiers: missing settings fall back on the best tier's
+        best_tier = dict(DEFAULT_QUALITY_TIERS[0])
+        best_tier.update(tiers[0])
+
+        self.tiers = []
+
+        for tier in tiers:
+            full_tier = dict(best_tier)
+            full_tier.update(tier)
+            self.tiers.append(full_tier)
+
+        # set controller specs
+        self._budget_seconds = budget_seconds
+        self._enabled = enabled
+        self._downgrade_seconds = downgrade_load * budget_seconds
+        self._upgrade_seconds = upgrade_load * budget_seconds
+        self._base_upgrade_hold_frames = upgrade_hold_frames
+        self._max_upgrade_hold_frames = max_upgrade_hold_frames
+
+        # initialize state
+        self._frame_seconds = deque(maxlen = window_frames)
+        self.tier_index = 0
+        self._upgrade_hold_frames = upgrade_hold_frames
+        self._frames_since_change = 0
+        self._last_change = None
+
+    @classmethod
+    def from_meta_data(cls,
+                       budget_seconds,
+                       quality_meta_data):
+        '''Creates a controller from the game meta data's quality section, a dictionary
+        holding the tiers under 'tiers' and any of the other initializer's keyword
+        arguments. Returns a controller with the default settings if quality_meta_data
+        is None.'''
+
+        return cls(budget_seconds,
+                   **(quality_meta_data or {}))
+
+    @property
+    def tier(self):
+        '''The current tier's settings dictionary.'''
+
+        return self.tiers[self.tier_index]
+
+    def start(self):
+        '''Empties the frame time window, e.g. at the start of a level, so that frames
+        from loading screens or pauses do not count. The current tier is kept.'''
+
+        self._frame_seconds.clear()
+
+    def record(self,
+               frame_seconds):
+        '''Adds the measured time of one frame in seconds and steps through the tiers if
+        needed. Returns True if the tier has changed, else False.'''
+
+        if not self._enabled:
+            return False
+
+        self._frame_seconds.append(frame_seconds)
+        self._frames_since_change += 1
+
+        # only decide on a full window
+        if len(self._frame_seconds) < self._frame_seconds.maxlen:
+            return False
+
+        average_seconds = sum(self._frame_seconds) / len(self._frame_seconds)
+
+        if average_seconds > self._downgrade_seconds and self.tier_index < len(self.tiers) - 1:
+            # an upgrade undone right away was premature; wait longer before the next one
+            if self._last_change == 'up' and self._frames_since_change <= self._upgrade_hold_frames:
+                self._upgrade_hold_frames = min(2 * self._upgrade_hold_frames,
+                                                self._max_upgrade_hold_frames)
+            else:
+                self._upgrade_hold_frames = self._base_upgrade_hold_frames
+
+            self._change_tier(1)
+
+            return True
+
+        if average_seconds < self._upgrade_seconds and self.tier_index > 0 and self._frames_since_change >= self._upgrade_hold_frames:
+            self._change_tier(-1)
+
+            return True
+
+        return False
+
+    def _change_tier(self,
+                     step):
+        '''Util function that moves step tiers down (positive) or up (negative) and
+        starts a new frame time window.'''
+
+        self.tier_index += step
+        self._last_change = 'down' if step > 0 else 'up'
+        self._frames_since_change = 0
+        self._frame_seconds.clear()
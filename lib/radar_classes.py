@@ -0,0 +1,150 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 19:58:02 2026
+
+@author: bettmensch
+"""
+
+'''This file contains the radar classes used in the game STAR WARS DOGFIGHTER.
+It contains the Radar class, which takes one reading per frame for all ships that have
+a current target: each ship's heading unit vector, its vector towards its target (the
+shortest one across the wrapped screen edges, as measured by the TargetIndex), the range
+to the target and the projection of the unit vector towards the target on the
+clockwise orthonormal of the heading (see AIShipSprite.use_radar). All readings are
+computed in a handful of vectorized operations, and the AI's piloting and gunning logic
+look them up instead of doing their own small numpy calculations twice per ship.'''
+
+import numpy as np
+
+class Radar(object):
+    '''Per frame radar pass over all ships. Call scan once per frame before the
+    ships are updated; readings stay valid until the next scan. A ship's reading is
+    only handed out while the ship still has the target it was scanned with.'''
+
+    def __init__(self):
+
+        self.clear()
+
+    def clear(self):
+        '''Discards all readings.'''
+
+        # ship -> (index into reading arrays, target at time of scan)
+        self._slots = {}
+
+        # reading arrays, one row per scanned ship
+        self.headings = np.zeros((0,2))
+        self.towards_target_vectors = np.zeros((0,2))
+        self.ranges = np.zeros(0)
+        self.projections = np.zeros(0)
+
+        # python float copies of the scalar readings for fast lookups
+        self._ranges = []
+        self._projections = []
+
+    def scan(self,
+             ships,
+             field_size = None):
+        '''Takes readings for all ships in the iterable ships (e.g. a pygame Group)
+        that currently have a target.
+
+            field_size: (width, height) of the wrapped playing field in pixels (see
+                    TargetIndex.field_size). If specified, vectors towards targets take
+                    the shortest way across the wrapped edges.'''
+
+        slots = {}
+        centers, angles, target_centers = [], [], []
+
+        # collect positional attributes of all ships with a target
+        for ship in ships:
+            target_group = ship._current_target
+
+            if not target_group:
+                continue
+
+            target = next(iter(target_group.spritedict))
+
+            slots[ship] = (len(centers), target)
+            centers.append(ship._center)
+            angles.append(ship._angle)
+            target_centers.append(target._center)
+
+        self._slots = slots
+
+        if not slots:
+            self.clear()
+            return
+
+        # get unit directional vectors; in pygame coordinates, the y-axis has negative orientation
+        angles_radian = np.radians(np.array(angles, dtype = 'float'))
+        headings = np.empty((len(angles),2))
+        headings[:,0] = np.cos(angles_radian)
+        headings[:,1] = -np.sin(angles_radian)
+
+        # get vectors towards targets and their lengths
+        towards_target_vectors = np.array(target_centers, dtype = 'float') - np.array(centers, dtype = 'float')
+
+        if field_size is not None:
+            field_size = np.array(field_size, dtype = 'float')
+            towards_target_vectors = (towards_target_vectors + field_size / 2) % field_size - field_size / 2
+
+        ranges = np.hypot(towards_target_vectors[:,0],
+                          towards_target_vectors[:,1])
+
+        # project unit vectors towards targets on the clockwise oriented orthonormals
+        # (heading_y, -heading_x) of the headings. A ship sitting right on its target
+        # gets a nan projection, just like the single ship calculation
+        with np.errstate(divide = 'ignore', invalid = 'ignore'):
+            projections = (headings[:,1] * towards_target_vectors[:,0] - headings[:,0] * towards_target_vectors[:,1]) / ranges
+
+        self.headings = headings
+        self.towards_target_vectors = towards_target_vectors
+        self.ranges = ranges
+        self.projections = projections
+
+        self._ranges = ranges.tolist()
+        self._projections = projections.tolist()
+
+    def _get_index(self,
+                   ship):
+        '''Util function that returns the row of the ship's reading, or None if the
+        ship was not scanned or has changed its target since.'''
+
+        slot = self._slots.get(ship)
+
+        if slot is None:
+            return None
+
+        index, target = slot
+
+        if target not in ship._current_target.spritedict:
+            return None
+
+        return index
+
+    def get_projection(self,
+                       ship):
+        '''Returns the ship's projection of the unit vector towards its target on the
+        clockwise orthonormal of its heading, or None if there is no valid reading.'''
+
+        index = self._get_index(ship)
+
+        if index is None:
+            return None
+
+        return self._projections[index]
+
+    def get_range(self,
+                  ship):
+        '''Returns the ship's distance to its target in pixels, or None if there is no
+        valid reading.'''
+
+        index = self._get_index(ship)
+
+        if index is None:
+            return None
+
+        return self._ranges[index]
+
+    def __len__(self):
+
+        return len(self._slots)
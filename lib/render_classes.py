@@ -0,0 +1,199 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 11:02:47 2026
+
+@author: bettmensch
+"""
+
+'''This file contains the rendering classes used in the game STAR WARS DOGFIGHTER.
+It contains the DirtyRectRenderer class, an alternative to wiping and flipping the
+whole main screen every frame: it only restores the background where sprites have
+moved or changed, and only pushes those regions to the display.'''
+
+import pygame as pg
+
+class DirtyRectRenderer(object):
+    '''Renders sprite groups to the main screen using dirty rectangles. Each frame,
+    the (image, rect) pairs of all drawn sprites are compared with those of the
+    previous frame; only the regions that changed are restored from the background,
+    redrawn and updated on the display.'''
+
+    def __init__(self,
+                 screen,
+                 background_image,
+                 overlay_image = None):
+        '''Arguments:
+
+            screen: the main screen the game is displayed on (pygame Surface).
+            background_image: pygame Surface of the same size as the screen. Used to
+                    restore dirty regions before redrawing sprites.
+            overlay_image: optional pygame Surface of the same size as the screen (e.g. the
+                    colour keyed cockpit frame). Drawn on top of the lower sprite layers and
+                    below the upper sprite layers.'''
+
+        # attach surfaces
+        self._screen = screen
+        self._background_image = background_image
+        self._overlay_image = overlay_image
+
+        # keys of the items drawn in the previous frame
+        self._previous_keys = set()
+
+        # regions of sprites that flagged themselves as dirty this frame
+        self._forced_dirty_rects = []
+
+        # first frame is always drawn completely
+        self._full_redraw = True
+
+    def invalidate(self):
+        '''Forces a full redraw on the next frame, e.g. after something was blitted
+        straight to the screen behind the renderer's back (pause messages etc.).'''
+
+        self._full_redraw = True
+
+    def _get_draw_items(self,
+                        layers):
+        '''Util function that returns a list of (image, rect) tuples for all sprites
+        in the given list of sprite groups (or other layers providing a get_draw_items
+        method), in drawing order. Sprites whose 'dirty' attribute is set (i.e. which
+        drew onto their existing image surface) are recorded as dirty regardless, and
+        their flag is reset.'''
+
+        draw_items = []
+
+        for layer in layers:
+            # layers that are not sprite groups (e.g. particle emitters) provide their own items
+            if hasattr(layer, 'get_draw_items'):
+                draw_items.extend(layer.get_draw_items())
+                continue
+
+            for sprite in layer.sprites():
+                draw_items.append((sprite.image, sprite.rect))
+
+                # sprites that changed their image in place flag themselves as dirty
+                if getattr(sprite, 'dirty', 0):
+                    self._forced_dirty_rects.append(sprite.rect)
+                    sprite.dirty = 0
+
+        return draw_items
+
+    def _merge_rects(self,
+                     rects):
+        '''Util function that merges overlapping rectangles into their union until
+        no two of the returned rectangles overlap. Reduces the number of blits and
+        display updates when many small sprites cluster together.'''
+
+        merged_rects = []
+
+        for rect in rects:
+            rect = pg.Rect(rect)
+            overlap_index = rect.collidelist(merged_rects)
+
+            while overlap_index != -1:
+                rect.union_ip(merged_rects.pop(overlap_index))
+                overlap_index = rect.collidelist(merged_rects)
+
+            merged_rects.append(rect)
+
+        return merged_rects
+
+    def _get_dirty_rects(self,
+                         current_keys,
+                         draw_items):
+        '''Util function that returns the list of screen regions that need to be
+        redrawn, together with a list of flags indicating which draw items intersect
+        those regions. The regions are grown until every redrawn item lies entirely
+        inside them, so that redrawing in layer order never paints over an item that
+        is not itself redrawn.'''
+
+        # regions of items that appeared or disappeared since the previous frame
+        dirty_rects = self._merge_rects([key[1:] for key in current_keys ^ self._previous_keys] + \
+                                        self._forced_dirty_rects)
+
+        is_redrawn = [False] * len(draw_items)
+
+        # grow dirty regions until stable
+        while dirty_rects:
+            grown_rects = []
+
+            for i, (image, rect) in enumerate(draw_items):
+                if not is_redrawn[i] and rect.collidelist(dirty_rects) != -1:
+                    is_redrawn[i] = True
+                    grown_rects.append(rect)
+
+            if not grown_rects:
+                break
+
+            dirty_rects = self._merge_rects(dirty_rects + grown_rects)
+
+        # only keep on-screen parts of the dirty regions
+        screen_rect = self._screen.get_rect()
+        dirty_rects = [dirty_rect.clip(screen_rect) for dirty_rect in dirty_rects]
+
+        return [dirty_rect for dirty_rect in dirty_rects if dirty_rect.size != (0,0)], is_redrawn
+
+    def render(self,
+               lower_layers,
+               upper_layers = ()):
+        '''Draws the passed sprite groups to the main screen and updates the display.
+        Arguments:
+            - lower_layers: list of pygame Group objects (or ParticleEmitter objects) drawn
+            below the overlay image.
+            - upper_layers: list of pygame Group objects drawn above the overlay image.'''
+
+        # get draw items for this frame
+        lower_items = self._get_draw_items(lower_layers)
+        upper_items = self._get_draw_items(upper_layers)
+        draw_items = lower_items + upper_items
+
+        current_keys = set([(image,) + tuple(rect) for (image, rect) in draw_items])
+
+        if self._full_redraw:
+            # paint over the entire old game state
+            self._screen.blit(self._background_image,(0,0))
+
+            for (image, rect) in lower_items:
+                self._screen.blit(image, rect)
+
+            if self._overlay_image is not None:
+                self._screen.blit(self._overlay_image,(0,0))
+
+            for (image, rect) in upper_items:
+                self._screen.blit(image, rect)
+
+            pg.display.flip()
+
+            self._full_redraw = False
+        else:
+            # get regions and items that need redrawing
+            dirty_rects, is_redrawn = self._get_dirty_rects(current_keys,
+                                                            draw_items)
+
+            # restore background in dirty regions
+            for dirty_rect in dirty_rects:
+                self._screen.blit(self._background_image, dirty_rect, dirty_rect)
+
+            # redraw lower items
+            n_lower_items = len(lower_items)
+
+            for (image, rect), redraw in zip(lower_items, is_redrawn[:n_lower_items]):
+                if redraw:
+                    self._screen.blit(image, rect)
+
+            # redraw overlay in dirty regions
+            if self._overlay_image is not None:
+                for dirty_rect in dirty_rects:
+                    self._screen.blit(self._overlay_image, dirty_rect, dirty_rect)
+
+            # redraw upper items
+            for (image, rect), redraw in zip(upper_items, is_redrawn[n_lower_items:]):
+                if redraw:
+                    self._screen.blit(image, rect)
+
+            # only push changed regions to display
+            if dirty_rects:
+                pg.display.update(dirty_rects)
+
+        # store keys for comparison on next frame
+        self._previous_keys = current_keys
+        self._forced_dirty_rects = []
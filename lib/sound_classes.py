@@ -0,0 +1,218 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 23:52:17 2026
+
+@author: bettmensch
+"""
+
+'''This file contains the sound classes used in the game STAR WARS DOGFIGHTER.
+It contains the SoundMixer class, which plays the game's sound effects on a fixed number
+of mixer channels (voices). Sprites and the game request sounds with play instead of
+calling the sounds' own play methods; the requests are collected and only played once
+per frame by end_frame:
+
+    - requests for the same sound within a frame are merged into one, keeping the
+        highest priority and volume, so a salvo of lasers plays its laser sound once
+    - requests are played in order of their category's priority and their volume, and
+        at most one voice budget's worth of them per frame
+    - if all voices are busy, the voice with the lowest priority, then the quietest,
+        then the oldest voice is stolen, unless it outranks the request; requests that
+        find no voice are dropped
+
+Mixing cost is thus bounded by the voice budget, however many lasers are flying. The
+mixer keeps counters of requested, merged, played, stolen and dropped sounds.'''
+
+import pygame as pg
+
+# default priorities of the sound categories; higher priorities are played first and
+# may steal voices from lower ones. Unknown categories get priority 0
+DEFAULT_SOUND_PRIORITIES = {'explosion':3,
+                            'player laser':2,
+                            'hit':1,
+                            'laser':0}
+
+class SoundMixer(object):
+    '''Plays sound effects on a fixed budget of mixer channels. Call play to request a
+    sound and end_frame once per frame to play the frame's requests.'''
+
+    def __init__(self,
+                 n_voices = 16,
+                 priorities = None,
+                 max_plays_per_frame = None,
+                 enabled = True):
+        '''Arguments:
+
+            n_voices: number of mixer channels reserved for sound effects.
+            priorities: dictionary mapping sound categories to priorities. Defaults to
+                    DEFAULT_SOUND_PRIORITIES.
+            max_plays_per_frame: maximum number of sounds started per frame; all other
+                    requests of the frame are dropped. Defaults to n_voices.
+            enabled: if not set, requests are ignored and nothing is played.'''
+
+        if priorities is None:
+            priorities = DEFAULT_SOUND_PRIORITIES
+
+        if max_plays_per_frame is None:
+            max_plays_per_frame = n_voices
+
+        # set mixer specs
+        self._n_voices = n_voices
+        self._priorities = dict(priorities)
+        self._max_plays_per_frame = max_plays_per_frame
+        self.enabled = enabled
+
+        # mixer channels; created on the first frame the pygame mixer is initialized in
+        self._channels = None
+
+        # channel -> (priority, volume, frame index) of the sound it was last started with
+        self._voices = {}
+
+        # this frame's requests: sound -> [priority, volume, request index]
+        self._requests = {}
+        self._frame_index = 0
+
+        # statistics
+        self.requested = 0
+        self.merged = 0
+        self.played = 0
+        self.stolen = 0
+        self.dropped = 0
+
+    @classmethod
+    def from_meta_data(cls,
+                       sound_meta_data):
+        '''Creates a mixer from the game meta data's sound mixer section, a dictionary
+        holding any of the initializer's keyword arguments. Returns a mixer with the
+        default settings if sound_meta_data is None.'''
+
+        return cls(**(sound_meta_data or {}))
+
+    def play(self,
+             sound,
+             category,
+             volume = 1):
+        '''Requests the pygame.mixer.Sound object sound to be played at the end of the
+        current frame, with the priority of the sound category category and the channel
+        volume volume (between 0 and 1).'''
+
+        if not self.enabled:
+            return
+
+        self.requested += 1
+
+        priority = self._priorities.get(category, 0)
+        request = self._requests.get(sound)
+
+        # merge with an earlier request for the same sound
+        if request is not None:
+            request[0] = max(request[0], priority)
+            request[1] = max(request[1], volume)
+            self.merged += 1
+
+            return
+
+        self._requests[sound] = [priority, volume, len(self._requests)]
+
+    def end_frame(self):
+        '''Plays the current frame's requests on the available voices, stealing or
+        dropping as needed, and starts a new frame.'''
+
+        requests, self._requests = self._requests, {}
+        self._frame_index += 1
+
+        if not requests:
+            return
+
+        # without an initialized pygame mixer (e.g. no sound card), nothing can be played
+        if self._channels is None:
+            if not pg.mixer.get_init():
+                return
+
+            if pg.mixer.get_num_channels() < self._n_voices:
+                pg.mixer.set_num_channels(self._n_voices)
+
+            self._channels = [pg.mixer.Channel(i) for i in range(self._n_voices)]
+
+        # most important and loudest requests first; ties in order of request
+        ordered_requests = sorted(requests.items(),
+                                  key = lambda item: (-item[1][0], -item[1][1], item[1][2]))
+
+        # voices free at the start of the frame; busy ones are candidates for stealing
+        free_channels = [channel for channel in self._channels if not channel.get_busy()]
+        busy_channels = [channel for channel in self._channels if channel not in free_channels]
+
+        for i, (sound, (priority, volume, _)) in enumerate(ordered_requests):
+            # stop once the frame's budget is used up
+            if i >= self._max_plays_per_frame:
+                self.dropped += len(ordered_requests) - i
+
+                break
+
+            if free_channels:
+                channel = free_channels.pop(0)
+            else:
+                channel = self._get_voice_to_steal(busy_channels,
+                                                   priority,
+                                                   volume)
+
+                if channel is None:
+                    self.dropped += 1
+
+                    continue
+
+                busy_channels.remove(channel)
+                channel.stop()
+                self.stolen += 1
+
+            channel.set_volume(volume)
+            channel.play(sound)
+
+            self._voices[channel] = (priority, volume, self._frame_index)
+            self.played += 1
+
+    def _get_voice_to_steal(self,
+                            busy_channels,
+                            priority,
+                            volume):
+        '''Util function that returns the busy channel to give to a request of the passed
+        priority and volume: the one with the lowest priority, then the quietest, then the
+        oldest sound, as long as it does not outrank the request. Returns None if there
+        is no such channel.'''
+
+        if not busy_channels:
+            return None
+
+        channel = min(busy_channels,
+                      key = lambda channel: self._voices.get(channel, (-1, 0, 0)))
+
+        if self._voices.get(channel, (-1, 0, 0))[:2] > (priority, volume):
+            return None
+
+        return channel
+
+    def stop(self):
+        '''Stops all voices and drops pending requests, e.g. when a level ends.'''
+
+        self._requests = {}
+
+        if self._channels is not None:
+            for channel in self._channels:
+                channel.stop()
+
+        self._voices = {}
+
+    def get_stats(self):
+        '''Returns a dictionary of the mixer's counters and current voice usage.'''
+
+        if self._channels is None:
+            busy_voices = 0
+        else:
+            busy_voices = len([channel for channel in self._channels if channel.get_busy()])
+
+        return {'voices':self._n_voices,
+                'busy':busy_voices,
+                'requested':self.requested,
+                'merged':self.merged,
+                'played':self.played,
+                'stolen':self.stolen,
+                'dropped':self.dropped}
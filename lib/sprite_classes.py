@@ -16,7 +16,11 @@ from pygame.sprite import Sprite
 from basic_sprite_classes import BasicSprite
 from animation_classes import BasicAnimation, TrackingAnimation
 from weapons_classes import LaserCannon
-from math import cos, sin, pi
+from cache_classes import TEXT_CACHE
+from radar_classes import Radar
+from targeting_classes import TargetIndex
+from sound_classes import SoundMixer
+from vector_math import get_direction, dot, get_length
 from pygame.sprite import Group
 from random import randint
 
@@ -30,6 +34,17 @@ class ShipSprite(BasicSprite):
     
     _muzzle_flash_lifetime_in_seconds = 0.1
     
+    # ships leave an engine trail every this many updates; raised by the game's
+    # quality controller to thin out trails when frames take too long
+    ENGINE_TRAIL_INTERVAL = 1
+    
+    # shared sound mixer playing the ships' laser and explosion sounds on a fixed
+    # voice budget; replaced by the game's mixer
+    SOUND_MIXER = SoundMixer()
+    
+    # sound category of the ship's laser sound, see sound_classes.DEFAULT_SOUND_PRIORITIES
+    LASER_SOUND_CATEGORY = 'player laser'
+    
     def __init__(self,
                  fps,
                  screen,
@@ -66,6 +81,7 @@ class ShipSprite(BasicSprite):
                  min_speed_pixel_per_second = 10,
                  is_transparent = True,
                  transparent_color = (255,255,255),
+                 engine_trail_emitter = None,
                  **trash_can):
     
         '''Arguments:
@@ -80,7 +96,7 @@ class ShipSprite(BasicSprite):
             laser_fire_modes: dictionary of meta data specifyinh the ship's possible fire modes.
             laser_group: pygame Group object. Any laser created by the ShipSprite's firing method
                     will be added to this group to help track laser fire collisions.
-            laser_sound: pygame.mixer.Sound object. Will be played by the ShipSprite's firing method.
+            laser_sound: pygame.mixer.Sound object. Will be played through the SOUND_MIXER by the ShipSprite's firing method.
             laser_original_images: The original_images sequence that will be passed to the MissileSprite
                     object created by the ShipSprite's firing method. A list of pygame surfaces.
             laser_range_in_seconds: effectively the laser weapon range of the ship sprite. When the 
@@ -113,6 +129,8 @@ class ShipSprite(BasicSprite):
                     Default is True
             transparent_color: tuple specifiying the color key considered as transparent if 'is_transparent'
                     is set to true. Default to (255,255,255), which corresponds to the color white.
+            engine_trail_emitter: optional ParticleEmitter object. If specified, engine trails are
+                    emitted as particles instead of being created as BasicAnimation sprites.
             **trash_can: collects all unknown key word arguments provided to the initializer at call-time.
                     Allows for dictionary style argument plumbing further upstream.'''
                     
@@ -190,6 +208,8 @@ class ShipSprite(BasicSprite):
         # vapour trails
         self._original_engine_trail_images = original_engine_trail_images
         self._engine_trail_seconds_per_image = engine_trail_seconds_per_image
+        self._engine_trail_emitter = engine_trail_emitter
+        self._updates_since_engine_trail = 0
         
         # set motion control attributes
         self._d_angle_degrees_per_frame = d_angle_degrees_per_second / self._fps
@@ -197,6 +217,10 @@ class ShipSprite(BasicSprite):
         self._max_speed_pixel_per_frame = max_speed_pixel_per_second / self._fps
         self._min_speed_pixel_per_frame = min_speed_pixel_per_second / self._fps
         
+        # if positional attributes live in a kinematics store, let the store enforce speed limits
+        self._set_speed_limits(self._min_speed_pixel_per_frame,
+                               self._max_speed_pixel_per_frame)
+        
         # set firing control attributes
         self._command_to_fire = False
         
@@ -256,7 +280,7 @@ class ShipSprite(BasicSprite):
         n_salves = len(self._original_laser_fire_modes[self._fire_mode_index])
         
         for next_cannon in self._get_next_cannons():
-            now = pg.time.get_ticks()
+            now = self.CLOCK.get_ticks()
             mil_seconds_per_shot = 1000 / next_cannon._rate_of_fire
             next_cannon._time_of_last_shot = now - (n_salves - 1) / n_salves * mil_seconds_per_shot
 
@@ -267,7 +291,8 @@ class ShipSprite(BasicSprite):
         
         # play laser sound if sound is on
         if self._sound:
-            self._laser_sound.play()
+            self.SOUND_MIXER.play(self._laser_sound,
+                                  self.LASER_SOUND_CATEGORY)
         
         # fire cannons
         [laser_cannon.fire() for laser_cannon in self._get_next_cannons()]
@@ -295,21 +320,42 @@ class ShipSprite(BasicSprite):
         group to the current_target group, if feasible. Dummy method at ShipSprite
         level, to be used for AIShipSprite class.'''
         
+    def _is_target_reevaluation_due(self):
+        '''Util function that returns True if the ship should look for a new
+        target even though it has one. Dummy method at ShipSprite level, to be used
+        for AIShipSprite class.'''
+        
+        return False
+        
     def create_engine_trail(self):
         
+        # only leave a trail every ENGINE_TRAIL_INTERVAL updates
+        self._updates_since_engine_trail += 1
+        
+        if self._updates_since_engine_trail < ShipSprite.ENGINE_TRAIL_INTERVAL:
+            return
+        
+        self._updates_since_engine_trail = 0
+        
         for engine_flame_animation in self._engine_animations:
             # get position and angle of engine trail via the dynamically updated position of corresponding engine flame animation
             engine_trail_center = engine_flame_animation._center
             engine_trail_angle = engine_flame_animation._angle
             
-            # create basic animation with those specs
-            BasicAnimation(self._fps,
-                           self._screen,
-                           self._original_engine_trail_images,
-                           self._engine_trail_seconds_per_image,
-                           [self._animation_group],
-                           center = engine_trail_center,
-                           angle = engine_trail_angle)
+            # emit trail particle if possible; otherwise create basic animation with those specs
+            if self._engine_trail_emitter is not None:
+                self._engine_trail_emitter.emit(self._original_engine_trail_images,
+                                                self._engine_trail_seconds_per_image,
+                                                engine_trail_center,
+                                                angle = engine_trail_angle)
+            else:
+                BasicAnimation.POOL.acquire(self._fps,
+                                            self._screen,
+                                            self._original_engine_trail_images,
+                                            self._engine_trail_seconds_per_image,
+                                            [self._animation_group],
+                                            center = engine_trail_center,
+                                            angle = engine_trail_angle)
         
     def update(self):
         '''Base class update plus additional ShipSprite specific updates.'''
@@ -317,8 +363,8 @@ class ShipSprite(BasicSprite):
         # update image index
         self.update_image_index()
         
-        # if no target has been aquired, get it
-        if not self._current_target:
+        # if no target has been aquired or it is time to look for a better one, get it
+        if not self._current_target or self._is_target_reevaluation_due():
             self._acquire_target()
         
         # call base class update method
@@ -330,7 +376,7 @@ class ShipSprite(BasicSprite):
         self.set_gunner_commands()
         
         # if command to fire was given, check if cannons are ready; if so, fire
-        if self._command_to_fire and np.mean([cannon.is_ready() for cannon in self._get_next_cannons()]):
+        if self._command_to_fire and any([cannon.is_ready() for cannon in self._get_next_cannons()]):
             # fire the cannon(s)
             self.fire()
             
@@ -339,7 +385,8 @@ class ShipSprite(BasicSprite):
         
         # play sound of explosion if sound on
         if self._sound:
-            self._explosion_sound.play()
+            self.SOUND_MIXER.play(self._explosion_sound,
+                                  'explosion')
         
         # remove self from all groups
         BasicSprite.kill(self)
@@ -348,7 +395,7 @@ class ShipSprite(BasicSprite):
         self._alive = False
         
         # create explosion animation
-        BasicAnimation(self._fps,
+        BasicAnimation.POOL.acquire(self._fps,
                       self._screen,
                       self._original_explosion_images,
                       self._explosion_seconds_per_image,
@@ -359,7 +406,7 @@ class ShipSprite(BasicSprite):
         
     def was_hit(self):
         '''Called from game class when sprite is hit by hostile missiles/laser.'''
-        self._time_of_hit = pg.time.get_ticks()
+        self._time_of_hit = self.CLOCK.get_ticks()
         
     def update_image_index(self):
         '''Updates image index depending on wether sprite was recently hit by
@@ -370,7 +417,7 @@ class ShipSprite(BasicSprite):
             return
         
         # get time since last hit
-        time_since_last_hit = (pg.time.get_ticks() - self._time_of_hit) / 1000
+        time_since_last_hit = (self.CLOCK.get_ticks() - self._time_of_hit) / 1000
         
         # if time window has passed, set back to normal image and reset hit flag
         if time_since_last_hit > 0.5:
@@ -382,6 +429,20 @@ class ShipSprite(BasicSprite):
 class AIShipSprite(ShipSprite):
     '''Based on ShipSprite class. Represents an enemy ship during game.'''
     
+    # shared radar; scanned once per frame by the game before the ships are updated
+    RADAR = Radar()
+    
+    # shared target index; rebuilt once per frame by the game before the ships are updated
+    TARGET_INDEX = TargetIndex()
+    
+    # target acquisition: hostiles ahead within this range and cone are preferred,
+    # otherwise the least engaged of the nearest few hostiles is picked
+    TARGETING_RANGE = 400
+    TARGETING_CONE_COSINE = 0.5
+    TARGETING_CANDIDATES = 3
+    
+    LASER_SOUND_CATEGORY = 'laser'
+    
     def __init__(self,
                  fps,
                  screen,
@@ -419,6 +480,8 @@ class AIShipSprite(ShipSprite):
                  max_speed_pixel_per_second = 20,
                  is_transparent = True,
                  transparent_color = (255,255,255),
+                 engine_trail_emitter = None,
+                 target_reevaluation_seconds = 2,
                  **trash_can):
     
         '''Arguments: All as in base class's (ShipSprite) __init__ method, except
@@ -430,8 +493,15 @@ class AIShipSprite(ShipSprite):
                 view.
             gunning_cone_sine: Sine of half of the cone representing the enemy gunner's target sight.
                 If PlayerShipSprite is within this cone, gunner will attempt to fire cannon.
+            target_reevaluation_seconds: Seconds after which the pilot looks for a better target
+                than the current one. If None, targets are kept until they are destroyed.
             **trash_can: collects all unknown key word arguments provided to the initializer at call-time.
                     Allows for dictionary style argument plumbing further upstream.'''
+        
+        # attach target re-evaluation interval; needed by the target acquisition in the
+        # base class initializer, which records the time of acquisition
+        self._target_reevaluation_seconds = target_reevaluation_seconds
+        self._time_of_target_acquisition = None
                                 
         ShipSprite.__init__(self,
                             fps,
@@ -467,19 +537,63 @@ class AIShipSprite(ShipSprite):
                              d_speed_pixel_per_second = d_speed_pixel_per_second,
                              max_speed_pixel_per_second = max_speed_pixel_per_second,
                              is_transparent = is_transparent,
-                             transparent_color = transparent_color)
+                             transparent_color = transparent_color,
+                             engine_trail_emitter = engine_trail_emitter)
         
         # attach the AI cone sines
         self._piloting_cone_sine = piloting_cone_sine
         self._gunning_cone_sine = gunning_cone_sine
         
+    def _is_target_reevaluation_due(self):
+        '''See parent ShipSprite class doc for this method.'''
+        
+        if self._target_reevaluation_seconds is None or self._time_of_target_acquisition is None:
+            return False
+        
+        time_since_acquisition = (self.CLOCK.get_ticks() - self._time_of_target_acquisition) / 1000
+        
+        return time_since_acquisition >= self._target_reevaluation_seconds
+        
     def _acquire_target(self):
-        '''Util function to select and add to current_target group.'''
+        '''Util function to select and add to current_target group. Uses the shared
+        target index if it covers the hostile ships group, and selects a hostile
+        ship at random otherwise.'''
+        
+        # prefer hostiles ahead within range
+        candidates = self.TARGET_INDEX.get_within_cone(self,
+                                                       self._hostile_ships_group,
+                                                       self.TARGETING_CONE_COSINE,
+                                                       self.TARGETING_RANGE)
+        
+        # without an index, if there are hostile ships, randomly select one
+        if candidates is None:
+            if self._hostile_ships_group and not self._current_target:
+                target_index = randint(0,len(self._hostile_ships_group)-1)
+                self._current_target.add(self._hostile_ships_group.sprites()[target_index])
+                self._time_of_target_acquisition = self.CLOCK.get_ticks()
                 
-        # if there are hostile ships, randomly select one
-        if self._hostile_ships_group:
-            target_index = randint(0,len(self._hostile_ships_group)-1)
-            self._current_target.add(self._hostile_ships_group.sprites()[target_index])
+            return
+        
+        # otherwise, consider the nearest few hostiles wherever they are
+        if not candidates:
+            candidates = self.TARGET_INDEX.get_nearest(self,
+                                                       self._hostile_ships_group,
+                                                       k = self.TARGETING_CANDIDATES)
+        
+        # drop the current target so it does not count as engaged by this ship; it may well be picked again
+        for current_target in self._current_target.sprites():
+            self.TARGET_INDEX.disengage(current_target)
+            
+        self._current_target.empty()
+        
+        # go after the least engaged candidate
+        target = self.TARGET_INDEX.get_least_engaged(candidates)
+        
+        if target is not None:
+            self.TARGET_INDEX.engage(target)
+            self._current_target.add(target)
+            
+        self._time_of_target_acquisition = self.CLOCK.get_ticks()
         
     def use_radar(self):
         '''Util method used by piloting and gunning methods. Yields current target's 
@@ -487,33 +601,56 @@ class AIShipSprite(ShipSprite):
         enemy -> player connecting line on the vector orthogonal to the enemy's
         current direction of flight. This allows the enemy to see whether to turn
         left or right to get closer to the current target. Only called when 
-        a current target is selected.'''
+        a current target is selected. Uses this frame's reading of the shared radar
+        if there is one.'''
+        
+        # look up reading taken by the radar's scan of all ships
+        projection_on_ortnorm = self.RADAR.get_projection(self)
+        
+        if projection_on_ortnorm is not None:
+            return projection_on_ortnorm
         
         # get hostile ship sprite
         current_target = self._current_target.sprites()[0]
         
-        # get own directional unit vector
-        # convert angle to radian
-        angle_radian = self._angle * pi / 180
-        
-        # get unit directional vector
-        unit_direction = np.array([cos(angle_radian),
-                              -sin(angle_radian)])
+        # get own unit directional vector
+        unit_direction = get_direction(self._angle)
     
         # get clockwise oriented orthonormal to unit directional vector
-        clockwise_ortnorm_direction = np.array([unit_direction[1],
-                                                -unit_direction[0]])
+        clockwise_ortnorm_direction = (unit_direction[1],
+                                       -unit_direction[0])
+        
+        # get shortest vector pointing towards target position across the wrapped screen
+        # edges, and its length
+        towards_target_vector = self.TARGET_INDEX.get_offset(self,
+                                                             current_target)
+        distance_to_target = get_length(towards_target_vector)
         
-        # get clockwise rotated orthogonal to unit vector pointing towards player position
-        towards_target_vector = (current_target._center - self._center)
-        unit_towards_target_vector = towards_target_vector / np.linalg.norm(towards_target_vector)
+        # a ship sitting right on its target has no direction to turn to
+        if not distance_to_target:
+            return float('nan')
         
         # turn towards player, whichever way is more aligned with current direction of movement
-        projection_on_ortnorm = np.dot(clockwise_ortnorm_direction,
-                                       unit_towards_target_vector)
+        projection_on_ortnorm = dot(clockwise_ortnorm_direction,
+                                    towards_target_vector) / distance_to_target
         
         return projection_on_ortnorm
     
+    def get_range_to_target(self):
+        '''Returns the distance to the current target in pixels. Only called when
+        a current target is selected.'''
+        
+        # look up reading taken by the radar's scan of all ships
+        range_to_target = self.RADAR.get_range(self)
+        
+        if range_to_target is not None:
+            return range_to_target
+        
+        towards_target_vector = self.TARGET_INDEX.get_offset(self,
+                                                             self._current_target.sprites()[0])
+        
+        return get_length(towards_target_vector)
+    
     def set_pilot_commands(self):
         '''See parent FighterSprite class doc for this method.'''
         
@@ -523,7 +660,7 @@ class AIShipSprite(ShipSprite):
         
         # if ship was in last 0.5 seconds, it cant maneuver
         if self._time_of_hit != None:
-            time_since_last_hit = (pg.time.get_ticks() - self._time_of_hit) / 1000
+            time_since_last_hit = (self.CLOCK.get_ticks() - self._time_of_hit) / 1000
             if time_since_last_hit < 0.5:
                 self._d_angle = 0
                 return
@@ -552,7 +689,7 @@ class AIShipSprite(ShipSprite):
         
         # if ship was hit in last 0.5 seconds, it cant shoot
         if self._time_of_hit != None:
-            time_since_last_hit = (pg.time.get_ticks() - self._time_of_hit) / 1000
+            time_since_last_hit = (self.CLOCK.get_ticks() - self._time_of_hit) / 1000
             if time_since_last_hit < 0.5:
                 self._command_to_fire = False
                 return
@@ -567,7 +704,22 @@ class AIShipSprite(ShipSprite):
 class ShipBio(Sprite):
     
     '''Class used to display the ships' stats to the main game screen inside 
-    the appropriate cockpit frame.'''
+    the appropriate cockpit frame.
+    
+    The card is assembled from a static layer (background, coloured frame, ship id
+    and field captions), rendered once, and a small number of dynamic fields (pilot
+    image for the alive state, current target id, hit points and - in graphic mode -
+    the ship image). Each field is only re-rendered and re-blitted onto the card
+    when its own value changes.'''
+    
+    # cards check their ship's stats every this many updates; raised by the game's
+    # quality controller to refresh the HUD less often when frames take too long
+    REFRESH_INTERVAL = 1
+    
+    # top left positions of the dynamic fields on the card
+    _field_positions = {'alive':(10,10),
+                        'target':(120,50),
+                        'hp':(120,90)}
     
     def __init__(self,
                  pilot_images,
@@ -577,7 +729,8 @@ class ShipBio(Sprite):
                  mode='text',
                  font = 'freesansbold.ttf',
                  size = 15,
-                 center = np.zeros(2)):
+                 center = np.zeros(2),
+                 max_hit_points = None):
         
         # add to group(s)
         Sprite.__init__(self,
@@ -599,8 +752,8 @@ class ShipBio(Sprite):
         self.base_text_color = (0,200,200) # light blue
         self.base_display_color = (0,70,70) # dark blue
         
-        # attach font
-        self._font = pg.font.Font(font,size)
+        # attach font; shared with all other cards via the text cache's font registry
+        self._font = TEXT_CACHE.fonts.get_font(font,size)
         
         # attach original pilot image
         self._original_pilot_image = pilot_images
@@ -608,46 +761,52 @@ class ShipBio(Sprite):
         # attach reference ship
         self._source_ship = reference_ship
         
-        # attach max hp pf reference ship
-        self._source_ship_max_hp = reference_ship._hit_points
+        # attach max hp pf reference ship; defaults to its current hp, i.e. cards created at spawn time
+        if max_hit_points is None:
+            max_hit_points = reference_ship._hit_points
+            
+        self._source_ship_max_hp = max_hit_points
         
         # attach ship id of reference ship
         self._source_ship_id = reference_ship._ship_id
         
-        # initialize stats reference storage for comparison
-        self._previous_stats = self._get_current_stats()
+        # render the static layer of the "ID card" once
+        self._static_layer = self._get_static_layer()
         
-        # assemble the "ID card" for given ship using pilot image and ship
-        ship_bio_image = self._get_ship_bio_image()
+        # attach current id card to sprite; dynamic fields are drawn onto a copy of the static layer
+        self.image = self._static_layer.copy()
         
-        # attach current id card to sprite
-        self.image = ship_bio_image
+        # initialize field value and field area storage, then draw all fields
+        self._field_values = {}
+        self._field_rects = {}
+        self.dirty = 0
+        self._updates_since_refresh = 0
+        self._refresh()
         
         # position id card on main screen; this position will not change
         self.rect = self.image.get_rect()
         self.rect.center = center
         
     def _get_current_stats(self):
-        '''Util function that gets up to date values of stats to be displayed.'''
+        '''Util function that gets up to date values of the dynamic fields to be
+        displayed, as a dictionary mapping field name to value.'''
         
-        currently_alive = self._source_ship._alive # currently alive? (boolean)
-        current_hps = self._source_ship._hit_points # curent hps (integer)
         current_target_id_list = [ship._ship_id for ship in self._source_ship._current_target.sprites()] # list containing target's id string; may be empty
-        current_target_image = self._source_ship.image
         
         if not current_target_id_list:
             current_target_id = ""
         else:
             current_target_id = current_target_id_list[0]
+            
+        current_stats = {'alive':self._source_ship._alive, # currently alive? (boolean)
+                         'target':current_target_id, # current target's id (string)
+                         'hp':self._source_ship._hit_points} # current hps (integer)
         
-        return currently_alive, current_hps, current_target_id, current_target_image
-    
-    def _have_stats_changed(self):
-        '''Util function that checks previous ship stats against current ship stats
-        to check if image update is necessary. Used to reduce the times a new ship id card
-        is rendered.'''
+        # only graphic cards display the ship's (rotated) image
+        if self.display_mode == 'graphic':
+            current_stats['ship_image'] = self._source_ship.image
         
-        return self._previous_stats != self._get_current_stats()
+        return current_stats
     
     def _render_text(self,
                      text,
@@ -655,70 +814,104 @@ class ShipBio(Sprite):
         '''Util function that renders a text message to a pygame surface and
         returns the surface.'''
         
-        # text surface is transparent by default
-        text_surface = self._font.render(text,True,text_color)
+        # text surface is transparent by default; only rendered if not cached
+        text_surface = TEXT_CACHE.render_with_font(text,
+                                                   self._font,
+                                                   text_color)
         
         return text_surface
-        
-    def _get_ship_bio_image(self):
-        '''Util function that assembles the pygame surface visually representing
-        the current ship status on the cockpit frame.'''
-        
-        # get shortcuts to needed attributes
-        pilot_images = self._original_pilot_image
-        
-        # get the ship's stats
-        ship_is_alive, ship_hp, ships_target_id, ship_image = self._get_current_stats()
-        
-        ship_max_hp = self._source_ship_max_hp
-        ship_id = self._source_ship_id
+    
+    def _get_static_layer(self):
+        '''Util function that assembles the parts of the ship's card that never
+        change: background, coloured frame, ship id and field captions.'''
         
         # get blank id card canvas surface with a coloured frame depending on side attribute
         id_template = pg.Surface((280,120))
-        id_template.fill((0,70,70)) # dark blue on the inside
+        id_template.fill(self.base_display_color) # dark blue on the inside
         frame_thickness = 5
         frame_rect = pg.Rect(0,0,280, 120)# coloured frame positional rectangle
         pg.draw.rect(id_template, self.frame_color, frame_rect, frame_thickness)
         
-        # blit appropriate pilot image to id_template
-        if ship_is_alive:
-            id_template.blit(pilot_images[0],(10,10)) # first image in sequence shows alive pilot
-        elif not ship_is_alive:
-            id_template.blit(pilot_images[1],(10,10)) # second image in sequence shows dead pilot
+        # blit static captions
+        if self.display_mode == 'text':
+            for (top_left_y, text,text_color) in zip([10,35,75],
+                                                     [self._source_ship_id,"Current target", "Status report"],
+                                                     [self.frame_color,self.base_text_color,self.base_text_color]):
+                id_template.blit(self._render_text(text,
+                                                   text_color),
+                                 (120,top_left_y))
             
-        # get current hp color:
-        if 0.2 <= (ship_hp / ship_max_hp) < 0.5:
-            hp_color = (255,255,0) # yellow
-        elif ship_hp / ship_max_hp < 0.2:
-            hp_color = (255,0,0) # RED
-        else:
-            hp_color = (0,255,0) # green
+        return id_template
+    
+    def _get_field_surface(self,
+                           field,
+                           value):
+        '''Util function that renders the surface of the specified dynamic field
+        for the given value and returns it together with its top left position.'''
+        
+        if field == 'alive':
+            # first image in sequence shows alive pilot, second image shows dead pilot
+            if value:
+                field_surface = self._original_pilot_image[0]
+            else:
+                field_surface = self._original_pilot_image[1]
+        elif field == 'target':
+            field_surface = self._render_text(value,
+                                              self.opp_frame_color)
+        elif field == 'hp':
+            # get current hp color:
+            ship_max_hp = self._source_ship_max_hp
             
-        # blit stats
-        if self.display_mode == 'text':
-            for (top_left_y, text,text_color) in zip([10,35,50,75,90],
-                                          [ship_id,"Current target", ships_target_id, "Status report", str(ship_hp) + " / " + str(ship_max_hp)],
-                                          [self.frame_color,self.base_text_color,self.opp_frame_color,self.base_text_color,hp_color]):          
-                # render text message
-                #stat_surface = self._render_text(text)
-                stat_surface = self._font.render(text,True,text_color)
-                
-                # get top left position of text surface to be blit
-                top_left = (120,top_left_y)
+            if 0.2 <= (value / ship_max_hp) < 0.5:
+                hp_color = (255,255,0) # yellow
+            elif value / ship_max_hp < 0.2:
+                hp_color = (255,0,0) # RED
+            else:
+                hp_color = (0,255,0) # green
                 
-                # blit stat surface
-                id_template.blit(stat_surface,top_left)
-        elif self.display_mode == 'graphic':
-            ship_image_w, ship_image_h = ship_image.get_rect().size
-            left_buffer, top_buffer = 160 - int(ship_image_w/2), 40 - int(ship_image_h/2)
-            id_template.blit(ship_image, (left_buffer, top_buffer))
+            field_surface = self._render_text(str(value) + " / " + str(ship_max_hp),
+                                              hp_color)
+        elif field == 'ship_image':
+            ship_image_w, ship_image_h = value.get_rect().size
             
-        return id_template
+            return value, (160 - int(ship_image_w/2), 40 - int(ship_image_h/2))
+            
+        return field_surface, self._field_positions[field]
+    
+    def _update_field(self,
+                      field,
+                      value):
+        '''Util function that wipes the area previously covered by the specified
+        field with the static layer, then blits the field's new surface.'''
+        
+        # restore static layer where the field was previously drawn
+        if field in self._field_rects:
+            previous_rect = self._field_rects[field]
+            self.image.blit(self._static_layer, previous_rect, previous_rect)
+            
+        # blit field's new surface and remember its area
+        field_surface, top_left = self._get_field_surface(field,
+                                                          value)
+        self._field_rects[field] = self.image.blit(field_surface, top_left)
+        self._field_values[field] = value
             
     def update(self):
-        '''Updates the sprite's image attribute based on previous/current ship
-        stats.'''
+        '''Refreshes the card every REFRESH_INTERVAL updates.'''
         
-        # only render an updated surface if really necessary
-        if self._have_stats_changed():
-            self.image = self._get_ship_bio_image()
\ No newline at end of file
+        self._updates_since_refresh += 1
+        
+        if self._updates_since_refresh >= ShipBio.REFRESH_INTERVAL:
+            self._updates_since_refresh = 0
+            self._refresh()
+            
+    def _refresh(self):
+        '''Updates the sprite's image attribute by re-rendering only those dynamic
+        fields whose values have changed since the last refresh.'''
+        
+        for field, value in self._get_current_stats().items():
+            if field not in self._field_values or self._field_values[field] != value:
+                self._update_field(field,
+                                   value)
+                
+                # card image was changed in place; flag for dirty rect rendering
+                self.dirty = 1
@@ -6,18 +6,37 @@ Created on Sun May 27 22:09:47 2018
 """
 
 # demo gam states here
+import time
+
+# taken before the heavy imports, for the startup trace
+LAUNCH_TIME = time.perf_counter()
+
 import sys
 import os
-import yaml
-import time
+import random
+import argparse
 
 import pygame as pg
 import numpy as np
 
-from pygame.sprite import Group, collide_mask, groupcollide
+from pygame.sprite import Group
 from basic_sprite_classes import BasicSprite
 from sprite_classes import ShipSprite, AIShipSprite, ShipBio
 from animation_classes import BasicAnimation,TrackingAnimation
+from render_classes import DirtyRectRenderer
+from asset_classes import SurfaceLoader, AssetManager
+from collision_classes import CollisionEngine
+from particle_classes import ParticleEmitter
+from kinematics_classes import KinematicsStore
+from weapons_classes import ProjectileSprite, LaserCannon
+from cache_classes import TEXT_CACHE
+from clock_classes import SimulationClock, WallClock
+from profiler_classes import FrameProfiler, ProfilerOverlay
+from hud_classes import SquadronPanel
+from quality_classes import QualityController
+from meta_data_classes import MetaDataLoader
+from startup_classes import StartupTrace
+from sound_classes import SoundMixer
 
 class Game(object):
     
@@ -26,50 +45,225 @@ class Game(object):
                  screen_height=700,
                  #fps=15,
                  fps=20,
-                 background_image = None):
-        '''Initializes the game object and also the game'''
+                 background_image = None,
+                 dirty_rendering = False,
+                 vectorized_kinematics = False,
+                 game_dir = None,
+                 headless = False,
+                 render_fps = None,
+                 startup_trace = None):
+        '''Initializes the game object: sets up pygame, the main screen, the asset
+        stores and loads the meta data. Call play() to start the game.
+        
+        The boot is staged: only the display is set up before the first frame (the game's
+        title) is shown. The remaining pygame modules, music and meta data are set up
+        after, and the background and cockpit frame images, which are only needed once
+        the first level starts, are loaded on the asset store's loader thread. Boot phases
+        are timed by startup_trace, a StartupTrace object; defaults to a disabled one.
+        
+        If dirty_rendering is set, levels are drawn with a DirtyRectRenderer that only
+        updates the regions of the screen that changed instead of flipping the whole screen.
+        If vectorized_kinematics is set, the positional attributes of all of a level's
+        sprites are kept and integrated in a shared KinematicsStore.
+        game_dir is the directory holding the graphics, sounds and meta directories;
+        defaults to the executable file directory. If headless is set, pygame runs on
+        SDL's dummy video and audio drivers, no music is loaded and no waits are done, so
+        that levels can be simulated with simulate_level on machines without a display.
+        
+        Levels are simulated in fixed steps of 1 / fps seconds, independent of the
+        rendering rate render_fps, which defaults to the display's refresh rate.
+        Between two simulation steps, sprite positions are interpolated.'''
         
         # chane into executable file directory
-        os.chdir(os.path.join(os.getcwd(),'exe.win-amd64-3.6'))
+        if game_dir is None:
+            game_dir = os.path.join(os.getcwd(),'exe.win-amd64-3.6')
+            
+        os.chdir(game_dir)
+        
+        # in headless mode, make sure SDL does not need a display or sound card
+        self.headless = headless
+        
+        if headless:
+            os.environ['SDL_VIDEODRIVER'] = 'dummy'
+            os.environ['SDL_AUDIODRIVER'] = 'dummy'
+            
+        if startup_trace is None:
+            startup_trace = StartupTrace(enabled = False)
+            
+        self.startup_trace = startup_trace
+        
+        # initialize display and fonts only, and show the first frame as soon as possible
+        startup_trace.start('display')
+        
+        pg.display.init()
+        pg.font.init()
+        
+        # initialize main screen; needs to exist before images can be converted to its format
+        size = screen_width, screen_height # set screen size
+        self.screen = pg.display.set_mode(size)
+        pg.display.set_caption("STAR WARS DOGFIGHTER")
+        
+        startup_trace.stop('display')
+        startup_trace.start('first frame')
+        
+        self.blit_message_and_wait("STAR WARS DOGFIGHTER",
+                                   font = './graphics/firefight-bb.regular.ttf')
+        pg.display.flip()
+        
+        startup_trace.stop('first frame')
+        
+        # initialize remaining pygame modules (sound etc.)
+        startup_trace.start('pygame init')
         
-        # initialize pygame (handles pretty much eveything)
         pg.init()
         
+        startup_trace.stop('pygame init')
+        
         # create clock    
         self.clock = pg.time.Clock()
         
-        # background
-        #self.background_image = pg.image.load('./graphics/misc/star_wars_background_24bit.bmp')
-        self.background_image = pg.image.load('./graphics/misc/star_wars_background.bmp')
-        #self.background_image = pg.image.load('./graphics/misc/mountains_background.bmp')
+        self.fps = fps
+        
+        # create simulation clock; advances by one fixed step of 1 / fps seconds per update
+        self.simulation_clock = SimulationClock(1 / fps)
+        
+        # set rendering mode; renderer is created at the start of each level
+        self.dirty_rendering = dirty_rendering
+        self.renderer = None
+        
+        # set kinematics mode; store is created at the start of each level
+        self.vectorized_kinematics = vectorized_kinematics
+        self.kinematics = None
+        
+        # player ship is flown by the player unless a simulation asks otherwise
+        self.ai_player = False
+        
+        # create frame profiler; switched on and off with the [P] key during levels
+        self.profiler = FrameProfiler()
+        
+        # create collision engine; its broadphase is rebuilt every frame
+        self.collision_engine = CollisionEngine()
+        
+        # squadron panels of the current level, by side; only used for large squadrons
+        self._squadron_panels = {}
+        
+        # set rendering rate
+        if render_fps is None:
+            render_fps = self._get_display_refresh_rate()
+            
+        self.render_fps = render_fps
+        
+        # create image loader and asset store; converts all images to display format
+        # and loads each image and sound file only once
+        self.surface_loader = SurfaceLoader()
+        self.assets = AssetManager(self.surface_loader)
+        
+        # background and cockpit frame are only needed once the first level starts; decode
+        # them in the background and prepare them on first use
+        self._decoding_level_frame_images = self.assets.preload(self._decode_level_frame_images)
+        self._level_frame_images = None
         
         # main screen music
-        pg.mixer.music.load('./sounds/power_bots_loop.wav')
-        #pg.mixer.music.load('./sounds/superboy.wav')
+        startup_trace.start('music')
         
-        # cockpit frame
-        self.cockpit_frame = pg.image.load('./graphics/cockpit/cockpit2.bmp')
-        self.cockpit_frame.set_colorkey((255,255,255))
+        if not headless:
+            pg.mixer.music.load('./sounds/power_bots_loop.wav')
+            #pg.mixer.music.load('./sounds/superboy.wav')
+            
+        startup_trace.stop('music')
         
-        self.fps = fps
+        # load meta data; only parses the YAML files if they changed since the last launch
+        startup_trace.start('meta data')
         
-        # initialize main screen
-        size = screen_width, screen_height # set screen size
-        self.screen = pg.display.set_mode(size)
-        pg.display.set_caption("STAR WARS DOGFIGHTER")
+        meta_data = MetaDataLoader('./meta').load()
+        
+        self.skins_meta_data = meta_data['sprite_skins_meta_data']
+        self.animations_meta_data = meta_data['animations_meta_data']
+        self.level_meta_data = meta_data['game_level_meta_data']
+        self.game_meta_data = meta_data['game_meta_data']
+        
+        startup_trace.stop('meta data')
+            
+        # create quality controller; lowers the level of detail when rendered frames
+        # take too long and raises it again when there is headroom
+        self.quality = QualityController.from_meta_data(1 / self.render_fps,
+                                                        self.game_meta_data.get('quality'))
+        self._apply_quality_tier(self.quality.tier)
+        
+        # create sound mixer; plays all sound effects on a fixed voice budget
+        self.sound_mixer = SoundMixer.from_meta_data(self.game_meta_data.get('sound_mixer'))
+        ShipSprite.SOUND_MIXER = self.sound_mixer
+            
+    def _decode_level_frame_images(self):
+        '''Util function that decodes the background and the cockpit frame image files,
+        without preparing them; runs on the asset store's loader thread. Returns them as a
+        (background, cockpit frame) tuple.'''
+        
+        # background
+        #background_image = self.surface_loader.decode('./graphics/misc/star_wars_background_24bit.bmp')
+        background_image = self.surface_loader.decode('./graphics/misc/star_wars_background.bmp')
+        #background_image = self.surface_loader.decode('./graphics/misc/mountains_background.bmp')
+        
+        # cockpit frame
+        cockpit_frame = self.surface_loader.decode('./graphics/cockpit/cockpit2.bmp')
+        
+        return background_image, cockpit_frame
+    
+    def _get_level_frame_images(self):
+        '''Util function that returns the prepared background and cockpit frame images
+        as a (background, cockpit frame) tuple. On first use, waits for their decoding
+        to finish and prepares them.'''
         
-        # load meta data
-        with open('./meta/sprite_skins_meta_data.yaml','r') as skins_meta_file:
-            self.skins_meta_data = yaml.load(skins_meta_file)
+        if self._level_frame_images is None:
+            background_image, cockpit_frame = self._decoding_level_frame_images.result()
+            
+            self._level_frame_images = (self.surface_loader.prepare(background_image)[0],
+                                        self.surface_loader.prepare(cockpit_frame,
+                                                                    transparent_color = (255,255,255))[0])
+            
+        return self._level_frame_images
+    
+    @property
+    def background_image(self):
+        '''The background image; waits for it to be decoded and prepares it if needed.'''
         
-        with open('./meta/animations_meta_data.yaml','r') as animations_meta_file:
-            self.animations_meta_data = yaml.load(animations_meta_file)
+        return self._get_level_frame_images()[0]
+    
+    @property
+    def cockpit_frame(self):
+        '''The cockpit frame image; waits for it to be decoded and prepares it if needed.'''
+        
+        return self._get_level_frame_images()[1]
+        
+    def _apply_quality_tier(self,
+                            tier):
+        '''Util function that applies the settings of the passed quality tier dictionary
+        (see quality_classes.DEFAULT_QUALITY_TIERS) to the rotation cache and the sprite
+        classes. Affects all existing and future sprites.'''
+        
+        BasicSprite.ROTATION_CACHE.configure(angle_resolution = tier['angle_resolution'],
+                                             smooth = tier['smooth_rotation'])
+        ShipSprite.ENGINE_TRAIL_INTERVAL = tier['engine_trail_interval']
+        LaserCannon.MUZZLE_FLASHES = tier['muzzle_flashes']
+        ShipBio.REFRESH_INTERVAL = tier['hud_refresh_interval']
+        SquadronPanel.REFRESH_INTERVAL = tier['hud_refresh_interval']
+        
+    def _get_display_refresh_rate(self,
+                                  default = 60):
+        '''Util function that returns the refresh rate of the current display mode,
+        or default if pygame can not tell (older pygame versions, dummy driver).'''
+        
+        if hasattr(pg.display, 'get_current_refresh_rate'):
+            refresh_rate = pg.display.get_current_refresh_rate()
             
-        with open ('./meta/game_level_meta_data.yaml','r') as level_meta_file:
-            self.level_meta_data = yaml.load(level_meta_file)
+            if refresh_rate:
+                return refresh_rate
             
-        with open('./meta/game_meta_data.yaml','r') as game_meta_file:
-            self.game_meta_data = yaml.load(game_meta_file)
+        return default
+        
+    def play(self):
+        '''Runs the game: welcome screen, side selection and all levels. Quits
+        pygame and exits when done.'''
         
         # start start-up animation and welcome screen
         pg.mixer.music.play(loops=-1)
@@ -83,21 +277,37 @@ class Game(object):
         if player_feedback == 'pass':
             
             # start levels
-            level_index = 0
+            level_index, preloading = 0, None
             
             while level_index < 6:
                 # get level specs for i-th level
                 level_specs = self.level_meta_data[level_index]
                 
+                # wait for the background loading of this level's assets, if any, to finish
+                if preloading is not None:
+                    preloading.result()
+                
                 # get meta data for i-th level
+                # assets requested from here on are referenced by this level
+                self.assets.begin_level(level_index)
+                
                 level_meta_data = self._collect_meta_data_for_level(player_side,
                                                                     hostile_side,
                                                                     level_index,
                                                                     level_specs)
                 
+                # load the next level's assets in the background while this one is played
+                if level_index + 1 < 6:
+                    preloading = self._preload_level(player_side,
+                                                     hostile_side,
+                                                     level_index + 1)
+                
                 # start level and receive level outcome
                 player_feedback, level_outcome = self.start_level(level_meta_data)
                 
+                # release level's assets; they stay cached for retries and later levels
+                self.assets.end_level(level_index)
+                
                 if player_feedback == 'quit_game':
                     break 
                 elif player_feedback == 'retry':
@@ -111,10 +321,129 @@ class Game(object):
             # display game over message
             self.goodbye_screen()
         
-        # quit (py)game
+        # quit (py)game; let a running preload finish first
+        self.assets.shutdown()
         pg.quit()
         sys.exit()
         
+    def simulate_level(self,
+                       level_index,
+                       player_side = 'rebel',
+                       hostile_side = 'empire',
+                       max_seconds = 300,
+                       ai_player = True,
+                       seed = None):
+        '''Simulates the level with index level_index as fast as possible: the game
+        state is updated and collisions are handled every frame, but nothing is drawn and
+        the clock is not ticked. Intended for headless mode.
+        Arguments:
+            - level_index: index of the level in game_level_meta_data.yaml.
+            - player_side, hostile_side: 'rebel' or 'empire'.
+            - max_seconds: simulated time (in seconds) after which the level is stopped
+            with outcome 'timeout'.
+            - ai_player: if set, the player ship is flown by the AI like all other ships.
+            Otherwise it flies straight ahead.
+            - seed: optional seed for the random number generator used by the AI.
+        Returns a dictionary with the level outcome ('pass', 'fail' or 'timeout'), the
+        number of simulated frames and seconds, the wall time spent in total and per phase,
+        and the number of ships left on each side.'''
+        
+        if seed is not None:
+            random.seed(seed)
+            
+        t_start = time.perf_counter()
+        
+        # get meta data and sprite groups for this level
+        self.assets.begin_level(level_index)
+        
+        level_meta_data = self._collect_meta_data_for_level(player_side,
+                                                            hostile_side,
+                                                            level_index,
+                                                            self.level_meta_data[level_index])
+        
+        level_sprite_groups = self._collect_sprite_groups_for_level()
+        
+        # get kinematics store for this level's sprites if needed
+        if self.vectorized_kinematics:
+            self.kinematics = KinematicsStore(self.screen.get_size(),
+                                              BasicSprite.COCKPIT_BAR_WIDTH)
+            BasicSprite.KINEMATICS_STORE = self.kinematics
+        
+        # let all sprites and cannons read the simulated time
+        self.simulation_clock.reset()
+        BasicSprite.CLOCK = self.simulation_clock
+        
+        # add sprites to groups for this level
+        self.ai_player = ai_player
+        
+        self._add_sprites_to_groups_for_level(level_meta_data,
+                                              level_sprite_groups)
+        
+        self.ai_player = False
+        
+        t_setup = time.perf_counter() - t_start
+        
+        # run level without drawing or waiting
+        n_frames, max_frames = 0, int(max_seconds * self.fps)
+        t_update, t_collisions = 0, 0
+        level_status = 'ongoing'
+        
+        while level_status == 'ongoing' and n_frames < max_frames:
+            t_0 = time.perf_counter()
+            
+            # update game state
+            self.update_game_state(level_sprite_groups)
+            
+            t_1 = time.perf_counter()
+            
+            # check and handle collisions
+            self.handle_collisions(level_meta_data,
+                                   level_sprite_groups,
+                                   False)
+            
+            self.simulation_clock.advance()
+            self.sound_mixer.end_frame()
+            
+            t_2 = time.perf_counter()
+            
+            t_update += t_1 - t_0
+            t_collisions += t_2 - t_1
+            n_frames += 1
+            
+            # check if level done based on game state
+            level_status = self._get_level_status(level_sprite_groups)
+            
+        # hand this level's pooled sprites back and release its assets
+        for sprite_pool in (BasicAnimation.POOL, TrackingAnimation.POOL, ProjectileSprite.POOL):
+            sprite_pool.release_all()
+            
+        # drop radar readings and target index entries referencing this level's ships
+        AIShipSprite.RADAR.clear()
+        AIShipSprite.TARGET_INDEX.clear()
+        
+        BasicSprite.KINEMATICS_STORE = self.kinematics = None
+        BasicSprite.CLOCK = WallClock()
+        
+        self.assets.end_level(level_index)
+        
+        if level_status == 'ongoing':
+            level_status = 'timeout'
+            
+        t_total = time.perf_counter() - t_start
+        simulated_seconds = n_frames / self.fps
+            
+        return {'level_index':level_index,
+                'outcome':level_status,
+                'frames':n_frames,
+                'simulated_seconds':simulated_seconds,
+                'wall_seconds':t_total,
+                'setup_seconds':t_setup,
+                'update_seconds':t_update,
+                'collision_seconds':t_collisions,
+                'speedup':simulated_seconds / max(t_total, 1e-9),
+                'ships_left':{'ally':len(level_sprite_groups['ships']['ally']),
+                              'hostile':len(level_sprite_groups['ships']['hostile'])}}
+            
     def handle_startup_events_queue(self,
                                     player_input):
         '''Util function that produces returns a break flag when user pressing
@@ -171,11 +500,13 @@ class Game(object):
         background_color is specified) by rendering the specified
         text message according to the passed specs.'''
         
-        # get font from specs
-        font = pg.font.Font(font,size)
-        
-        # render text to get surface
-        text_surface = font.render(message,False,text_color,background_color)
+        # render text to get surface; fonts and surfaces are shared via the text cache
+        text_surface = TEXT_CACHE.render(message,
+                                         font,
+                                         size,
+                                         text_color,
+                                         antialias = False,
+                                         background_color = background_color)
         
         return text_surface
     
@@ -244,8 +575,8 @@ class Game(object):
         if blit_mode:
             pg.display.flip()
         
-        # wait if needed
-        if wait_seconds:
+        # wait if needed; never wait in headless mode
+        if wait_seconds and not self.headless:
             pg.time.wait(int(wait_seconds * 1000))
         
     def welcome_screen(self):
@@ -254,6 +585,8 @@ class Game(object):
         
         player_input = ''
         
+        self.startup_trace.start('welcome screen')
+        
         # get sprite group for screen messages
         start_up_sprites = Group()
         
@@ -282,6 +615,8 @@ class Game(object):
                        is_transparent = True,
                        looping = True)
         
+        self.startup_trace.stop('welcome screen')
+        
         # start main game loop
         while True:
             # handle player pressing any key
@@ -299,6 +634,9 @@ class Game(object):
             start_up_sprites.draw(self.screen)
             pg.display.flip()
             
+            # the game is interactive once the welcome screen is up; only reports once
+            self.startup_trace.report()
+            
             # control speed up frame updates
             clock.tick(self.fps)
             
@@ -326,8 +664,8 @@ class Game(object):
         
         # get logos for both sides from game meta data
         side_logos = {}
-        side_logos['empire'] = [pg.image.load(image_path) for image_path in self.game_meta_data['empire']['image_paths']]
-        side_logos['rebel'] = [pg.image.load(image_path) for image_path in self.game_meta_data['rebel']['image_paths']]
+        side_logos['empire'] = self._load_images(self.game_meta_data['empire']['image_paths'])
+        side_logos['rebel'] = self._load_images(self.game_meta_data['rebel']['image_paths'])
         
         # create sprites with logos
         empire_logo = BasicSprite(self.fps,
@@ -449,6 +787,45 @@ class Game(object):
                                    font='./graphics/firefight-bb.regular.ttf',
                                    wait_seconds = 1.5)
             
+    def _load_images(self,
+                     image_paths,
+                     transparent_color = (255,255,255)):
+        '''Util function that gets the images at the specified paths from the game's
+        asset store and returns them as a list of shared, display format surfaces.
+        Images are colour keyed with transparent_color unless it is set to None.'''
+        
+        return self.assets.get_images(image_paths,
+                                      transparent_color = transparent_color)
+            
+    def _load_atlas_images(self,
+                           atlas_entries,
+                           transparent_color = (255,255,255)):
+        '''Util function that gets the images of the specified atlas entries from the
+        game's asset store and returns them as a list of shared, display format
+        surfaces. See _load_images.'''
+        
+        return self.assets.get_atlas_images(atlas_entries,
+                                            transparent_color = transparent_color)
+            
+    def _preload_level(self,
+                       player_side,
+                       hostile_side,
+                       level_index):
+        '''Util function that starts reading and decoding the image and sound files of
+        the specified level on the asset store's loader thread. Returns the future of the
+        preload. Once it is done, collecting the level's meta data no longer needs to read
+        any files, only to prepare the decoded ones on the main thread. Fonts are created
+        on the main thread as well; they are kept by the text cache after the first level.'''
+        
+        def load_level_assets():
+            
+            self._collect_meta_data_for_level(player_side,
+                                              hostile_side,
+                                              level_index,
+                                              self.level_meta_data[level_index])
+        
+        return self.assets.preload(load_level_assets)
+        
     def _collect_meta_data_for_level(self,
                                      player_side,
                                      hostile_side,
@@ -482,16 +859,16 @@ class Game(object):
 
         # --- get meta data for player, ally and hostile sides
         #   pilot skins
-        pilot_images = {'player':[pg.image.load(image_path) for image_path in self.animations_meta_data[player_side+'_pilot']['image_paths']],
-                        'hostile': [pg.image.load(image_path) for image_path in self.animations_meta_data[hostile_side+'_pilot']['image_paths']]}
+        pilot_images = {'player':self._load_atlas_images(self.animations_meta_data[player_side+'_pilot']['atlas_entries'], transparent_color = None),
+                        'hostile': self._load_atlas_images(self.animations_meta_data[hostile_side+'_pilot']['atlas_entries'], transparent_color = None)}
         
         # ship skins
-        ship_images = {'player':[pg.image.load(image_path) for image_path in self.skins_meta_data[player_ship]['image_paths']],
-                            'hostile':[pg.image.load(image_path) for image_path in self.skins_meta_data[hostile_ship]['image_paths']]}
+        ship_images = {'player':self._load_atlas_images(self.skins_meta_data[player_ship]['atlas_entries']),
+                            'hostile':self._load_atlas_images(self.skins_meta_data[hostile_ship]['atlas_entries'])}
         
         # ship frames
-        ship_frames = {'player':[pg.image.load(image_path) for image_path in self.animations_meta_data['ship_frame']['yellow']['image_paths']],
-                       'hostile':[pg.image.load(image_path) for image_path in self.animations_meta_data['ship_frame']['red']['image_paths']]}
+        ship_frames = {'player':self._load_atlas_images(self.animations_meta_data['ship_frame']['yellow']['atlas_entries']),
+                       'hostile':self._load_atlas_images(self.animations_meta_data['ship_frame']['red']['atlas_entries'])}
         
         # gun offsets
         gun_offsets = {'player':np.array(self.skins_meta_data[player_ship]['gun_offsets']).astype('float'),
@@ -506,16 +883,16 @@ class Game(object):
                       'hostile':self.skins_meta_data[hostile_ship]['fire_modes']}
         
         # laser images
-        laser_images = {'player':[pg.image.load(image_path) for image_path in self.skins_meta_data[player_laser]['image_paths']],
-                        'hostile':[pg.image.load(image_path) for image_path in self.skins_meta_data[hostile_laser]['image_paths']]}
+        laser_images = {'player':self._load_atlas_images(self.skins_meta_data[player_laser]['atlas_entries']),
+                        'hostile':self._load_atlas_images(self.skins_meta_data[hostile_laser]['atlas_entries'])}
         
         # laser sounds
-        laser_sounds = {'player':pg.mixer.Sound(file=self.animations_meta_data[player_laser]['sound']),
-                        'hostile':pg.mixer.Sound(file=self.animations_meta_data[hostile_laser]['sound'])}
+        laser_sounds = {'player':self.assets.get_sound(self.animations_meta_data[player_laser]['sound']),
+                        'hostile':self.assets.get_sound(self.animations_meta_data[hostile_laser]['sound'])}
         
         # muzzle images
-        muzzle_flash_images = {'player':[pg.image.load(image_path) for image_path in self.animations_meta_data[player_laser]['image_paths']],
-                                'hostile':[pg.image.load(image_path) for image_path in self.animations_meta_data[hostile_laser]['image_paths']]}
+        muzzle_flash_images = {'player':self._load_atlas_images(self.animations_meta_data[player_laser]['atlas_entries']),
+                                'hostile':self._load_atlas_images(self.animations_meta_data[hostile_laser]['atlas_entries'])}
         
         # muzzle seconds per image
         muzzle_flash_spi = {'player':self.animations_meta_data[player_laser]['spi'],
@@ -527,15 +904,15 @@ class Game(object):
         
         # ally meta data - depends on level
         if 'ally' in level_specs.keys():
-            pilot_images['ally'] = [pg.image.load(image_path) for image_path in self.animations_meta_data[player_side+'_pilot']['image_paths']]
-            ship_images['ally'] = [pg.image.load(image_path) for image_path in self.skins_meta_data[ally_ship]['image_paths']]
-            ship_frames['ally'] = [pg.image.load(image_path) for image_path in self.animations_meta_data['ship_frame']['green']['image_paths']]
+            pilot_images['ally'] = self._load_atlas_images(self.animations_meta_data[player_side+'_pilot']['atlas_entries'], transparent_color = None)
+            ship_images['ally'] = self._load_atlas_images(self.skins_meta_data[ally_ship]['atlas_entries'])
+            ship_frames['ally'] = self._load_atlas_images(self.animations_meta_data['ship_frame']['green']['atlas_entries'])
             gun_offsets['ally'] = np.array(self.skins_meta_data[ally_ship]['gun_offsets']).astype('float')
             engine_offsets['ally'] = np.array(self.skins_meta_data[ally_ship]['engine_offsets']).astype('float')
             fire_modes['ally'] = self.skins_meta_data[ally_ship]['fire_modes']
-            laser_images['ally'] = [pg.image.load(image_path) for image_path in self.skins_meta_data[ally_laser]['image_paths']]
-            laser_sounds['ally'] = pg.mixer.Sound(file=self.animations_meta_data[ally_laser]['sound'])
-            muzzle_flash_images['ally'] = [pg.image.load(image_path) for image_path in self.animations_meta_data[ally_laser]['image_paths']]
+            laser_images['ally'] = self._load_atlas_images(self.skins_meta_data[ally_laser]['atlas_entries'])
+            laser_sounds['ally'] = self.assets.get_sound(self.animations_meta_data[ally_laser]['sound'])
+            muzzle_flash_images['ally'] = self._load_atlas_images(self.animations_meta_data[ally_laser]['atlas_entries'])
             muzzle_flash_spi['ally'] = self.animations_meta_data[ally_laser]['spi']
             ship_init_kwargs['ally'] = level_specs['ally']['ship_init_kwargs']
             
@@ -550,17 +927,18 @@ class Game(object):
                           'laser_sounds':laser_sounds,
                           'muzzle_flash_images':muzzle_flash_images,
                           'muzzle_flash_spi':muzzle_flash_spi,
-                          'explosion_images':[pg.image.load(image_path) for image_path in self.animations_meta_data['explosion']['image_paths']],
-                          'explosion_sounds':pg.mixer.Sound(file=self.animations_meta_data['explosion']['sound']),
+                          'explosion_images':self._load_atlas_images(self.animations_meta_data['explosion']['atlas_entries']),
+                          'explosion_sounds':self.assets.get_sound(self.animations_meta_data['explosion']['sound']),
                           'explosion_spi':self.animations_meta_data['explosion']['spi'],
-                          'hit_sounds':pg.mixer.Sound(file=self.animations_meta_data['hit']['sound']),
+                          'hit_sounds':self.assets.get_sound(self.animations_meta_data['hit']['sound']),
                           'hit_spi':self.animations_meta_data['hit']['spi'],
-                          'engine_images':[pg.image.load(image_path) for image_path in self.animations_meta_data['engine']['image_paths']],
+                          'engine_images':self._load_atlas_images(self.animations_meta_data['engine']['atlas_entries']),
                           'engine_spi':self.animations_meta_data['engine']['spi'],
-                          'engine_trail_images':[pg.image.load(image_path) for image_path in self.animations_meta_data['engine_trail']['image_paths']],
+                          'engine_trail_images':self._load_atlas_images(self.animations_meta_data['engine_trail']['atlas_entries']),
                           'engine_trail_spi':self.animations_meta_data['engine_trail']['spi'],
                           'piloting_cone_sine':0.1,
                           'gunning_cone_sine':0.1,
+                          'target_reevaluation_seconds':level_specs.get('target_reevaluation_seconds',2),
                           'ship_init_kwargs':ship_init_kwargs,
                           'level_number':level_index+1,
                           'pilot_images':pilot_images,
@@ -586,6 +964,9 @@ class Game(object):
         # animations and other non-collidable sprites will be added to this group
         non_collidables_group = {'any':Group()}
         
+        # engine trail and hit spark particles will be added to this emitter
+        particle_emitter = {'any':ParticleEmitter(self.fps)}
+        
         # end of level messages will be added to this group
         level_endings = {'pass':Group(),
                          'fail':Group()}
@@ -599,6 +980,7 @@ class Game(object):
         level_sprite_groups = {'ships':ship_groups,
                               'lasers':laser_beams_groups,
                               'non_colliders':non_collidables_group,
+                              'particles':particle_emitter,
                               'level_endings':level_endings,
                               'cockpit':cockpit_group,
                               'background':background_group}
@@ -610,6 +992,9 @@ class Game(object):
                                level_sprite_groups):
         '''Util function that spawns all the ships for current level. Returns the
         intitalized player ShipSprite object.'''
+        # forget previous level's squadron panels
+        self._squadron_panels = {}
+        
         # create player sprite and add to relevant groups / provide with relevant groups
         player = self.spawn_ship('player',
                                  0,
@@ -622,10 +1007,11 @@ class Game(object):
                                 level_meta_data,
                                 level_sprite_groups)
         
-        # create hostiles for this level and add to groups
+        # create hostiles for this level and add to groups; the player's target always gets a card
         self.spawn_squadron('hostile',
                             level_meta_data,
-                            level_sprite_groups)
+                            level_sprite_groups,
+                            focus_group = player._current_target)
         
         # render level ending messages and add to groups
         self.spawn_level_ending_messages(level_sprite_groups)
@@ -641,6 +1027,10 @@ class Game(object):
         if level_status == 'ongoing':
             # invert pause state
             paused = not paused
+            
+            # pause message is blitted straight to screen; redraw everything when done
+            if self.renderer is not None:
+                self.renderer.invalidate()
                             
             if paused:
                 # display pause message on screen
@@ -670,6 +1060,20 @@ class Game(object):
             
         return sound
     
+    def _toggle_profiler(self,
+                         level_sprite_groups):
+        '''Util function that toggles the frame profiler and its overlay in the
+        cockpit bar during the game.'''
+        
+        if self.profiler.toggle():
+            ProfilerOverlay(self.profiler,
+                            [level_sprite_groups['cockpit']['any']],
+                            budget_ms = 1000 / self.fps)
+        else:
+            for sprite in level_sprite_groups['cockpit']['any'].sprites():
+                if isinstance(sprite, ProfilerOverlay):
+                    sprite.kill()
+    
     def handle_level_events_queue(self,
                             player_input,
                             level_status,
@@ -707,6 +1111,10 @@ class Game(object):
                 if event.key == pg.K_s:
                     sound = self._toggle_sound(level_sprite_groups,
                                                sound)
+                    
+                # toggle frame profiler if needed
+                if event.key == pg.K_p:
+                    self._toggle_profiler(level_sprite_groups)
                 
                 # control player fire mode
                 if event.key == pg.K_f:
@@ -787,10 +1195,26 @@ class Game(object):
                                    font='./graphics/firefight-bb.regular.ttf',
                                    wait_seconds = 1.5)
         
+        # get kinematics store for this level's sprites if needed
+        if self.vectorized_kinematics:
+            self.kinematics = KinematicsStore(self.screen.get_size(),
+                                              BasicSprite.COCKPIT_BAR_WIDTH)
+            BasicSprite.KINEMATICS_STORE = self.kinematics
+            
+        # let all sprites and cannons read the simulated time
+        self.simulation_clock.reset()
+        BasicSprite.CLOCK = self.simulation_clock
+        
         # add sprites to groups for this level
         player = self._add_sprites_to_groups_for_level(level_meta_data,
                                                        level_sprite_groups)
         
+        # get dirty rect renderer for this level if needed
+        if self.dirty_rendering:
+            self.renderer = DirtyRectRenderer(self.screen,
+                                              self.background_image,
+                                              overlay_image = self.cockpit_frame)
+        
         # sync player controls with current keyboard status before entering event loop
         self._sync_player_(player)
         
@@ -803,28 +1227,71 @@ class Game(object):
             pg.mixer.music.set_volume(level_meta_data['music_volume'])
             pg.mixer.music.play(loops=-1)
         
+        # initialize fixed step accumulator: simulation steps are taken whenever
+        # at least one step's worth of real time has passed
+        step_seconds = self.simulation_clock.step_seconds
+        accumulated_seconds, t_last = 0, time.perf_counter()
+        
+        # a profiler left on in the previous level keeps showing in this one
+        if self.profiler.enabled:
+            ProfilerOverlay(self.profiler,
+                            [level_sprite_groups['cockpit']['any']],
+                            budget_ms = 1000 / self.fps)
+        
+        # frames from before the level started do not count towards the quality tier
+        self.quality.start()
+        
         # start main game loop
         while True:
+            t_frame_start = time.perf_counter()
+            
             # handle events
+            self.profiler.start('events')
+            
             player_input, level_status, paused, sound = self.handle_level_events_queue(player_input,
                                                                                  level_status,
                                                                                  level_sprite_groups,
                                                                                  paused,
                                                                                  sound,
                                                                                  player)
+            
+            self.profiler.stop('events')
+            
+            # accumulate real time passed; cap to avoid a spiral of catch up steps after stalls
+            t_now = time.perf_counter()
+            accumulated_seconds += min(t_now - t_last, 0.25)
+            t_last = t_now
                 
             if not paused:
-                # update game state
-                self.update_game_state(level_sprite_groups)
+                while accumulated_seconds >= step_seconds:
+                    # update game state
+                    self.update_game_state(level_sprite_groups)
+                    
+                    # check and handle collisions
+                    self.profiler.start('collisions')
+                    
+                    self.handle_collisions(level_meta_data,
+                                           level_sprite_groups,
+                                           sound)
+                    
+                    self.profiler.stop('collisions')
+                    
+                    self.simulation_clock.advance()
+                    accumulated_seconds -= step_seconds
+                    
+                # play this frame's sounds, however many simulation steps requested them
+                self.sound_mixer.end_frame()
+                
+                # position sprites between the last two steps
+                self._interpolate_game_state(level_sprite_groups,
+                                             accumulated_seconds / step_seconds)
                 
                 # draw update game state to screen
                 self.draw_game_state(level_sprite_groups,
                                      level_status)
-                
-                # check and handle collisions
-                self.handle_collisions(level_meta_data,
-                                       level_sprite_groups,
-                                       sound)
+            else:
+                # time does not pass while paused
+                accumulated_seconds = 0
             
             # check if level done based on key events; if 'quit_game', quit level,
             # return to main game and quit
@@ -841,51 +1308,149 @@ class Game(object):
                 if time.time() - t_pass > 3:
                     break
 
-            # control pace
-            self.clock.tick(self.fps)
+            # adjust level of detail to the time this frame took before waiting for the next
+            if not paused and self.quality.record(time.perf_counter() - t_frame_start):
+                self._apply_quality_tier(self.quality.tier)
+            
+            # control rendering pace
+            self.profiler.start('idle')
+            self.clock.tick(self.render_fps)
+            self.profiler.stop('idle')
+            
+            # close frame for the profiler
+            if self.profiler.enabled:
+                self.profiler.end_frame(self._get_sprite_counts(level_sprite_groups))
+            
+        # hand this level's pooled sprites back for reuse in the next level
+        for sprite_pool in (BasicAnimation.POOL, TrackingAnimation.POOL, ProjectileSprite.POOL):
+            sprite_pool.release_all()
+            
+        # drop radar readings and target index entries referencing this level's ships
+        AIShipSprite.RADAR.clear()
+        AIShipSprite.TARGET_INDEX.clear()
+        
+        # sprites created outside of levels move on their own and read the wall clock again
+        BasicSprite.KINEMATICS_STORE = self.kinematics = None
+        BasicSprite.CLOCK = WallClock()
             
         return player_input, level_status
             
     def update_game_state(self,
                           sprite_groups):
-        '''Updates the game state by updating all the game's sprite groups.'''
+        '''Updates the game state by updating all the game's sprite groups. The AI
+        ships' target index is rebuilt and their radar scanned first. In vectorized kinematics mode, all registered
+        sprites are then moved by the level's kinematics store.'''
+        
+        profiler = self.profiler
+        
+        # index the ships for target acquisition and take this frame's radar readings for
+        # all AI ships, across the index' wrapped playing field; pilots and gunners look them up
+        profiler.start('radar')
+        AIShipSprite.TARGET_INDEX.rebuild((sprite_groups['ships']['ally'],
+                                           sprite_groups['ships']['hostile']),
+                                          self.screen.get_size(),
+                                          BasicSprite.COCKPIT_BAR_WIDTH)
+        AIShipSprite.RADAR.scan(sprite_groups['ships']['any'],
+                                AIShipSprite.TARGET_INDEX.field_size)
+        profiler.stop('radar')
+        
+        if self.kinematics is not None:
+            profiler.start('kinematics')
+            self.kinematics.step()
+            profiler.stop('kinematics')
         
         sprite_groups['background']['any'].update()
-        sprite_groups['ships']['any'].update()
-        sprite_groups['lasers']['ally'].update()
-        sprite_groups['lasers']['hostile'].update()
-        sprite_groups['non_colliders']['any'].update()
-        sprite_groups['cockpit']['any'].update()
+        
+        for phase, group in (('upd ships',sprite_groups['ships']['any']),
+                             ('upd lasers',sprite_groups['lasers']['ally']),
+                             ('upd lasers',sprite_groups['lasers']['hostile']),
+                             ('upd anims',sprite_groups['non_colliders']['any']),
+                             ('upd particles',sprite_groups['particles']['any']),
+                             ('upd cockpit',sprite_groups['cockpit']['any'])):
+            profiler.start(phase)
+            group.update()
+            profiler.stop(phase)
+            
         #sprite_groups['level_endings']['any'].update()
         
+    def _interpolate_game_state(self,
+                                sprite_groups,
+                                alpha):
+        '''Util function that positions all moving sprites between their positions
+        at the end of the previous and the current simulation step. alpha is the share
+        of a simulation step that has passed since the current step.'''
+        
+        for group in (sprite_groups['ships']['any'],
+                      sprite_groups['lasers']['ally'],
+                      sprite_groups['lasers']['hostile'],
+                      sprite_groups['non_colliders']['any']):
+            for sprite in group.sprites():
+                sprite.interpolate(alpha)
+        
     def draw_game_state(self,
                         sprite_groups,
                         level_status):
         '''Draws updated game state by wiping the game's main surface,
         drawing all the game's sprite groups and then flipping the game's main
-        surface to display the drawings.'''
+        surface to display the drawings. In dirty rendering mode, only the changed
+        regions are wiped, redrawn and updated by the level's renderer.'''
+        
+        if self.renderer is not None:
+            # collect groups below the cockpit frame
+            lower_groups = [sprite_groups['ships']['any'],
+                            sprite_groups['lasers']['ally'],
+                            sprite_groups['lasers']['hostile'],
+                            sprite_groups['particles']['any'],
+                            sprite_groups['non_colliders']['any']]
+            
+            if level_status in ['pass','fail']:
+                lower_groups.append(sprite_groups['level_endings'][level_status])
+                
+            # draw changed regions and push them to display
+            self.profiler.start('render dirty')
+            
+            self.renderer.render(lower_groups,
+                                 [sprite_groups['cockpit']['any']])
+            
+            self.profiler.stop('render dirty')
+            
+            return
+        
+        profiler = self.profiler
         
         # draw new game state    
+        profiler.start('drw backgr')
         self.screen.blit(self.background_image,(0,0)) # paint over old game state
         #sprite_groups['background']['any'].draw(self.screen)
+        profiler.stop('drw backgr')
         
-        sprite_groups['ships']['any'].draw(self.screen)
-        sprite_groups['lasers']['ally'].draw(self.screen)
-        sprite_groups['lasers']['hostile'].draw(self.screen)
-        sprite_groups['non_colliders']['any'].draw(self.screen)
+        for phase, group in (('drw ships',sprite_groups['ships']['any']),
+                             ('drw lasers',sprite_groups['lasers']['ally']),
+                             ('drw lasers',sprite_groups['lasers']['hostile']),
+                             ('drw particles',sprite_groups['particles']['any']),
+                             ('drw anims',sprite_groups['non_colliders']['any'])):
+            profiler.start(phase)
+            group.draw(self.screen)
+            profiler.stop(phase)
         
         if level_status == 'pass':
             sprite_groups['level_endings']['pass'].draw(self.screen)
         elif level_status == 'fail':
             sprite_groups['level_endings']['fail'].draw(self.screen)
             
+        profiler.start('drw cockpit')
+        
         self.screen.blit(self.cockpit_frame,(0,0)) # paint over old cockpit frame
         
         # draw cockpit items
         sprite_groups['cockpit']['any'].draw(self.screen)
+        
+        profiler.stop('drw cockpit')
                    
         # flip canvas
+        profiler.start('flip')
         pg.display.flip()
+        profiler.stop('flip')
         
     def handle_collisions(self,
                           level_meta_data,
@@ -893,83 +1458,65 @@ class Game(object):
                           sound):
         '''Checks for collisions between player sprite and enemy lasers, as well
         as enemy sprites and player lasers. Terminates any sprites that were
-        shot down. Records the time of the kill.'''
-
-        # ---- check for allies being hit ----
-        hit_allies = groupcollide(sprite_groups['ships']['ally'],
-                                  sprite_groups['lasers']['hostile'],
-                                      False,
-                                      False,
-                                      collide_mask)
-        
-        for hit_ally in hit_allies:
-            # update hit ship's hit points attribute
-            hit_ally.was_hit()
-            hit_ally._hit_points -= 1
-            
-            # if ship has no more hit points left, destroy and set flag
-            if not hit_ally._hit_points:
-                hit_ally.kill()
-    
-        # recheck to get positions for hit explosions
-        hitting_hostile_lasers = groupcollide(sprite_groups['lasers']['hostile'],
-                                              sprite_groups['ships']['ally'],
-                                              True,
-                                              False,
-                                              collide_mask)
-        
-        for hitting_hostile_laser in hitting_hostile_lasers:
-            # play hit sound if sound is toggled on
-            if sound:
-                level_meta_data['hit_sounds'].play()
-                
-            # create small explosion to show hit
-            BasicAnimation(self.fps,
-                              self.screen,
-                             level_meta_data['explosion_images'],
-                             level_meta_data['hit_spi'],
-                             [sprite_groups['non_colliders']['any']],
-                             center = hitting_hostile_laser._center,
-                             image_scaling=0.25)
-        
-        # ---- check if hostiles have been hit ----
-        # check for player kills
-        hit_hostiles = groupcollide(sprite_groups['ships']['hostile'],
-                                  sprite_groups['lasers']['ally'],
-                                      False,
-                                      False,
-                                      collide_mask)
-        
-        for hit_hostile in hit_hostiles:
-            # update hit ship's hit points attribute
-            hit_hostile.was_hit()
-            hit_hostile._hit_points -= 1
-            
-            # if ship has no more hit points left, destroy and flag
-            if not hit_hostile._hit_points:
-                hit_hostile.kill()
+        shot down. Records the time of the kill.
+        
+        Ships are hashed into the collision engine's grid once per frame; a single
+        pass per side then yields the (ship, laser) pairs used for hit point updates,
+        laser removal and hit effects.'''
+        
+        # rebuild broadphase for this frame
+        self.collision_engine.rebuild({'ally':sprite_groups['ships']['ally'],
+                                       'hostile':sprite_groups['ships']['hostile']})
+        
+        # ---- check for allies being hit, then hostiles being hit ----
+        for ship_side, laser_side in [('ally','hostile'),('hostile','ally')]:
+            hits = self.collision_engine.find_hits(ship_side,
+                                                   sprite_groups['lasers'][laser_side])
+            
+            # get hit ships and hitting lasers in order of detection, without duplicates
+            hit_ships, hitting_lasers = [], []
+            
+            for hit_ship, hitting_laser in hits:
+                if hit_ship not in hit_ships:
+                    hit_ships.append(hit_ship)
+                if hitting_laser not in hitting_lasers:
+                    hitting_lasers.append(hitting_laser)
+            
+            for hit_ship in hit_ships:
+                # update hit ship's hit points attribute
+                hit_ship.was_hit()
+                hit_ship._hit_points -= 1
                 
-        # recheck to get positions for hit explosions
-        hitting_ally_lasers = groupcollide(sprite_groups['lasers']['ally'],
-                                              sprite_groups['ships']['hostile'],
-                                              True,
-                                              False,
-                                              collide_mask)
-        
-        for hitting_ally_laser in hitting_ally_lasers:
-            # play hit sound if sound is toggled on
-            if sound:
-                level_meta_data['hit_sounds'].play()
+                # if ship has no more hit points left, destroy and set flag
+                if not hit_ship._hit_points:
+                    hit_ship.kill()
+                    
+            for hitting_laser in hitting_lasers:
+                # remove laser
+                hitting_laser.kill()
                 
-            # create small explosion to show hit
-            BasicAnimation(self.fps,
-                              self.screen,
-                             level_meta_data['explosion_images'],
-                             level_meta_data['hit_spi'],
-                             [sprite_groups['non_colliders']['any']],
-                             center = hitting_ally_laser._center,
-                             image_scaling=0.25)
+                # play hit sound if sound is toggled on
+                if sound:
+                    self.sound_mixer.play(level_meta_data['hit_sounds'],
+                                          'hit')
+                    
+                # create small explosion to show hit
+                sprite_groups['particles']['any'].emit(level_meta_data['explosion_images'],
+                                                       level_meta_data['hit_spi'],
+                                                       hitting_laser._center,
+                                                       scale = 0.25)
                 
+    def _get_sprite_counts(self,
+                           sprite_groups):
+        '''Util function that returns the number of live sprites in each of the
+        level's sprite groups (see _collect_sprite_groups_for_level).'''
+        
+        return {'ships':len(sprite_groups['ships']['any']),
+                'lasers':len(sprite_groups['lasers']['ally']) + len(sprite_groups['lasers']['hostile']),
+                'anims':len(sprite_groups['non_colliders']['any']),
+                'particles':len(sprite_groups['particles']['any']),
+                'cockpit':len(sprite_groups['cockpit']['any'])}
+        
     def _get_level_status(self,
                           sprite_group):
         '''Util function that checks sprite_groups to see if player is dead or all enemies are dead.
@@ -1013,8 +1560,10 @@ class Game(object):
         '''Takes the ship_id and makes and returns a pygame surface with that 
         ID in the bottom right corner.'''
         
-        largeText = pg.font.Font('freesansbold.ttf',12)
-        textSurface = largeText.render(ship_id, True, (254,254,254))
+        textSurface = TEXT_CACHE.render(ship_id,
+                                        'freesansbold.ttf',
+                                        12,
+                                        (254,254,254))
         
         return [textSurface]
     
@@ -1086,11 +1635,17 @@ class Game(object):
                           
         # get initial values for ship sprite initializers from level meta data
         if side == 'player':
-            # adjsut args for player
-            ship_init_args = ship_init_args[:22] + ship_init_args[24:]
+            # adjsut args for player, unless player is flown by the AI
+            if not self.ai_player:
+                ship_init_args = ship_init_args[:22] + ship_init_args[24:]
             
-            # get kwargs for player
-            ship_init_kwargs = level_meta_data['ship_init_kwargs'][side]
+            # get kwargs for player; copy to keep the level meta data clean
+            ship_init_kwargs = dict(level_meta_data['ship_init_kwargs'][side])
+            
+            # AI needs to know its enemies
+            if self.ai_player:
+                ship_init_kwargs['hostile_ships_group'] = groups['ships'][other_side]
+                ship_init_kwargs['target_reevaluation_seconds'] = data['target_reevaluation_seconds']
             
         elif side in ['ally','hostile']:
             # get kwargs meta data for squadron
@@ -1101,7 +1656,11 @@ class Game(object):
         
             # manually add hostile ship group to single AI hsip's kwargs        
             ship_init_kwargs['hostile_ships_group'] = groups['ships'][other_side] # only neede for AIShipSPrite
+            ship_init_kwargs['target_reevaluation_seconds'] = data['target_reevaluation_seconds'] # only neede for AIShipSPrite
 
+        # manually add the particle emitter for engine trails to kwargs
+        ship_init_kwargs['engine_trail_emitter'] = groups['particles']['any']
+        
         # manually add the sip_id to kwargs
         ship_id = self._get_ship_id(side,
                                     ship_no)
@@ -1117,8 +1676,9 @@ class Game(object):
         '''Util function that creates a surface with colored frame indicating
         ship allegiance, as well as the ship id.'''
         
-        # create ground surface
-        tracking_canvas = pg.image.load("./graphics/misc/frame_canvas.bmp")
+        # create ground surface; copy the shared canvas since we are drawing on it
+        tracking_canvas = self.assets.get_image("./graphics/misc/frame_canvas.bmp",
+                                                transparent_color = None).copy()
         
         # load appropriate frame image and blit to tracking canvas
         tracking_frame = level_meta_data['ship_frames'][side][0]
@@ -1127,9 +1687,12 @@ class Game(object):
         tracking_canvas.blit(tracking_frame,(10,10))
         
         # create text surface
-        largeText = pg.font.Font('freesansbold.ttf',12)
-        #largeText = pg.font.Font('./graphics/firefight-bb.regular.ttf',12)
-        text_surface = largeText.render(ship_id, False, (254,254,254))
+        text_surface = TEXT_CACHE.render(ship_id,
+                                         'freesansbold.ttf',
+                                         #'./graphics/firefight-bb.regular.ttf',
+                                         12,
+                                         (254,254,254),
+                                         antialias = False)
         
         # superimpose ship id label on ship frame surface
         tracking_canvas.blit(text_surface,(10,0))
@@ -1154,6 +1717,34 @@ class Game(object):
                      looping = True,
                      dynamic_angle = False)
         
+    def _get_id_card_center(self,
+                            side,
+                            ship_no):
+        '''Util function that returns the center of the specified side's ship_no-th
+        ship stats id card in the cockpit bars.'''
+        
+        # create side-> center_x mapping
+        side_center = {#'player':(1340,550),
+                       'player':(155,125),
+                    #'ally':(1340,125 + ship_no * 130),
+                    'ally':(155, 180 + (ship_no +1) * 130),
+                    #'hostile':(155,125 + ship_no * 130)}
+                    'hostile':(1340,100 + ship_no * 130)}
+        
+        return side_center[side]
+    
+    def _get_id_card_slot_count(self,
+                                side):
+        '''Util function that returns the number of ship stats id cards of the
+        specified side that fit into the cockpit bar.'''
+        
+        n_slots = 0
+        
+        while self._get_id_card_center(side, n_slots)[1] + 60 <= self.screen.get_height():
+            n_slots += 1
+            
+        return n_slots
+    
     def _create_ship_id_card(self,
                              side,
                              new_ship,
@@ -1168,16 +1759,15 @@ class Game(object):
         # get sprite group(s)
         ship_bio_group = level_sprite_groups['cockpit']['any']
         
-        # create side-> center_x mapping
-        side_center = {#'player':(1340,550),
-                       'player':(155,125),
-                    #'ally':(1340,125 + ship_no * 130),
-                    'ally':(155, 180 + (ship_no +1) * 130),
-                    #'hostile':(155,125 + ship_no * 130)}
-                    'hostile':(1340,100 + ship_no * 130)}
-        
         # get center coordinates for ship stats id card
-        center_pos = side_center[side]
+        center_pos = self._get_id_card_center(side,
+                                              ship_no)
+        
+        # ships of squadrons too large for the cockpit bar get a virtualized card via their squadron's panel
+        if side in self._squadron_panels:
+            self._squadron_panels[side].add_ship(new_ship)
+            
+            return
         
         # create the ship stats id card
         ShipBio(pilot_images,
@@ -1187,6 +1777,38 @@ class Game(object):
                  font='./graphics/firefight-bb.regular.ttf',
                  center = center_pos)
             
+    def _create_squadron_panel(self,
+                               side,
+                               level_meta_data,
+                               level_sprite_groups,
+                               focus_group = None):
+        '''Util function that creates the aggregated squadron panel for a squadron
+        with more ships than there are card slots in the cockpit bar. The panel takes the
+        first card slot and manages the ships' cards in the remaining ones.'''
+        
+        pilot_images = level_meta_data['pilot_images'][side]
+        
+        def create_card(ship,
+                        max_hit_points):
+            # virtualized cards are positioned and added to the cockpit group by the panel
+            return ShipBio(pilot_images,
+                           ship,
+                           side,
+                           [],
+                           font='./graphics/firefight-bb.regular.ttf',
+                           max_hit_points = max_hit_points)
+        
+        slot_centers = [self._get_id_card_center(side, slot_no) for slot_no in range(self._get_id_card_slot_count(side))]
+        
+        self._squadron_panels[side] = SquadronPanel(side,
+                                                    level_sprite_groups['cockpit']['any'],
+                                                    create_card,
+                                                    slot_centers[0],
+                                                    slot_centers[1:],
+                                                    AIShipSprite.TARGET_INDEX.get_engagement,
+                                                    focus_group = focus_group,
+                                                    font='./graphics/firefight-bb.regular.ttf')
+            
     def spawn_ship(self,
                    side,
                    ship_no,
@@ -1197,7 +1819,7 @@ class Game(object):
         specified initial values.'''
         
         # select initializer of appropriate sprite class
-        if side in ['ally','hostile']:
+        if side in ['ally','hostile'] or self.ai_player:
             Ship = AIShipSprite
         elif side == 'player':
             Ship = ShipSprite
@@ -1240,9 +1862,20 @@ class Game(object):
     def spawn_squadron(self,
                        side,
                        level_meta_data,
-                       level_sprite_groups):
+                       level_sprite_groups,
+                       focus_group = None):
         '''Util function that spawns a group of AIShipSprites for specified
-        side, with specified initial values.'''
+        side, with specified initial values. If the squadron has more ships than
+        the cockpit bar has room for cards, an aggregated squadron panel is shown
+        instead, with cards for the ships in focus_group (if specified) and the most
+        threatened ships.'''
+        
+        # large battles: aggregate squadron stats in a panel
+        if len(level_meta_data['ship_init_kwargs'][side]['center']) > self._get_id_card_slot_count(side):
+            self._create_squadron_panel(side,
+                                        level_meta_data,
+                                        level_sprite_groups,
+                                        focus_group = focus_group)
         
         # iterate over all ships in squadron and spawn
         for ship_index in range(len(level_meta_data['ship_init_kwargs'][side]['center'])):
@@ -1274,11 +1907,20 @@ class Game(object):
                                        text_groups=[level_sprite_groups['level_endings'][level_ending]])
         
 def main():
+    
+    parser = argparse.ArgumentParser(description = 'STAR WARS DOGFIGHTER')
+    parser.add_argument('--startup-trace', action = 'store_true',
+                        help = 'print the time taken by each boot phase until the welcome screen is interactive')
+    args = parser.parse_args()
+    
+    startup_trace = StartupTrace(t_launch = LAUNCH_TIME,
+                                 enabled = args.startup_trace)
+    
     # make sure directory is repo head
     os.chdir('..')
     
     
-    Game()
+    Game(startup_trace = startup_trace).play()
     
 if __name__=='__main__':
     main()
\ No newline at end of file
@@ -0,0 +1,105 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 23:21:09 2026
+
+@author: bettmensch
+"""
+
+'''This file contains the startup tracing classes used in the game STAR WARS DOGFIGHTER.
+It contains the StartupTrace class, which times the phases of the game's staged boot
+(imports, display, first frame, deferred initialization, ...) from launch to the
+interactive welcome screen, and prints the breakdown as one JSON object per phase
+followed by a summary against the startup budget. Enabled with the game's
+--startup-trace flag.'''
+
+import json
+import time
+
+class StartupTrace(object):
+    '''Times boot phases. Wrap each phase in start(phase) and stop(phase) calls and
+    call report once the game is interactive. While disabled, all calls return
+    immediately.'''
+
+    def __init__(self,
+                 t_launch = None,
+                 enabled = True,
+                 budget_seconds = 1):
+        '''Arguments:
+
+            t_launch: time.perf_counter() value taken as early as possible after launch.
+                    If specified, the time from launch until now is recorded as the
+                    'imports' phase. Defaults to now.
+            enabled: if not set, nothing is recorded or reported.
+            budget_seconds: time from launch to the interactive welcome screen that the
+                    summary compares against.'''
+
+        t_now = time.perf_counter()
+
+        if t_launch is None:
+            t_launch = t_now
+
+        self.enabled = enabled
+        self._t_launch = t_launch
+        self._budget_seconds = budget_seconds
+
+        # phases as (name, seconds, seconds since launch at end of phase) tuples, in order
+        self.phases = []
+        self._starts = {}
+        self._reported = False
+
+        if t_launch < t_now:
+            self._record('imports', t_launch, t_now)
+
+    def start(self,
+              phase):
+        '''Starts timing the named phase.'''
+
+        if not self.enabled:
+            return
+
+        self._starts[phase] = time.perf_counter()
+
+    def stop(self,
+             phase):
+        '''Stops timing the named phase and records it.'''
+
+        t_start = self._starts.pop(phase, None)
+
+        if not self.enabled or t_start is None:
+            return
+
+        self._record(phase, t_start, time.perf_counter())
+
+    def _record(self,
+                phase,
+                t_start,
+                t_stop):
+        '''Util function that records a phase timed from t_start to t_stop.'''
+
+        self.phases.append((phase, t_stop - t_start, t_stop - self._t_launch))
+
+    def get_seconds_since_launch(self):
+        '''Returns the seconds passed since launch.'''
+
+        return time.perf_counter() - self._t_launch
+
+    def report(self,
+               milestone = 'interactive'):
+        '''Prints the recorded phases and a summary with the time from launch until now,
+        labelled milestone. Only reports once.'''
+
+        if not self.enabled or self._reported:
+            return
+
+        self._reported = True
+
+        for phase, seconds, since_launch in self.phases:
+            print(json.dumps({'phase':phase,
+                              'ms':round(seconds * 1000, 2),
+                              'since_launch_ms':round(since_launch * 1000, 2)}))
+
+        seconds_since_launch = self.get_seconds_since_launch()
+
+        print(json.dumps({milestone + '_ms':round(seconds_since_launch * 1000, 2),
+                          'budget_ms':round(self._budget_seconds * 1000, 2),
+                          'within_budget':seconds_since_launch <= self._budget_seconds}))
@@ -0,0 +1,290 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 20:21:37 2026
+
+@author: bettmensch
+"""
+
+'''This file contains the target acquisition classes used in the game STAR WARS DOGFIGHTER.
+It contains the TargetIndex class, a uniform grid over the ships' centers that is
+rebuilt once per frame and answers the AI's target queries (nearest k hostiles,
+hostiles within a cone ahead, least engaged of a set of candidates) by only looking
+at the grid cells around the asking ship. Distances are measured in the 'donut
+topology' of BasicSprite.update_positional_attributes, i.e. a ship near the left
+cockpit bar is close to a ship near the right one, and the top and bottom screen
+edges are neighbours too.'''
+
+from math import cos, sin, pi, sqrt
+
+class TargetIndex(object):
+    '''Wrapped grid of ships, keyed by the pygame Group holding them. Call rebuild
+    once per frame, then query with the group holding the asking ship's hostiles.
+    Also keeps track of how many ships are currently targeting each ship.'''
+
+    def __init__(self,
+                 cell_size = 128):
+        '''Arguments:
+
+            cell_size: approximate side length of the grid cells in pixels. Cells are
+                    stretched slightly so that a whole number of them spans the screen.'''
+
+        self._cell_size = cell_size
+
+        self.clear()
+
+    def clear(self):
+        '''Discards all indexed ships and engagement counts.'''
+
+        # one grid per group, mapping cell coordinates to lists of (ship, x, y) tuples
+        self._grids = {}
+
+        # number of ships targeting each ship
+        self._engagements = {}
+
+        # wrapped playing field's dimensions in pixels and in cells; field_size is None
+        # until the first rebuild
+        self.field_size = None
+        self._field_w, self._field_h = 1, 1
+        self._n_cells_x, self._n_cells_y = 1, 1
+        self._cell_w, self._cell_h = 1, 1
+
+    def rebuild(self,
+                ship_groups,
+                screen_size,
+                buffer):
+        '''Rebuilds the index from the iterable ship_groups of pygame Groups holding
+        ships, e.g. the allied and the hostile ships group.
+
+            screen_size: (width, height) of the main screen in pixels.
+            buffer: width of the cockpit bars on either side of the screen. Sprites wrap
+                    horizontally at the inner edges of the cockpit bars.'''
+
+        # get wrapped playing field and cell dimensions
+        screen_w, screen_h = screen_size
+        self._buffer = buffer
+        self._field_w = max(screen_w - 2 * buffer, 1)
+        self._field_h = max(screen_h, 1)
+        self._n_cells_x = max(int(self._field_w // self._cell_size), 1)
+        self._n_cells_y = max(int(self._field_h // self._cell_size), 1)
+        self._cell_w = self._field_w / self._n_cells_x
+        self._cell_h = self._field_h / self._n_cells_y
+        self.field_size = (self._field_w, self._field_h)
+
+        self._grids = {}
+        self._engagements = {}
+
+        for ship_group in ship_groups:
+            grid = {}
+
+            for ship in ship_group.sprites():
+                x, y = self._get_position(ship)
+                cell = self._get_cell(x, y)
+
+                if cell in grid:
+                    grid[cell].append((ship, x, y))
+                else:
+                    grid[cell] = [(ship, x, y)]
+
+                # count the ship's engagement of its current target
+                for target in ship._current_target.spritedict:
+                    self._engagements[target] = self._engagements.get(target, 0) + 1
+
+            self._grids[ship_group] = grid
+
+    def _get_position(self,
+                      ship):
+        '''Util function that returns the ship's center in playing field coordinates,
+        wrapped into [0, field width) x [0, field height).'''
+
+        return ((float(ship._center[0]) - self._buffer) % self._field_w,
+                float(ship._center[1]) % self._field_h)
+
+    def _get_cell(self,
+                  x,
+                  y):
+        '''Util function that returns the coordinates of the grid cell holding the
+        position (x, y) in playing field coordinates.'''
+
+        return (min(int(x / self._cell_w), self._n_cells_x - 1),
+                min(int(y / self._cell_h), self._n_cells_y - 1))
+
+    def _get_offset(self,
+                    x_from,
+                    y_from,
+                    x_to,
+                    y_to):
+        '''Util function that returns the shortest vector from one position to the
+        other across the wrapped edges of the playing field.'''
+
+        field_w, field_h = self._field_w, self._field_h
+
+        dx = (x_to - x_from + field_w / 2) % field_w - field_w / 2
+        dy = (y_to - y_from + field_h / 2) % field_h - field_h / 2
+
+        return dx, dy
+
+    def get_offset(self,
+                   ship,
+                   other_ship):
+        '''Returns the shortest vector from the passed ship's center to the other ship's
+        center across the wrapped edges of the playing field, i.e. the direction to fly
+        in to reach the other ship the way the index measures distances. Returns the
+        plain difference of the centers if the index has not been rebuilt yet.'''
+
+        dx = float(other_ship._center[0]) - float(ship._center[0])
+        dy = float(other_ship._center[1]) - float(ship._center[1])
+
+        if self.field_size is None:
+            return dx, dy
+
+        return self._get_offset(0, 0, dx, dy)
+
+    def _get_ring(self,
+                  cell,
+                  radius):
+        '''Util function that returns the set of wrapped cells at chebyshev distance
+        radius from the passed cell. Cells can wrap onto themselves on small grids,
+        hence a set.'''
+
+        x_cell, y_cell = cell
+        n_x, n_y = self._n_cells_x, self._n_cells_y
+
+        if radius == 0:
+            return set([cell])
+
+        ring = set()
+
+        for i in range(-radius, radius + 1):
+            ring.add(((x_cell + i) % n_x, (y_cell - radius) % n_y))
+            ring.add(((x_cell + i) % n_x, (y_cell + radius) % n_y))
+            ring.add(((x_cell - radius) % n_x, (y_cell + i) % n_y))
+            ring.add(((x_cell + radius) % n_x, (y_cell + i) % n_y))
+
+        return ring
+
+    def _iterate_rings(self,
+                       ship):
+        '''Util generator that yields (ring radius, set of cells, x, y) for growing
+        rings of not yet visited cells around the passed ship, until the whole grid was
+        visited. x, y is the passed ship's position in playing field coordinates.'''
+
+        x, y = self._get_position(ship)
+        cell = self._get_cell(x, y)
+        visited = set()
+        max_radius = max(self._n_cells_x, self._n_cells_y) // 2 + 1
+
+        for radius in range(max_radius + 1):
+            ring = self._get_ring(cell, radius) - visited
+            visited |= ring
+
+            yield radius, ring, x, y
+
+    def get_nearest(self,
+                    ship,
+                    ship_group,
+                    k = 1):
+        '''Returns a list of up to k (ship, distance) tuples of the ships in ship_group
+        closest to the passed ship, ordered by distance. Returns None if ship_group
+        was not indexed by the last rebuild.'''
+
+        grid = self._grids.get(ship_group)
+
+        if grid is None:
+            return None
+
+        candidates = []
+        min_cell_side = min(self._cell_w, self._cell_h)
+
+        for radius, ring, x, y in self._iterate_rings(ship):
+            for cell in ring:
+                for other_ship, x_other, y_other in grid.get(cell, ()):
+                    if other_ship is ship:
+                        continue
+
+                    dx, dy = self._get_offset(x, y, x_other, y_other)
+                    candidates.append((other_ship, sqrt(dx * dx + dy * dy)))
+
+            # ships in cells further out are at least radius cell sides away
+            if len(candidates) >= k:
+                candidates.sort(key = lambda candidate: candidate[1])
+
+                if candidates[k-1][1] <= radius * min_cell_side:
+                    break
+
+        candidates.sort(key = lambda candidate: candidate[1])
+
+        return candidates[:k]
+
+    def get_within_cone(self,
+                        ship,
+                        ship_group,
+                        cone_cosine,
+                        max_range):
+        '''Returns a list of (ship, distance) tuples of the ships in ship_group within
+        max_range pixels of the passed ship and inside the cone around its direction of
+        flight whose half angle has the cosine cone_cosine, ordered by distance. Returns
+        None if ship_group was not indexed by the last rebuild.'''
+
+        grid = self._grids.get(ship_group)
+
+        if grid is None:
+            return None
+
+        # get own unit directional vector; in pygame coordinates, the y-axis has negative orientation
+        angle_radian = ship._angle * pi / 180
+        x_direction, y_direction = cos(angle_radian), -sin(angle_radian)
+
+        candidates = []
+        max_radius = int(max_range // min(self._cell_w, self._cell_h)) + 1
+
+        for radius, ring, x, y in self._iterate_rings(ship):
+            if radius > max_radius:
+                break
+
+            for cell in ring:
+                for other_ship, x_other, y_other in grid.get(cell, ()):
+                    if other_ship is ship:
+                        continue
+
+                    dx, dy = self._get_offset(x, y, x_other, y_other)
+                    distance = sqrt(dx * dx + dy * dy)
+
+                    if 0 < distance <= max_range and (x_direction * dx + y_direction * dy) >= cone_cosine * distance:
+                        candidates.append((other_ship, distance))
+
+        candidates.sort(key = lambda candidate: candidate[1])
+
+        return candidates
+
+    def get_least_engaged(self,
+                          candidates):
+        '''Returns the ship from the list of (ship, distance) tuples that is targeted
+        by the fewest ships, the closest one in case of a tie. Returns None if there
+        are no candidates.'''
+
+        if not candidates:
+            return None
+
+        engagements = self._engagements
+
+        return min(candidates, key = lambda candidate: (engagements.get(candidate[0], 0), candidate[1]))[0]
+
+    def get_engagement(self,
+                       ship):
+        '''Returns the number of ships currently targeting the passed ship.'''
+
+        return self._engagements.get(ship, 0)
+
+    def engage(self,
+               target):
+        '''Records that one more ship targets the passed ship, so that ships picking
+        targets later in the same frame see it.'''
+
+        self._engagements[target] = self._engagements.get(target, 0) + 1
+
+    def disengage(self,
+                  target):
+        '''Records that one ship fewer targets the passed ship.'''
+
+        if self._engagements.get(target, 0) > 0:
+            self._engagements[target] -= 1
@@ -0,0 +1,79 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 20:48:19 2026
+
+@author: bettmensch
+"""
+
+'''This file contains the small vector helpers used in the game STAR WARS DOGFIGHTER.
+Per sprite transforms (velocity vectors, rotated gun and engine offsets, interpolated
+positions) only ever deal with a single 2-dim point. At that size, building numpy arrays
+and rotation matrices costs far more than the arithmetic itself, so these helpers work
+on plain (x, y) tuples and floats instead. numpy stays in use for the bulk paths (the
+kinematics store, particles, radar).
+
+All angles are in degrees and follow the sprites' convention: counter-clockwise, with
+the y-axis of pygame's screen coordinates pointing down.'''
+
+from math import cos, sin, pi, sqrt
+
+DEGREES_TO_RADIAN = pi / 180
+
+def get_direction(angle):
+    '''Returns the (x, y) unit vector pointing in the direction of angle.'''
+
+    radian_angle = angle * DEGREES_TO_RADIAN
+
+    # in pygame coordinates, the y-axis has negative orientation
+    return cos(radian_angle), -sin(radian_angle)
+
+def get_velocity(angle,
+                 speed):
+    '''Returns the (x, y) velocity vector of something moving in the direction of
+    angle at the specified speed.'''
+
+    radian_angle = angle * DEGREES_TO_RADIAN
+
+    return speed * cos(radian_angle), -speed * sin(radian_angle)
+
+def rotate(vector,
+           angle):
+    '''Returns the (x, y) vector rotated counter-clockwise by angle, i.e. a sprite
+    frame offset rotated along with a sprite turned to angle.'''
+
+    radian_angle = angle * DEGREES_TO_RADIAN
+    cos_angle, sin_angle = cos(radian_angle), sin(radian_angle)
+    x, y = vector
+
+    return cos_angle * x + sin_angle * y, cos_angle * y - sin_angle * x
+
+def add(vector_1,
+        vector_2):
+    '''Returns the sum of two (x, y) vectors.'''
+
+    return vector_1[0] + vector_2[0], vector_1[1] + vector_2[1]
+
+def subtract(vector_1,
+             vector_2):
+    '''Returns vector_1 - vector_2 for two (x, y) vectors.'''
+
+    return vector_1[0] - vector_2[0], vector_1[1] - vector_2[1]
+
+def dot(vector_1,
+        vector_2):
+    '''Returns the dot product of two (x, y) vectors.'''
+
+    return vector_1[0] * vector_2[0] + vector_1[1] * vector_2[1]
+
+def get_length(vector):
+    '''Returns the euclidean length of an (x, y) vector.'''
+
+    return sqrt(vector[0] * vector[0] + vector[1] * vector[1])
+
+def interpolate(vector_1,
+                vector_2,
+                alpha):
+    '''Returns the point a share alpha of the way from vector_1 to vector_2.'''
+
+    return (vector_1[0] + alpha * (vector_2[0] - vector_1[0]),
+            vector_1[1] + alpha * (vector_2[1] - vector_1[1]))
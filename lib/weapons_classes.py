@@ -11,9 +11,9 @@ representing laser beams (and possibly other projectiles in the future).'''
 
 from animation_classes import TrackingAnimation
 from basic_sprite_classes import BasicSprite
-from math import sin,cos,pi
+from pool_classes import SpritePool
+from vector_math import rotate, add
 
-import pygame as pg
 import numpy as np
 
 class ProjectileSprite(BasicSprite):
@@ -82,6 +82,9 @@ class ProjectileSprite(BasicSprite):
         # if life time is over, terminate MissileSprite
         if self.frames_passed > self._lifetime_in_frames:
             self.kill()
+            
+# process-wide pool for projectiles
+ProjectileSprite.POOL = SpritePool(ProjectileSprite)
 
 
 class LaserCannon(object):
@@ -91,6 +94,9 @@ class LaserCannon(object):
     class. It can check whether it's ready to fire based on an individual firing rate,
     creates the laser beam and the muzzle flash animation.'''
     
+    # cleared by the game's quality controller to skip muzzle flashes when frames take too long
+    MUZZLE_FLASHES = True
+    
     def __init__(self,
                  ship_sprite=None,
                  cannon_offset=None,
@@ -128,7 +134,7 @@ class LaserCannon(object):
         self._laser_beam_group = cannon_projectile_group
         
         # attach mechanic weapon specs
-        self._offset = np.array(cannon_offset)
+        self._offset = tuple(np.array(cannon_offset,dtype='float').tolist()) # plain floats for per shot math
         self._rate_of_fire = cannon_fire_rate
         self._range_in_seconds = cannon_range_in_seconds
         self._projectile_speed_in_seconds = cannon_projectile_speed_in_seconds
@@ -141,30 +147,24 @@ class LaserCannon(object):
         self._muzzle_flash_spi = muzzle_flash_animation_spi
         
         # initialize time of last shot that weapon is ready after initializion
-        self._time_of_last_shot = pg.time.get_ticks() - 1005 / cannon_fire_rate # 1005 -> milliseconds unit and + epsilon
+        self._time_of_last_shot = self._ship.CLOCK.get_ticks() - 1005 / cannon_fire_rate # 1005 -> milliseconds unit and + epsilon
         
     def is_ready(self):
         '''Util function called from ship to assess weapon state. Return True if 
         ready to fire, else False.'''
         
-        return (pg.time.get_ticks() - self._time_of_last_shot) > 1000 / self._rate_of_fire
+        return (self._ship.CLOCK.get_ticks() - self._time_of_last_shot) > 1000 / self._rate_of_fire
     
     def get_laser_beam_positions(self):
         '''Calculates the coordinates of the ship sprite's gun tips w.r.t the main
-        game screen's coordinate system as a 2x1 array. Also calculates the rotated
+        game screen's coordinate system as an (x, y) tuple. Also calculates the rotated
         offset (based on ship sprite's current angle) w.r.t ship sprite's image's 
         center.'''
         
-        # convert ship's current angle to radian
-        radian_angle = self._ship._angle * pi / 180
-        
-        # get rotation matrix for radian angle
-        rotation_matrix = np.array([[cos(radian_angle), sin(radian_angle)],
-                                   [- sin(radian_angle), cos(radian_angle)]])
-            
-        # rotate offsets and add to ship's center
-        rotated_position = np.dot(rotation_matrix,
-                                  self._offset.T).T + self._ship._center
+        # rotate offset and add to ship's center
+        rotated_position = add(rotate(self._offset,
+                                      self._ship._angle),
+                               self._ship._center.tolist())
         
         return rotated_position
     
@@ -177,16 +177,17 @@ class LaserCannon(object):
         laser_beam_position = self.get_laser_beam_positions()
         
         # create muzzle flash
-        TrackingAnimation(self._ship._fps,
-                          self._ship._screen,
-                          self._original_muzzle_flash_images,
-                          self._muzzle_flash_spi,
-                          self._ship,
-                          self._offset,
-                          [self._laser_beam_group])
+        if LaserCannon.MUZZLE_FLASHES:
+            TrackingAnimation.POOL.acquire(self._ship._fps,
+                              self._ship._screen,
+                              self._original_muzzle_flash_images,
+                              self._muzzle_flash_spi,
+                              self._ship,
+                              self._offset,
+                              [self._laser_beam_group])
         
         # create laser beam
-        ProjectileSprite(self._ship._fps,
+        ProjectileSprite.POOL.acquire(self._ship._fps,
                       self._ship._screen,
                      self._original_laser_beam_images,
                      self._range_in_seconds,
@@ -196,4 +197,4 @@ class LaserCannon(object):
                      speed = self._ship._speed * self._ship._fps + self._projectile_speed_in_seconds)
         
         # update time of last shot attribute
-        self._time_of_last_shot = pg.time.get_ticks()
\ No newline at end of file
+        self._time_of_last_shot = self._ship.CLOCK.get_ticks()
\ No newline at end of file
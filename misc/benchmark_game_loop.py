@@ -0,0 +1,256 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 18:52:36 2026
+
+@author: bettmensch
+"""
+
+'''Benchmark suite for the main game loop of the game STAR WARS DOGFIGHTER. Runs a set of
+scripted scenarios on SDL's dummy video and audio drivers and times the game's
+update_game_state, draw_game_state and handle_collisions methods separately for every
+frame. Scenarios:
+
+    - one_ship: the player ship on its own
+    - 2v2: player and one ally vs two hostiles, taken from the level data
+    - 20v20, 50v50, 100v100: player and allies vs hostiles in formation, with every
+      ship firing continuously and enough hit points to survive the whole run
+
+Prints one JSON object per scenario with per phase timing percentiles (in milliseconds),
+sprite counts per group at the end of the run and peak memory. Run from the repo head:
+
+    python ./misc/benchmark_game_loop.py [--frames N] [--scenarios one_ship 20v20 ...]
+                                         [--dirty-rendering] [--vectorized-kinematics]
+                                         [--trace-memory]'''
+
+import os
+import sys
+import copy
+import json
+import time
+import random
+import argparse
+import tracemalloc
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)),'..','lib'))
+
+try:
+    import resource
+except ImportError:
+    # not available on windows
+    resource = None
+
+import numpy as np
+
+from star_wars_dogfighter import Game
+from basic_sprite_classes import BasicSprite
+from animation_classes import BasicAnimation, TrackingAnimation
+from weapons_classes import ProjectileSprite
+from sprite_classes import AIShipSprite
+from kinematics_classes import KinematicsStore
+from render_classes import DirtyRectRenderer
+from clock_classes import WallClock
+
+SCENARIOS = ['one_ship','2v2','20v20','50v50','100v100']
+
+def get_formation_kwargs(n_ships,
+                         x_range,
+                         y_range,
+                         angle,
+                         hit_points):
+    '''Returns the ship_init_kwargs dictionary of lists for a squadron of n_ships
+    ships lined up in columns within the specified screen area.'''
+
+    n_rows = int(np.ceil(np.sqrt(n_ships)))
+    n_columns = int(np.ceil(n_ships / n_rows))
+
+    xs = np.linspace(x_range[0], x_range[1], n_columns)
+    ys = np.linspace(y_range[0], y_range[1], n_rows)
+
+    centers = [(float(xs[i // n_rows]), float(ys[i % n_rows])) for i in range(n_ships)]
+
+    return {'center':centers,
+            'angle':[angle] * n_ships,
+            'speed':[150] * n_ships,
+            'd_angle_degrees_per_second':[120] * n_ships,
+            'd_speed_pixel_per_second':[20] * n_ships,
+            'max_speed_pixel_per_second':[250] * n_ships,
+            'hit_points':[hit_points] * n_ships}
+
+def get_level_specs(game,
+                    scenario):
+    '''Returns a level specs dictionary (as in game_level_meta_data.yaml) for the
+    specified scenario, and a flag indicating whether all ships fire continuously.'''
+
+    if scenario == 'one_ship':
+        level_specs = copy.deepcopy(game.level_meta_data[0])
+        level_specs['hostile']['ship_init_kwargs'] = dict([(key,[]) for key in level_specs['hostile']['ship_init_kwargs']])
+
+        return level_specs, False
+
+    if scenario == '2v2':
+        level_specs = copy.deepcopy(game.level_meta_data[2])
+        level_specs['hostile']['ship_init_kwargs'] = dict([(key,value[:2]) for (key,value) in level_specs['hostile']['ship_init_kwargs'].items()])
+
+        return level_specs, False
+
+    # large battles: player plus n - 1 allies vs n hostiles
+    n_ships = int(scenario.split('v')[0])
+    hit_points = 10 ** 6
+
+    level_specs = copy.deepcopy(game.level_meta_data[5])
+    level_specs['player']['ship_init_kwargs']['hit_points'] = hit_points
+    level_specs['ally']['ship_init_kwargs'] = get_formation_kwargs(n_ships - 1, (320,600), (40,660), 0, hit_points)
+    level_specs['hostile']['ship_init_kwargs'] = get_formation_kwargs(n_ships, (900,1180), (40,660), 180, hit_points)
+
+    return level_specs, True
+
+def get_percentiles(durations):
+    '''Returns a dictionary of timing statistics in milliseconds.'''
+
+    durations = np.array(durations) * 1000
+
+    return {'mean':float(np.mean(durations)),
+            'p50':float(np.percentile(durations,50)),
+            'p90':float(np.percentile(durations,90)),
+            'p99':float(np.percentile(durations,99)),
+            'max':float(np.max(durations)),
+            'total':float(np.sum(durations))}
+
+def get_sprite_counts(level_sprite_groups):
+    '''Returns the number of sprites in each of the level's sprite groups.'''
+
+    return {'ships':len(level_sprite_groups['ships']['any']),
+            'lasers_ally':len(level_sprite_groups['lasers']['ally']),
+            'lasers_hostile':len(level_sprite_groups['lasers']['hostile']),
+            'non_colliders':len(level_sprite_groups['non_colliders']['any']),
+            'particles':len(level_sprite_groups['particles']['any']),
+            'cockpit':len(level_sprite_groups['cockpit']['any'])}
+
+def fire_continuously(ship):
+    '''Replaces the ship's gunner logic with a gunner that always wants to fire.'''
+
+    def set_gunner_commands():
+        ship._command_to_fire = True
+
+    ship.set_gunner_commands = set_gunner_commands
+
+def run_scenario(game,
+                 scenario,
+                 n_frames,
+                 trace_memory = False):
+    '''Sets up and runs the specified scenario for n_frames frames. Returns a
+    dictionary of results.'''
+
+    random.seed(0)
+
+    level_specs, all_firing = get_level_specs(game,
+                                              scenario)
+
+    if trace_memory:
+        tracemalloc.start()
+
+    # set up level like Game.start_level does
+    level_meta_data = game._collect_meta_data_for_level('rebel',
+                                                        'empire',
+                                                        5,
+                                                        level_specs)
+    level_sprite_groups = game._collect_sprite_groups_for_level()
+
+    if game.vectorized_kinematics:
+        game.kinematics = KinematicsStore(game.screen.get_size(),
+                                          BasicSprite.COCKPIT_BAR_WIDTH)
+        BasicSprite.KINEMATICS_STORE = game.kinematics
+
+    game.simulation_clock.reset()
+    BasicSprite.CLOCK = game.simulation_clock
+
+    game._add_sprites_to_groups_for_level(level_meta_data,
+                                          level_sprite_groups)
+
+    if all_firing:
+        for ship in level_sprite_groups['ships']['any'].sprites():
+            fire_continuously(ship)
+
+    if game.dirty_rendering:
+        game.renderer = DirtyRectRenderer(game.screen,
+                                          game.background_image,
+                                          overlay_image = game.cockpit_frame)
+
+    # run and time phases
+    durations = {'update':[],'draw':[],'collisions':[],'frame':[]}
+
+    for frame_index in range(n_frames):
+        t_0 = time.perf_counter()
+        game.update_game_state(level_sprite_groups)
+        t_1 = time.perf_counter()
+        game.draw_game_state(level_sprite_groups,
+                             'ongoing')
+        t_2 = time.perf_counter()
+        game.handle_collisions(level_meta_data,
+                               level_sprite_groups,
+                               False)
+        game.sound_mixer.end_frame()
+        t_3 = time.perf_counter()
+
+        game.simulation_clock.advance()
+
+        durations['update'].append(t_1 - t_0)
+        durations['draw'].append(t_2 - t_1)
+        durations['collisions'].append(t_3 - t_2)
+        durations['frame'].append(t_3 - t_0)
+
+    results = {'scenario':scenario,
+               'frames':n_frames,
+               'dirty_rendering':game.dirty_rendering,
+               'vectorized_kinematics':game.vectorized_kinematics,
+               'timings_ms':dict([(phase,get_percentiles(phase_durations)) for (phase,phase_durations) in durations.items()]),
+               'sprite_counts':get_sprite_counts(level_sprite_groups),
+               'pools':{'BasicAnimation':BasicAnimation.POOL.get_stats(),
+                        'TrackingAnimation':TrackingAnimation.POOL.get_stats(),
+                        'ProjectileSprite':ProjectileSprite.POOL.get_stats()},
+               'sound_mixer':game.sound_mixer.get_stats()}
+
+    # peak memory; resident set size is a high water mark for the whole process
+    if trace_memory:
+        results['peak_traced_kb'] = tracemalloc.get_traced_memory()[1] // 1024
+        tracemalloc.stop()
+
+    if resource is not None:
+        results['peak_rss_kb'] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    # tear down level
+    for sprite_pool in (BasicAnimation.POOL, TrackingAnimation.POOL, ProjectileSprite.POOL):
+        sprite_pool.release_all()
+
+    AIShipSprite.RADAR.clear()
+    AIShipSprite.TARGET_INDEX.clear()
+    BasicSprite.KINEMATICS_STORE = game.kinematics = None
+    BasicSprite.CLOCK = WallClock()
+    game.renderer = None
+
+    return results
+
+def main():
+
+    parser = argparse.ArgumentParser(description = 'Benchmark the STAR WARS DOGFIGHTER game loop.')
+    parser.add_argument('--frames', type = int, default = 300)
+    parser.add_argument('--scenarios', nargs = '+', choices = SCENARIOS, default = SCENARIOS)
+    parser.add_argument('--dirty-rendering', action = 'store_true')
+    parser.add_argument('--vectorized-kinematics', action = 'store_true')
+    parser.add_argument('--trace-memory', action = 'store_true',
+                        help = 'also report peak python heap use; slows down the timed frames')
+    args = parser.parse_args()
+
+    game = Game(game_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)),'..'),
+                headless = True,
+                dirty_rendering = args.dirty_rendering,
+                vectorized_kinematics = args.vectorized_kinematics)
+
+    for scenario in args.scenarios:
+        print(json.dumps(run_scenario(game,
+                                      scenario,
+                                      args.frames,
+                                      trace_memory = args.trace_memory)))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,175 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 21:07:52 2026
+
+@author: bettmensch
+"""
+
+'''Microbenchmarks for the per sprite vector math of the game STAR WARS DOGFIGHTER.
+Times the tuple based helpers of vector_math against the numpy based calculations they
+replaced (velocity vector, rotated gun/engine offset, gun tip position, radar projection,
+interpolated position), and a degree indexed sin/cos lookup table against calling math's
+sin and cos directly. Prints one JSON object per case with the time per call in
+nanoseconds. Run from the repo head:
+
+    python ./misc/benchmark_vector_math.py [--calls N]'''
+
+import os
+import sys
+import json
+import timeit
+import argparse
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)),'..','lib'))
+
+from math import cos, sin, pi
+
+import numpy as np
+
+import vector_math
+
+# ---- numpy based reference implementations, as previously used per sprite ----
+def numpy_velocity(angle,
+                   speed):
+
+    radian_angle = angle * pi / 180
+
+    velocity = speed * np.array([cos(radian_angle),
+                                 -sin(radian_angle)]).reshape((1,2))
+
+    return velocity.reshape(2)
+
+def numpy_rotate(offset,
+                 angle):
+
+    radian_angle = angle * pi / 180
+
+    rotation_matrix = np.array([[cos(radian_angle), sin(radian_angle)],
+                                [- sin(radian_angle), cos(radian_angle)]])
+
+    return np.dot(rotation_matrix,
+                  offset.T).T.reshape(2,)
+
+def numpy_gun_tip(offset,
+                  angle,
+                  center):
+
+    return numpy_rotate(offset, angle) + center
+
+def numpy_projection(angle,
+                     center,
+                     target_center):
+
+    angle_radian = angle * pi / 180
+    unit_direction = np.array([cos(angle_radian),
+                               -sin(angle_radian)])
+    clockwise_ortnorm_direction = np.array([unit_direction[1],
+                                            -unit_direction[0]])
+    towards_target_vector = target_center - center
+    unit_towards_target_vector = towards_target_vector / np.linalg.norm(towards_target_vector)
+
+    return np.dot(clockwise_ortnorm_direction,
+                  unit_towards_target_vector)
+
+def numpy_interpolate(previous_center,
+                      step_center,
+                      alpha):
+
+    delta = step_center - previous_center
+
+    return previous_center + alpha * delta
+
+# ---- tuple based versions, as now used per sprite ----
+def tuple_gun_tip(offset,
+                  angle,
+                  center):
+
+    return vector_math.add(vector_math.rotate(offset, angle),
+                           center.tolist())
+
+def tuple_projection(angle,
+                     center,
+                     target_center):
+
+    unit_direction = vector_math.get_direction(angle)
+    towards_target_vector = vector_math.subtract(target_center.tolist(),
+                                                 center.tolist())
+
+    return vector_math.dot((unit_direction[1], -unit_direction[0]),
+                           towards_target_vector) / vector_math.get_length(towards_target_vector)
+
+def tuple_interpolate(previous_center,
+                      step_center,
+                      alpha):
+
+    return vector_math.interpolate(previous_center.tolist(),
+                                   step_center.tolist(),
+                                   alpha)
+
+# ---- sin/cos lookup table with 0.1 degree resolution ----
+TABLE_STEPS_PER_DEGREE = 10
+TABLE_SIZE = 360 * TABLE_STEPS_PER_DEGREE
+SIN_TABLE = [sin(i * pi / (180 * TABLE_STEPS_PER_DEGREE)) for i in range(TABLE_SIZE)]
+COS_TABLE = [cos(i * pi / (180 * TABLE_STEPS_PER_DEGREE)) for i in range(TABLE_SIZE)]
+
+def table_cos_sin(angle):
+
+    index = int(round(angle * TABLE_STEPS_PER_DEGREE)) % TABLE_SIZE
+
+    return COS_TABLE[index], SIN_TABLE[index]
+
+def math_cos_sin(angle):
+
+    radian_angle = angle * pi / 180
+
+    return cos(radian_angle), sin(radian_angle)
+
+def get_cases():
+    '''Returns a list of (case name, baseline function, baseline name, new function, new
+    name, arguments) tuples.'''
+
+    angle, speed, alpha = 725.0, 12.5, 0.4
+    center = np.array([640.5, 210.25])
+    target_center = np.array([300.0, 500.0])
+    offset = np.array([12.0, -8.0])
+    offset_tuple = tuple(offset.tolist())
+
+    return [('velocity_vector', numpy_velocity, 'numpy', vector_math.get_velocity, 'tuple', (angle, speed)),
+            ('rotated_offset', numpy_rotate, 'numpy', vector_math.rotate, 'tuple', ((offset, angle), (offset_tuple, angle))),
+            ('gun_tip_position', numpy_gun_tip, 'numpy', tuple_gun_tip, 'tuple', ((offset, angle, center), (offset_tuple, angle, center))),
+            ('radar_projection', numpy_projection, 'numpy', tuple_projection, 'tuple', (angle, center, target_center)),
+            ('interpolated_center', numpy_interpolate, 'numpy', tuple_interpolate, 'tuple', (center, target_center, alpha)),
+            ('cos_sin', math_cos_sin, 'math', table_cos_sin, 'table', (angle,))]
+
+def time_call(function,
+              args,
+              n_calls):
+    '''Returns the best time per call in nanoseconds over five repeats.'''
+
+    best = min(timeit.repeat(lambda: function(*args), number = n_calls, repeat = 5))
+
+    return best / n_calls * 10 ** 9
+
+def main():
+
+    parser = argparse.ArgumentParser(description = 'Benchmark the STAR WARS DOGFIGHTER per sprite vector math.')
+    parser.add_argument('--calls', type = int, default = 100000)
+    args = parser.parse_args()
+
+    for case_name, baseline, baseline_name, new, new_name, case_args in get_cases():
+        # cases whose versions take differently typed arguments hold one argument tuple each
+        if isinstance(case_args[0], tuple):
+            baseline_args, new_args = case_args
+        else:
+            baseline_args = new_args = case_args
+
+        baseline_ns = time_call(baseline, baseline_args, args.calls)
+        new_ns = time_call(new, new_args, args.calls)
+
+        print(json.dumps({'case':case_name,
+                          baseline_name + '_ns':round(baseline_ns, 1),
+                          new_name + '_ns':round(new_ns, 1),
+                          'speedup':round(baseline_ns / new_ns, 2)}))
+
+if __name__ == '__main__':
+    main()
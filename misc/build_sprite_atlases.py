@@ -0,0 +1,58 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 22:58:41 2026
+
+@author: bettmensch
+"""
+
+'''Builds the sprite atlases of the game STAR WARS DOGFIGHTER: packs the images of each
+animation family and all sprite skins referred to in the animations and skins meta data
+into one atlas per family, written to ./graphics/atlas together with the atlas index.
+Rerun after changing any of the packed images or their meta data; until then, the game
+keeps showing the images as they were packed. Prints one JSON object per atlas and a
+summary. Run from the repo head:
+
+    python ./misc/build_sprite_atlases.py'''
+
+import os
+import sys
+import json
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)),'..','lib'))
+
+from meta_data_classes import MetaDataLoader
+from atlas_classes import AtlasBuilder, get_atlas_families, get_entry_path
+
+def main():
+
+    os.chdir(os.path.join(os.path.dirname(os.path.abspath(__file__)),'..'))
+
+    meta_data = MetaDataLoader('./meta').load()
+
+    families = get_atlas_families(meta_data['animations_meta_data'],
+                                  meta_data['sprite_skins_meta_data'])
+
+    index = AtlasBuilder('./graphics').build(families)
+
+    n_files, source_bytes, atlas_bytes = 0, 0, 0
+
+    for atlas_name, atlas in sorted(index['atlases'].items()):
+        atlas_size = os.path.getsize(os.path.join('./graphics/atlas', atlas['image']))
+        entries_size = sum([os.path.getsize(get_entry_path('./graphics', entry)) for entry in atlas['entries']])
+
+        print(json.dumps({'atlas':atlas_name,
+                          'entries':len(atlas['entries']),
+                          'source_bytes':entries_size,
+                          'atlas_bytes':atlas_size}))
+
+        n_files += len(atlas['entries'])
+        source_bytes += entries_size
+        atlas_bytes += atlas_size
+
+    print(json.dumps({'atlases':len(index['atlases']),
+                      'source_files':n_files,
+                      'source_bytes':source_bytes,
+                      'atlas_bytes':atlas_bytes}))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,122 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 23:58:41 2026
+
+@author: bettmensch
+"""
+
+'''Checks that the AI ships of the game STAR WARS DOGFIGHTER re-evaluate their targets at
+the level's target re-evaluation interval, including the hostiles, which already get a
+target when they are spawned. Runs a level headless for a few re-evaluation intervals and
+checks that every AI ship spawned with a target has recorded when it acquired it, and
+after every simulation step that no AI ship has kept its target for longer than the
+interval. Prints one JSON object per side and exits with status 1 if any ship has.
+Run from the repo head:
+
+    python ./misc/check_target_reevaluation.py [level_index] [n_intervals]'''
+
+import os
+import sys
+import json
+import random
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)),'..','lib'))
+
+from star_wars_dogfighter import Game
+from basic_sprite_classes import BasicSprite
+from animation_classes import BasicAnimation, TrackingAnimation
+from weapons_classes import ProjectileSprite
+from sprite_classes import AIShipSprite
+from clock_classes import WallClock
+
+def main(level_index = 3,
+         n_intervals = 5):
+
+    game = Game(game_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)),'..'),
+                headless = True)
+
+    random.seed(0)
+
+    # set up level like Game.simulate_level does, with AI ships only
+    level_meta_data = game._collect_meta_data_for_level('rebel',
+                                                        'empire',
+                                                        level_index,
+                                                        game.level_meta_data[level_index])
+    level_sprite_groups = game._collect_sprite_groups_for_level()
+
+    game.simulation_clock.reset()
+    BasicSprite.CLOCK = game.simulation_clock
+
+    game.ai_player = True
+    game._add_sprites_to_groups_for_level(level_meta_data,
+                                          level_sprite_groups)
+    game.ai_player = False
+
+    reevaluation_seconds = level_meta_data['target_reevaluation_seconds']
+    n_steps = int(n_intervals * reevaluation_seconds * game.fps)
+
+    # a target may be kept for the interval plus the step it is noticed in
+    max_ticks = 1000 * (reevaluation_seconds + game.simulation_clock.step_seconds)
+
+    results = {}
+
+    for side in ('ally','hostile'):
+        ships = [ship for ship in level_sprite_groups['ships'][side] if isinstance(ship, AIShipSprite)]
+        results[side] = {'ships':len(ships),
+                         'acquisitions':dict([(ship, 0) for ship in ships]),
+                         'last_acquisitions':dict([(ship, ship._time_of_target_acquisition) for ship in ships]),
+                         'overdue':0,
+                         'unrecorded':len([ship for ship in ships if ship._current_target and ship._time_of_target_acquisition is None])}
+
+    for step_index in range(n_steps):
+        game.update_game_state(level_sprite_groups)
+        game.handle_collisions(level_meta_data,
+                               level_sprite_groups,
+                               False)
+        game.simulation_clock.advance()
+
+        now = game.simulation_clock.get_ticks()
+
+        for side_results in results.values():
+            for ship, t_last in list(side_results['last_acquisitions'].items()):
+                if not ship.alive():
+                    continue
+
+                if ship._time_of_target_acquisition != t_last:
+                    side_results['acquisitions'][ship] += 1
+                    side_results['last_acquisitions'][ship] = ship._time_of_target_acquisition
+                elif ship._current_target and (t_last is None or now - t_last > max_ticks):
+                    side_results['overdue'] += 1
+
+    # tear down level
+    for sprite_pool in (BasicAnimation.POOL, TrackingAnimation.POOL, ProjectileSprite.POOL):
+        sprite_pool.release_all()
+
+    AIShipSprite.RADAR.clear()
+    AIShipSprite.TARGET_INDEX.clear()
+    BasicSprite.CLOCK = WallClock()
+
+    passed = True
+
+    for side, side_results in sorted(results.items()):
+        acquisitions = list(side_results['acquisitions'].values())
+        side_passed = not side_results['overdue'] and not side_results['unrecorded']
+        passed = passed and side_passed
+
+        print(json.dumps({'side':side,
+                          'level_index':level_index,
+                          'simulated_seconds':n_steps / game.fps,
+                          'target_reevaluation_seconds':reevaluation_seconds,
+                          'ships':side_results['ships'],
+                          'min_acquisitions':min(acquisitions) if acquisitions else 0,
+                          'max_acquisitions':max(acquisitions) if acquisitions else 0,
+                          'targets_unrecorded_at_spawn':side_results['unrecorded'],
+                          'overdue_steps':side_results['overdue'],
+                          'passed':side_passed}))
+
+    game.assets.shutdown()
+
+    sys.exit(0 if passed else 1)
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:3]])
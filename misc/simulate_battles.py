@@ -0,0 +1,53 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 17:31:08 2026
+
+@author: bettmensch
+"""
+
+'''Runs AI vs AI battles of the game STAR WARS DOGFIGHTER in headless mode (no display,
+no sound card needed) and faster than real time, and prints the outcome and timing stats
+of each battle as one JSON object per line, followed by a summary. Run from the repo head:
+
+    python ./misc/simulate_battles.py [level_index] [n_battles] [max_seconds]'''
+
+import os
+import sys
+import json
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)),'..','lib'))
+
+from star_wars_dogfighter import Game
+
+def main(level_index = 5,
+         n_battles = 10,
+         max_seconds = 300):
+
+    game = Game(game_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)),'..'),
+                headless = True)
+
+    outcomes = {}
+    simulated_seconds, wall_seconds = 0, 0
+
+    for battle_index in range(n_battles):
+        stats = game.simulate_level(level_index,
+                                    max_seconds = max_seconds,
+                                    seed = battle_index)
+        stats['battle_index'] = battle_index
+
+        print(json.dumps(stats))
+
+        # aggregate
+        outcomes[stats['outcome']] = outcomes.get(stats['outcome'], 0) + 1
+        simulated_seconds += stats['simulated_seconds']
+        wall_seconds += stats['wall_seconds']
+
+    print(json.dumps({'level_index':level_index,
+                      'battles':n_battles,
+                      'outcomes':outcomes,
+                      'simulated_seconds':simulated_seconds,
+                      'wall_seconds':wall_seconds,
+                      'speedup':simulated_seconds / max(wall_seconds, 1e-9)}))
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:4]])
@@ -0,0 +1,142 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 12:48:19 2026
+
+@author: bettmensch
+"""
+
+'''Benchmark comparing the blit throughput of the game's real skins and animation
+frames for each surface preparation choice:
+
+    - raw: surface as returned by pygame.image.load, colour keyed (the old behaviour)
+    - colorkey: converted to display format, colour keyed
+    - colorkey_rle: converted to display format, colour keyed with RLEACCEL
+    - alpha: converted to display format with per-pixel alpha (colour key pixels fully transparent)
+
+Sprites are never blitted as loaded but as the frames the rotation cache returns, so the
+benchmark also times those, for the colour keyed originals with and without RLEACCEL:
+
+    - rot_ck / rot_ck_rle: frames rotated with rotozoom (smooth rotation)
+    - fast_ck / fast_ck_rle: frames rotated with rotate (quality tiers without smooth rotation)
+
+Also prints the choice the SurfaceLoader makes for each file. Run from the repo head:
+
+    python ./misc/surface_format_benchmark.py [n_blits]'''
+
+import os
+import sys
+import time
+import glob
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)),'..','lib'))
+
+import pygame as pg
+
+from asset_classes import SurfaceLoader
+from cache_classes import RotationCache
+
+WHITE = (255,255,255)
+
+# angles the rotated frames are timed at
+ANGLES = range(0,360,15)
+
+def get_variants(image_path):
+    '''Returns a dictionary mapping preparation choice to the list of prepared surfaces
+    to blit: the loaded surface, or its rotated frames at ANGLES.'''
+
+    variants = {}
+
+    # old behaviour
+    raw = pg.image.load(image_path)
+    raw.set_colorkey(WHITE)
+    variants['raw'] = raw
+
+    # converted, colour keyed
+    colorkey = pg.image.load(image_path).convert()
+    colorkey.set_colorkey(WHITE)
+    variants['colorkey'] = colorkey
+
+    # converted, colour keyed with RLE
+    colorkey_rle = pg.image.load(image_path).convert()
+    colorkey_rle.set_colorkey(WHITE, pg.RLEACCEL)
+    variants['colorkey_rle'] = colorkey_rle
+
+    # converted, per-pixel alpha
+    alpha = colorkey.convert_alpha()
+    variants['alpha'] = alpha
+
+    # frames handed out by the rotation cache
+    for prefix, smooth in (('rot', True), ('fast', False)):
+        rotation_cache = RotationCache(smooth = smooth)
+
+        for name, original_image in (('ck', colorkey), ('ck_rle', colorkey_rle)):
+            variants[prefix + '_' + name] = [rotation_cache.rotate(original_image, angle) for angle in ANGLES]
+
+    for name in ('raw','colorkey','colorkey_rle','alpha'):
+        variants[name] = [variants[name]]
+
+    return variants
+
+def time_blits(surfaces,
+               screen,
+               n_blits):
+    '''Returns the number of blits per second of the surfaces, taken in turn, onto screen.'''
+
+    screen_w, screen_h = screen.get_size()
+    blits = [(surfaces[i % len(surfaces)], ((i * 37) % screen_w, (i * 53) % screen_h)) for i in range(n_blits)]
+
+    # blit each surface once first, so that RLE encoding is not timed
+    for surface in surfaces:
+        screen.blit(surface, (0,0))
+
+    t_start = time.perf_counter()
+
+    for surface, position in blits:
+        screen.blit(surface, position)
+
+    return n_blits / (time.perf_counter() - t_start)
+
+def main(n_blits = 2000):
+
+    pg.init()
+    screen = pg.display.set_mode((1500,700))
+
+    loader = SurfaceLoader()
+
+    image_paths = sorted(glob.glob('./graphics/sprite_skins/*.bmp') + \
+                         glob.glob('./graphics/explosion/*.bmp') + \
+                         glob.glob('./graphics/*_muzzle_flash/*.bmp') + \
+                         glob.glob('./graphics/engine_*/*.bmp') + \
+                         ['./graphics/cockpit/cockpit2.bmp'])
+
+    choice_names = ['raw','colorkey','colorkey_rle','alpha','rot_ck','rot_ck_rle','fast_ck','fast_ck_rle']
+
+    # print header
+    print('{:<50}'.format('image') + ''.join(['{:>14}'.format(name) for name in choice_names]) + '{:>14}'.format('loader'))
+
+    totals = dict([(name,0) for name in choice_names])
+
+    for image_path in image_paths:
+        variants = get_variants(image_path)
+        rates = dict([(name,time_blits(variants[name],screen,n_blits)) for name in choice_names])
+
+        for name in choice_names:
+            totals[name] += rates[name]
+
+        # see what the loader would have chosen
+        loader.load(image_path, transparent_color = WHITE)
+
+        print('{:<50}'.format(image_path) + \
+              ''.join(['{:>14.0f}'.format(rates[name]) for name in choice_names]) + \
+              '{:>14}'.format(loader.choices[image_path]))
+
+    # print average blits per second for each choice
+    print('{:<50}'.format('mean blits/s') + ''.join(['{:>14.0f}'.format(totals[name] / len(image_paths)) for name in choice_names]))
+
+    pg.quit()
+
+if __name__ == '__main__':
+    if len(sys.argv) > 1:
+        main(int(sys.argv[1]))
+    else:
+        main()